@@ -0,0 +1,225 @@
+"""
+插件导入耗时预算基准 (无界面运行)
+
+对 plugins/ 下的每个插件分别在独立子进程中测量三项开销：
+    import   导入插件入口模块 (含其顶层依赖)
+    init     实例化 PluginInterface 子类
+    widget   调用 create_widget()
+每项记录耗时 (ms) 与 tracemalloc 统计的新增内存 (KB)，与基线文件比较，超出预算或缺少基线时以非零状态退出。
+tracemalloc 会明显拖慢内存分配，因此耗时与内存分两个子进程测量：计时进程不开启 tracemalloc，
+内存进程只统计内存，两项各自与自己的基线比较。
+
+用法 (在 MyToolbox1.0 目录下):
+    python benchmarks/plugin_budget.py                    # 与基线比较
+    python benchmarks/plugin_budget.py --update-baseline  # 在参考机器上重新录制基线
+    python benchmarks/plugin_budget.py -p convert_tool -r 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+PLUGIN_DIR = PROJECT_ROOT / "plugins"
+BASELINE_FILE = Path(__file__).resolve().parent / "plugin_baseline.json"
+
+PHASES = ("import", "init", "widget")
+# 测量模式 -> 对应的指标单位，每种模式在单独的子进程中运行
+MODES = {"time": "ms", "memory": "kb"}
+
+# 预算 = 基线 * (1 + 容差) + 固定余量，余量用于吸收小数值上的测量噪声
+DEFAULT_TOLERANCE = 0.25
+SLACK_MS = 5.0
+SLACK_KB = 256.0
+
+
+# ==========================================
+# 1. 子进程：测量单个插件
+# ==========================================
+def _measure_time(func):
+    """返回 (结果, 耗时 ms)"""
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def _measure_memory(func):
+    """返回 (结果, 新增内存 KB)，需要已开启 tracemalloc"""
+    before, _ = tracemalloc.get_traced_memory()
+    result = func()
+    after, _ = tracemalloc.get_traced_memory()
+    return result, (after - before) / 1024
+
+
+def run_worker(folder_name, mode):
+    """mode 为 "time" 时只计时 (不开启 tracemalloc)，为 "memory" 时只统计内存"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+    import importlib
+    from PySide6.QtWidgets import QApplication
+
+    # 公共依赖 (Qt、Fluent 组件、core) 由宿主程序承担，不计入插件自身的开销
+    import qfluentwidgets  # noqa: F401
+    from core.plugin_manager import PluginManager
+
+    app = QApplication.instance() or QApplication([])
+
+    traced = mode == "memory"
+    measure = _measure_memory if traced else _measure_time
+    if traced:
+        tracemalloc.start()
+
+    def import_entry():
+        package = importlib.import_module(f"plugins.{folder_name}")
+        entry = getattr(package, "PLUGIN_ENTRY", PluginManager.DEFAULT_ENTRY)
+        module = importlib.import_module(f"{package.__name__}.{entry}")
+        return PluginManager._find_plugin_class(module, getattr(package, "PLUGIN_CLASS", None))
+
+    plugin_cls, import_value = measure(import_entry)
+    if plugin_cls is None:
+        raise RuntimeError(f"插件 {folder_name} 没有可用的插件类")
+
+    plugin, init_value = measure(plugin_cls)
+
+    def build_widget():
+        widget = plugin.create_widget()
+        app.processEvents()
+        return widget
+
+    widget, widget_value = measure(build_widget)
+    if traced:
+        tracemalloc.stop()
+
+    unit = MODES[mode]
+    result = {
+        "import": {unit: import_value},
+        "init": {unit: init_value},
+        "widget": {unit: widget_value},
+    }
+    widget.deleteLater()
+    print(json.dumps(result))
+
+
+# ==========================================
+# 2. 主进程：调度、统计、比较
+# ==========================================
+def discover_plugins():
+    return sorted(p.name for p in PLUGIN_DIR.iterdir() if (p / "__init__.py").is_file())
+
+
+def measure_plugin(folder_name, repeat):
+    """
+    每次都启动全新的解释器，保证测到的是冷导入；多次取中位数
+    耗时与内存分别在不开启 / 开启 tracemalloc 的子进程中测量，合并为 {phase: {"ms", "kb"}}
+    """
+    runs = {mode: [] for mode in MODES}
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    for _ in range(repeat):
+        for mode in MODES:
+            proc = subprocess.run([sys.executable, __file__, "--worker", folder_name, "--mode", mode],
+                                  cwd=PROJECT_ROOT, env=env, capture_output=True, text=True)
+            lines = [l for l in proc.stdout.splitlines() if l.startswith("{")]
+            if proc.returncode != 0 or not lines:
+                raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "子进程无输出")
+            runs[mode].append(json.loads(lines[-1]))
+
+    return {phase: {unit: round(statistics.median(r[phase][unit] for r in runs[mode]), 2)
+                    for mode, unit in MODES.items()}
+            for phase in PHASES}
+
+
+def load_baseline():
+    if not BASELINE_FILE.exists():
+        return {}
+    with open(BASELINE_FILE, "r", encoding="utf-8") as f:
+        return json.load(f).get("plugins", {})
+
+
+def save_baseline(results):
+    data = {
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "recorded_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "plugins": results,
+    }
+    with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def check_budget(result, baseline, tolerance):
+    """返回超出预算的项目列表 [(phase, unit, 实测, 预算)]"""
+    violations = []
+    for phase in PHASES:
+        for unit, slack in (("ms", SLACK_MS), ("kb", SLACK_KB)):
+            base = baseline.get(phase, {}).get(unit)
+            if base is None:
+                continue
+            budget = max(base, 0) * (1 + tolerance) + slack
+            if result[phase][unit] > budget:
+                violations.append((phase, unit, result[phase][unit], budget))
+    return violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="插件导入/实例化/建界面开销预算检查")
+    parser.add_argument("-p", "--plugin", action="append", help="只测量指定插件目录 (可重复)")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="每个插件重复测量次数，取中位数")
+    parser.add_argument("-t", "--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="相对基线允许的增幅 (默认 0.25 即 25%%)")
+    parser.add_argument("--update-baseline", action="store_true", help="用本次结果覆盖基线文件")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--mode", choices=MODES, default="time", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.mode)
+        return 0
+
+    plugins = args.plugin or discover_plugins()
+    baseline = load_baseline()
+    results, failed = {}, False
+
+    header = f"{'插件':<18}" + "".join(f"{phase + ' ms':>12}{phase + ' KB':>12}" for phase in PHASES)
+    print(header)
+    print("-" * len(header))
+
+    for name in plugins:
+        try:
+            result = measure_plugin(name, max(1, args.repeat))
+        except Exception as e:
+            print(f"{name:<18}  测量失败: {e}")
+            failed = True
+            continue
+        results[name] = result
+        print(f"{name:<18}" + "".join(f"{result[p]['ms']:>12.1f}{result[p]['kb']:>12.0f}" for p in PHASES))
+
+        if not args.update_baseline and name in baseline:
+            for phase, unit, value, budget in check_budget(result, baseline[name], args.tolerance):
+                print(f"    ✗ {phase} {unit}: {value:.1f} > 预算 {budget:.1f}")
+                failed = True
+
+    if args.update_baseline:
+        merged = dict(baseline)
+        merged.update(results)
+        save_baseline(merged)
+        print(f"\n基线已更新: {BASELINE_FILE}")
+        return 0
+
+    # 没有基线的插件无法判断是否回归，视为未通过，避免守护在缺少基线文件时永远通过
+    missing = [n for n in results if n not in baseline]
+    if missing:
+        print(f"\n以下插件没有基线，无法比较: {', '.join(missing)} (先在参考机器上使用 --update-baseline 录制)")
+        failed = True
+
+    print("\n结果: " + ("未通过 (超出预算、缺少基线或测量失败)" if failed else "全部在预算内"))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
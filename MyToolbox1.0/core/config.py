@@ -1,14 +1,23 @@
+import atexit
+import copy
 import json
 import os
+import threading
 from pathlib import Path
 from qfluentwidgets import Theme, setTheme
 
 
 class ConfigManager:
-    """管理应用配置"""
+    """
+    管理应用配置
+    配置在进程内只从磁盘读取一次，之后全部走内存；
+    save() 只更新内存并标记脏字段，由后台定时器合并写入 (write-behind)，
+    退出时 flush() 兜底，保证不会在 UI 线程上做同步磁盘写入。
+    """
     # 1. 确定配置存储目录 (例如: C:\Users\User\AppData\Local\MyToolbox)
     # 这样无论 EXE 在哪里运行，配置都能保存
-    APP_DATA_DIR = Path(os.getenv('LOCALAPPDATA')) / "MyToolbox"
+    # 非 Windows 平台没有 LOCALAPPDATA，退回到用户目录下的 .local/share
+    APP_DATA_DIR = Path(os.getenv('LOCALAPPDATA') or Path.home() / ".local" / "share") / "MyToolbox"
 
     # 确保目录存在
     if not APP_DATA_DIR.exists():
@@ -30,28 +39,51 @@ class ConfigManager:
         "theme": "Light",  # Light, Dark, Auto
         "window_size": [1000, 700],
         "custom_colors": {},
-        "plugin_order": []
+        "plugin_order": [],
+        "plugin_usage": {},  # 插件打开次数，用于启动后预热排序
     }
 
+    # 写入合并的防抖时间 (秒)
+    FLUSH_DELAY = 0.5
+
+    # --- 进程内缓存状态 ---
+    _cache = None  # 内存中的配置 (唯一真相来源)
+    _dirty_keys = set()  # 自上次落盘后被修改过的字段
+    _lock = threading.RLock()
+    _write_lock = threading.Lock()  # 串行化落盘，保证退出时能等到正在进行的写入
+    _flush_timer = None
+    _listeners = []
+
     @classmethod
     def load(cls):
-        """加载配置"""
+        """
+        加载配置
+        返回内存配置的深拷贝：调用方可以随意修改，只有 save() 之后才会生效
+        """
+        with cls._lock:
+            if cls._cache is None:
+                cls._cache = cls._read_from_disk()
+                atexit.register(cls.flush)
+            return copy.deepcopy(cls._cache)
+
+    @classmethod
+    def _read_from_disk(cls):
         # 调试打印：确认读取路径
         # print(f"[Config] Reading from: {cls.CONFIG_FILE}")
 
         if not cls.CONFIG_FILE.exists():
-            return cls.DEFAULT_CONFIG.copy()
+            return copy.deepcopy(cls.DEFAULT_CONFIG)
 
         try:
             with open(cls.CONFIG_FILE, "r", encoding="utf-8") as f:
                 content = f.read()
                 if not content.strip():  # 防止文件为空导致报错
-                    return cls.DEFAULT_CONFIG.copy()
+                    return copy.deepcopy(cls.DEFAULT_CONFIG)
 
                 config = json.loads(content)
 
                 # 深度合并默认配置
-                merged = cls.DEFAULT_CONFIG.copy()
+                merged = copy.deepcopy(cls.DEFAULT_CONFIG)
                 merged.update(config)
 
                 # 确保关键字段存在
@@ -61,30 +93,129 @@ class ConfigManager:
                 return merged
         except Exception as e:
             print(f"[Config] Load Error: {e}")
-            return cls.DEFAULT_CONFIG.copy()
+            return copy.deepcopy(cls.DEFAULT_CONFIG)
+
+    @classmethod
+    def get(cls, key, default=None):
+        """读取单个字段 (不拷贝整份配置)"""
+        with cls._lock:
+            if cls._cache is None:
+                cls.load()
+            return copy.deepcopy(cls._cache.get(key, default))
+
+    @classmethod
+    def set(cls, key, value):
+        """修改单个字段，等价于 load -> 修改 -> save"""
+        config = cls.load()
+        config[key] = value
+        cls.save(config)
 
     @classmethod
     def save(cls, config_data):
-        """保存配置"""
+        """
+        保存配置
+        只更新内存并记录脏字段，实际写盘由防抖定时器在后台线程完成
+        """
+        with cls._lock:
+            if cls._cache is None:
+                cls.load()
+
+            old = cls._cache
+            changed = {k for k in set(old) | set(config_data) if old.get(k) != config_data.get(k)}
+            if not changed:
+                return
+
+            cls._cache = copy.deepcopy(config_data)
+            cls._dirty_keys |= changed
+            cls._schedule_flush()
+
+        cls._notify(changed)
+
+    @classmethod
+    def is_dirty(cls):
+        """是否有尚未落盘的修改"""
+        with cls._lock:
+            return bool(cls._dirty_keys)
+
+    @classmethod
+    def _schedule_flush(cls):
+        # 连续多次 save 只保留最后一次定时器，合并成一次写盘
+        if cls._flush_timer is not None:
+            cls._flush_timer.cancel()
+        cls._flush_timer = threading.Timer(cls.FLUSH_DELAY, cls.flush)
+        cls._flush_timer.daemon = True
+        cls._flush_timer.start()
+
+    @classmethod
+    def flush(cls):
+        """立即把脏配置写入磁盘 (原子替换)，程序退出时也会调用"""
+        with cls._write_lock:
+            cls._flush_locked()
+
+    @classmethod
+    def _flush_locked(cls):
+        with cls._lock:
+            if cls._flush_timer is not None:
+                cls._flush_timer.cancel()
+                cls._flush_timer = None
+            if not cls._dirty_keys or cls._cache is None:
+                return
+
+            data = json.dumps(cls._cache, indent=4, ensure_ascii=False)
+            dirty = cls._dirty_keys
+            cls._dirty_keys = set()
+
         try:
             # 调试打印：确认写入路径
-            print(f"[Config] Saving to: {cls.CONFIG_FILE}")
+            print(f"[Config] Saving to: {cls.CONFIG_FILE} ({', '.join(sorted(dirty))})")
 
-            if not cls.CONFIG_DIR.exists():
-                cls.CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+            if not cls.APP_DATA_DIR.exists():
+                cls.APP_DATA_DIR.mkdir(parents=True, exist_ok=True)
 
-            with open(cls.CONFIG_FILE, "w", encoding="utf-8") as f:
+            # 先写临时文件再替换，避免写到一半崩溃导致 settings.json 损坏
+            tmp_file = cls.CONFIG_FILE.with_suffix(".json.tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
                 # ensure_ascii=False 确保中文插件名正常显示，indent=4 美化格式
-                json.dump(config_data, f, indent=4, ensure_ascii=False)
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, cls.CONFIG_FILE)
 
         except Exception as e:
             print(f"[Config] Save Error: {e}")
+            # 写入失败则恢复脏标记，等待下一次 flush 重试
+            with cls._lock:
+                cls._dirty_keys |= dirty
+
+    @classmethod
+    def add_listener(cls, callback):
+        """
+        监听配置变化
+        callback(changed_keys: set) 在 save() 的调用线程中执行
+        """
+        if callback not in cls._listeners:
+            cls._listeners.append(callback)
+
+    @classmethod
+    def remove_listener(cls, callback):
+        if callback in cls._listeners:
+            cls._listeners.remove(callback)
+
+    @classmethod
+    def _notify(cls, changed):
+        for callback in list(cls._listeners):
+            try:
+                callback(changed)
+            except Exception as e:
+                print(f"[Config] Listener Error: {e}")
 
     @classmethod
     def get_color(cls, plugin):
         """获取插件颜色"""
-        config = cls.load()
-        user_colors = config.get("custom_colors", {})
+        with cls._lock:
+            if cls._cache is None:
+                cls.load()
+            user_colors = cls._cache.get("custom_colors", {})
         default_color = getattr(plugin, 'theme_color', '#009faa')
         return user_colors.get(plugin.name, default_color)
 
@@ -94,4 +225,4 @@ class ConfigManager:
         t = Theme.LIGHT if theme_str == "Light" else Theme.DARK
         if theme_str == "Auto":
             t = Theme.AUTO
-        setTheme(t)
\ No newline at end of file
+        setTheme(t)
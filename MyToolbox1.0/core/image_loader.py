@@ -0,0 +1,115 @@
+import hashlib
+import os
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QSize, Qt, Signal
+from PySide6.QtGui import QImage, QImageReader
+
+from .config import ConfigManager
+
+
+class _LoadSignals(QObject):
+    finished = Signal(int, str, object)  # (请求编号, 路径, QImage / None)
+
+
+class _LoadTask(QRunnable):
+    def __init__(self, request_id, path, target_size, signals):
+        super().__init__()
+        self.request_id = request_id
+        self.path = path
+        self.target_size = target_size
+        self.signals = signals
+
+    def run(self):
+        image = ImageLoader.load_scaled(self.path, self.target_size)
+        self.signals.finished.emit(self.request_id, self.path, image)
+
+
+class ImageLoader(QObject):
+    """
+    异步图片加载服务
+    在线程池中用 QImageReader.setScaledSize 直接解码到目标分辨率 (JPEG 可在解码阶段缩小，
+    不会先把整张大图解到内存)，结果通过 loaded 信号回到 UI 线程。
+    缩小后的版本按 (源路径, mtime, 文件大小, 目标尺寸) 缓存在 APP_DATA_DIR/image_cache，
+    下次启动直接读取小图。
+    """
+    loaded = Signal(int, str, object)  # (请求编号, 路径, QImage，失败时为 None)
+
+    CACHE_DIR = ConfigManager.APP_DATA_DIR / "image_cache"
+    MAX_CACHE_FILES = 16  # 超出后删除最久未使用的缓存图
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._signals = _LoadSignals(self)
+        self._signals.finished.connect(self.loaded)
+        self._next_id = 0
+
+    def request(self, path, target_size):
+        """提交加载请求，返回请求编号 (用于在 loaded 中识别并丢弃过期结果)"""
+        self._next_id += 1
+        QThreadPool.globalInstance().start(_LoadTask(self._next_id, str(path), QSize(target_size), self._signals))
+        return self._next_id
+
+    # ---------------- 以下方法在工作线程中执行，只能使用 QImage ----------------
+    @classmethod
+    def load_scaled(cls, path, target_size):
+        """同步加载：读缓存或按目标尺寸解码，图片会保持比例缩放到刚好覆盖 target_size"""
+        try:
+            st = os.stat(path)
+        except OSError as e:
+            print(f"[ImageLoader] 无法读取 {path}: {e}")
+            return None
+
+        cache_file = cls._cache_file(path, st, target_size)
+        if cache_file.exists():
+            image = QImage(str(cache_file))
+            if not image.isNull():
+                try:
+                    os.utime(cache_file)  # 记录最近使用时间，供清理时参考
+                except OSError:
+                    pass
+                return image
+
+        reader = QImageReader(str(path))
+        reader.setAutoTransform(True)  # 按 EXIF 方向旋转照片
+        source_size = reader.size()
+        scaled = False
+        if source_size.isValid() and not target_size.isEmpty():
+            size = source_size.scaled(target_size, Qt.KeepAspectRatioByExpanding)
+            if size.width() < source_size.width():
+                reader.setScaledSize(size)
+                scaled = True
+
+        image = reader.read()
+        if image.isNull():
+            print(f"[ImageLoader] 解码失败 {path}: {reader.errorString()}")
+            return None
+
+        # 原图本来就不大时不写缓存，直接读原图一样快
+        if scaled:
+            cls._store(cache_file, image)
+        return image
+
+    @classmethod
+    def _cache_file(cls, path, st, target_size):
+        key = f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}|{target_size.width()}x{target_size.height()}"
+        return cls.CACHE_DIR / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.png"
+
+    @classmethod
+    def _store(cls, cache_file, image):
+        try:
+            cls.CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix(".tmp.png")
+            if image.save(str(tmp_file), "PNG"):
+                os.replace(tmp_file, cache_file)
+            cls._prune()
+        except Exception as e:
+            print(f"[ImageLoader] 缓存写入失败: {e}")
+
+    @classmethod
+    def _prune(cls):
+        files = sorted(cls.CACHE_DIR.glob("*.png"), key=lambda f: f.stat().st_mtime, reverse=True)
+        for old in files[cls.MAX_CACHE_FILES:]:
+            try:
+                old.unlink()
+            except OSError:
+                pass
@@ -0,0 +1,137 @@
+import os
+import sys
+import time
+import tracemalloc
+
+from PySide6.QtCore import QObject
+from PySide6.QtWidgets import QApplication
+
+from core.profiler import StartupProfiler
+
+
+class _Record:
+    __slots__ = ("name", "kind", "created", "busy_s", "events", "heap_bytes")
+
+    def __init__(self, name, kind, heap_bytes=0):
+        self.name = name
+        self.kind = kind
+        self.created = time.time()
+        self.busy_s = 0.0  # 该实例的事件处理 (含槽函数、绘制) 占用 UI 线程的时间
+        self.events = 0
+        self.heap_bytes = heap_bytes  # 创建时及之后事件处理中净增的 Python 内存
+
+
+class ResourceMonitor:
+    """
+    按工具实例统计资源占用 (设置页"资源占用"面板的数据来源)
+    每个标签页 / 独立窗口注册为一个根对象：
+        - QObject 数量：刷新时统计根对象下的所有子对象，始终可用；
+        - 事件耗时、Python 堆：需要通过 --instrument 或 MYTOOLBOX_INSTRUMENT=1 开启，
+          开启后使用 InstrumentedApplication 在 notify() 中计时，并用 tracemalloc 统计内存净增量。
+    """
+    ENV_VAR = "MYTOOLBOX_INSTRUMENT"
+    CLI_FLAG = "--instrument"
+
+    enabled = False
+    _records = {}  # 根对象 -> _Record
+
+    @classmethod
+    def configure(cls, argv=None):
+        """从环境变量和命令行参数判断是否开启 (会从 argv 中移除本工具的参数)"""
+        argv = sys.argv if argv is None else argv
+        if cls.CLI_FLAG in argv[1:]:
+            argv.remove(cls.CLI_FLAG)
+            cls.enabled = True
+        if os.getenv(cls.ENV_VAR, "") not in ("", "0"):
+            cls.enabled = True
+        if cls.enabled:
+            # 与启动分析同时开启时，分析结束后 tracemalloc 仍需保持运行
+            StartupProfiler.share_tracing()
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+        return cls.enabled
+
+    @classmethod
+    def allocation_mark(cls):
+        """创建界面前调用，配合 register() 统计创建时分配的内存"""
+        if not cls.enabled or not tracemalloc.is_tracing():
+            return None
+        return tracemalloc.get_traced_memory()[0]
+
+    @classmethod
+    def register(cls, root, name, kind, mark=None):
+        heap = 0
+        if mark is not None and tracemalloc.is_tracing():
+            heap = max(tracemalloc.get_traced_memory()[0] - mark, 0)
+        cls._records[root] = _Record(name, kind, heap)
+        root.destroyed.connect(lambda *_, r=root: cls._records.pop(r, None))
+
+    @classmethod
+    def relabel(cls, root, kind):
+        """界面在标签页和独立窗口之间移动时更新类型，统计数据保留"""
+        record = cls._records.get(root)
+        if record is not None:
+            record.kind = kind
+
+    @classmethod
+    def find_record(cls, obj):
+        """沿父对象链查找事件接收者所属的工具实例"""
+        records = cls._records
+        while obj is not None:
+            record = records.get(obj)
+            if record is not None:
+                return record
+            obj = obj.parent()
+        return None
+
+    @classmethod
+    def snapshot(cls):
+        rows = []
+        for root, record in list(cls._records.items()):
+            try:
+                children = len(root.findChildren(QObject))
+            except RuntimeError:
+                continue  # 对象已销毁，destroyed 信号尚未处理
+            rows.append({
+                "name": record.name,
+                "kind": record.kind,
+                "children": children,
+                "heap_kb": record.heap_bytes / 1024 if cls.enabled else None,
+                "busy_ms": record.busy_s * 1000 if cls.enabled else None,
+                "events": record.events if cls.enabled else None,
+                "age_min": (time.time() - record.created) / 60,
+            })
+        return rows
+
+
+class InstrumentedApplication(QApplication):
+    """
+    在 notify() 中为每个事件计时，并归属到所属的工具实例
+    嵌套派发的事件只计入自身 (外层扣除内层耗时)，避免重复统计
+    """
+
+    def __init__(self, argv):
+        super().__init__(argv)
+        self._stack = []  # [子事件累计耗时, 子事件累计内存]
+
+    def notify(self, receiver, event):
+        record = ResourceMonitor.find_record(receiver) if ResourceMonitor._records else None
+        if record is None:
+            return super().notify(receiver, event)
+
+        frame = [0.0, 0]
+        self._stack.append(frame)
+        mem_before = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+        start = time.perf_counter()
+        try:
+            return super().notify(receiver, event)
+        finally:
+            elapsed = time.perf_counter() - start
+            allocated = (tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0) - mem_before
+            self._stack.pop()
+            record.busy_s += elapsed - frame[0]
+            record.heap_bytes += allocated - frame[1]
+            record.events += 1
+            if self._stack:
+                self._stack[-1][0] += elapsed
+                self._stack[-1][1] += allocated
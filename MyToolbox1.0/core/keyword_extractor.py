@@ -0,0 +1,203 @@
+import ast
+import hashlib
+import logging
+import os
+import re
+from collections import Counter
+
+try:
+    import jieba
+    jieba.setLogLevel(logging.WARNING)
+except ImportError:
+    jieba = None
+
+
+class KeywordExtractor:
+    """
+    插件搜索关键词提取 (dynamic_tags)
+    用 AST 静态分析插件目录下的源码，不需要导入模块：
+        - 类名 (驼峰拆分)、公开函数/方法名 (下划线 + 驼峰拆分)
+        - 模块、类、函数的文档字符串
+        - 界面文字：QLabel("...")、setText("...")、setToolTip("...") 等调用中的字符串
+    中文文本安装了 jieba 时按词切分，否则只保留完整的短中文片段 (按钮、标签文字)。
+    结果 (关键词 -> 出现次数) 按文件内容哈希缓存在插件清单中，只有改动过的文件才会重新解析。
+    所有插件加载完成后由 select_tags() 去掉大多数插件都有的通用词，每个插件只保留出现最多的若干个。
+    """
+    # 参数中的字符串会被当作界面文字的调用 (方法名)
+    UI_TEXT_METHODS = {
+        "setText", "setPlaceholderText", "setToolTip", "setWindowTitle", "setTitle",
+        "setStatusTip", "addItem", "addItems", "addTab", "setHeaderLabels",
+        "setHorizontalHeaderLabels", "success", "warning", "error", "info",
+    }
+    # 构造时第一个字符串即界面文字的控件类名后缀 (QLabel、PushButton、StrongBodyLabel ...)
+    UI_WIDGET_RE = re.compile(r'(Label|Button|CheckBox|RadioButton|GroupBox|Action|Card|Edit)$')
+
+    _CAMEL_RE = re.compile(r'[A-Z]?[a-z]+|[A-Z]+(?=[A-Z]|$|\d)|\d+')
+    _TOKEN_RE = re.compile(r'[一-鿿]+|[A-Za-z][A-Za-z0-9]*')
+    _CJK_RE = re.compile(r'[一-鿿]+')
+
+    # 只过滤 Python 和 Qt 的通用名称；插件之间共有的领域词由 select_tags() 按出现的插件比例过滤
+    STOP_WORDS = {
+        "self", "cls", "the", "and", "for", "with", "from", "into", "this", "that", "are", "is",
+        "of", "to", "in", "on", "or", "an", "be", "by", "it", "as", "at", "if", "not", "none",
+        "true", "false", "return", "returns", "def", "init", "get", "set", "str", "int",
+        "args", "kwargs", "super", "lambda", "isinstance",
+        "widget", "layout", "event", "signal", "slot", "parent", "ui", "btn", "qt",
+        "clicked", "pressed", "released", "toggled", "triggered", "changed",
+        "spacing", "margins", "stretch", "alignment",
+    }
+    # PluginInterface 的成员名 (每个插件都会实现，不代表插件功能)
+    INTERFACE_MEMBERS = {"name", "icon", "group", "description", "theme_color",
+                         "create_widget", "save_state", "restore_state", "keywords"}
+    # jieba 切分后的中文虚词
+    CJK_STOP_WORDS = {
+        "返回", "调用", "使用", "当前", "如果", "可以", "需要", "之后", "之前", "时候", "没有", "已经",
+        "这里", "这个", "一个", "进行", "或者", "以及",
+    }
+    MAX_CJK_LABEL = 6  # 没有 jieba 时保留的完整中文片段最大长度 (更长的多半是句子)
+    TOKENIZER = "jieba" if jieba is not None else "label"  # 分词方式变化时清单缓存失效
+    FOLDER_TAG_LIMIT = 200  # 每个插件目录写入清单的关键词上限 (按出现次数)
+    MAX_TAGS = 30  # 每个插件最终保留的关键词数
+    MAX_DOC_RATIO = 0.75  # 超过这个比例的插件都有的词视为通用词 (接口成员名已单独排除)
+    MIN_PLUGINS_FOR_DF = 4  # 插件太少时不做通用词过滤
+
+    @classmethod
+    def extract_folder(cls, folder_path, cache_prefix, manifest=None):
+        """
+        提取插件目录下所有 .py 文件的关键词，按出现次数从多到少排列 (最多 FOLDER_TAG_LIMIT 个)
+        manifest 不为空时按 "<cache_prefix>/<相对路径>" + 文件哈希读写缓存，并清理已删除文件的缓存
+        """
+        counts = Counter()
+        file_keys = set()
+        for root, dirs, files in os.walk(folder_path):
+            dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+            for file in sorted(files):
+                if not file.endswith(".py"):
+                    continue
+                path = os.path.join(root, file)
+                rel = os.path.relpath(path, folder_path).replace(os.sep, "/")
+                file_key = f"{cache_prefix}/{rel}"
+                file_keys.add(file_key)
+                counts.update(cls._extract_cached(path, file_key, manifest))
+        if manifest is not None:
+            manifest.prune_keywords(cache_prefix, file_keys)
+        ranked = sorted(counts, key=lambda t: (-counts[t], t))
+        return ranked[:cls.FOLDER_TAG_LIMIT]
+
+    @classmethod
+    def select_tags(cls, plugins):
+        """
+        所有插件加载完成后调用：去掉超过 MAX_DOC_RATIO 的插件都有的通用词，
+        每个插件保留前 MAX_TAGS 个 (dynamic_tags 已按出现次数排序)
+        """
+        tag_lists = [list(getattr(p, 'dynamic_tags', None) or []) for p in plugins]
+        common = set()
+        if len(tag_lists) >= cls.MIN_PLUGINS_FOR_DF:
+            doc_freq = Counter(t for tags in tag_lists for t in set(tags))
+            limit = len(tag_lists) * cls.MAX_DOC_RATIO
+            common = {t for t, n in doc_freq.items() if n > limit}
+        for plugin, tags in zip(plugins, tag_lists):
+            plugin.dynamic_tags = [t for t in tags if t not in common][:cls.MAX_TAGS]
+
+    @classmethod
+    def _extract_cached(cls, path, cache_key, manifest):
+        try:
+            with open(path, "rb") as f:
+                source = f.read()
+        except OSError as e:
+            print(f"[Keywords] 读取失败 {path}: {e}")
+            return {}
+
+        file_hash = hashlib.sha1(source).hexdigest()
+        if manifest is not None:
+            cached = manifest.get_keywords(cache_key, file_hash)
+            if isinstance(cached, dict):
+                return cached
+
+        tokens = cls.extract_source(source, path)
+        if manifest is not None:
+            manifest.put_keywords(cache_key, file_hash, tokens)
+        return tokens
+
+    @classmethod
+    def extract_source(cls, source, filename="<plugin>"):
+        """解析一段源码，返回 {关键词: 出现次数}"""
+        try:
+            tree = ast.parse(source, filename=filename)
+        except (SyntaxError, ValueError) as e:
+            print(f"[Keywords] 解析失败 {filename}: {e}")
+            return {}
+
+        identifiers = []
+        texts = []
+
+        module_doc = ast.get_docstring(tree)
+        if module_doc:
+            texts.append(module_doc)
+
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ClassDef):
+                identifiers.extend(cls._CAMEL_RE.findall(node.name))
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                if not node.name.startswith("_") and node.name not in cls.INTERFACE_MEMBERS:
+                    # Qt 风格方法名同样是驼峰 (dropEvent)，拆完下划线再拆驼峰
+                    for part in node.name.split("_"):
+                        identifiers.extend(cls._CAMEL_RE.findall(part))
+            elif isinstance(node, ast.Call):
+                texts.extend(cls._ui_strings(node))
+                continue
+            else:
+                continue
+
+            doc = ast.get_docstring(node)
+            if doc:
+                texts.append(doc)
+
+        tokens = Counter(w.lower() for w in identifiers)
+        for text in texts:
+            tokens.update(cls.tokenize(text))
+        return {t: tokens[t] for t in sorted(tokens) if cls._is_valid(t)}
+
+    @classmethod
+    def _ui_strings(cls, call):
+        """调用是界面文字相关 API 时，返回其中的字符串常量"""
+        func = call.func
+        name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", "")
+        if name in cls.UI_TEXT_METHODS:
+            args = list(call.args) + [kw.value for kw in call.keywords]
+        elif cls.UI_WIDGET_RE.search(name):
+            args = call.args[:1] + [kw.value for kw in call.keywords if kw.arg in ("text", "title", "content")]
+        else:
+            return []
+
+        strings = []
+        for arg in args:
+            if isinstance(arg, ast.Constant) and isinstance(arg.value, str):
+                strings.append(arg.value)
+            elif isinstance(arg, (ast.List, ast.Tuple)):
+                strings.extend(e.value for e in arg.elts
+                               if isinstance(e, ast.Constant) and isinstance(e.value, str))
+        return strings
+
+    @classmethod
+    def tokenize(cls, text):
+        """
+        英文单词按驼峰拆分后转小写；中文连续片段用 jieba 切分成词，
+        未安装 jieba 时只保留不超过 MAX_CJK_LABEL 个字的完整片段 (长句整体作为关键词没有意义)
+        """
+        tokens = []
+        for word in cls._TOKEN_RE.findall(text):
+            if cls._CJK_RE.fullmatch(word):
+                if jieba is not None:
+                    tokens.extend(jieba.lcut(word))
+                elif len(word) <= cls.MAX_CJK_LABEL:
+                    tokens.append(word)
+            else:
+                tokens.extend(w.lower() for w in cls._CAMEL_RE.findall(word))
+        return tokens
+
+    @classmethod
+    def _is_valid(cls, token):
+        if cls._CJK_RE.fullmatch(token):
+            return len(token) > 1 and token not in cls.CJK_STOP_WORDS
+        return len(token) > 1 and not token.isdigit() and token not in cls.STOP_WORDS
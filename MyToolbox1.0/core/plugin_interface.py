@@ -40,4 +40,15 @@ class PluginInterface(ABC):
     @abstractmethod
     def create_widget(self) -> QWidget:
         """返回插件的主界面 Widget"""
-        pass
\ No newline at end of file
+        pass
+
+    def save_state(self, widget: QWidget) -> dict | None:
+        """
+        【可选】标签页休眠前保存界面状态
+        返回可 JSON 序列化的 dict；返回 None (默认) 表示该插件不支持休眠，标签页会一直保留
+        """
+        return None
+
+    def restore_state(self, widget: QWidget, state: dict):
+        """【可选】唤醒时用 save_state() 的结果恢复新创建的界面"""
+        pass
@@ -1,73 +1,133 @@
 # core/plugin_manager.py 完整代码
 
 import os
-import importlib.util
+import importlib
 import inspect
-import re
 from .plugin_interface import PluginInterface
+from .plugin_manifest import PluginManifest, LazyPlugin
+from .keyword_extractor import KeywordExtractor
 from .config import ConfigManager
+from .profiler import StartupProfiler
 
 
 class PluginManager:
+    # 插件包在 __init__.py 中未声明 PLUGIN_ENTRY 时使用的默认入口
+    DEFAULT_ENTRY = "tool"
+
     def __init__(self, plugin_dir="plugins"):
+        # 相对路径基于项目根目录解析，避免依赖启动时的工作目录
+        if not os.path.isabs(plugin_dir):
+            plugin_dir = os.path.join(ConfigManager.PROJECT_ROOT, plugin_dir)
         self.plugin_dir = plugin_dir
+        # 插件目录本身是一个包 (plugins)，各插件以 plugins.<folder>.<entry> 的形式导入
+        self.package_name = os.path.basename(os.path.normpath(plugin_dir))
         self.plugins = []
 
     def load_plugins(self):
-        """扫描并加载插件"""
+        """
+        扫描并加载插件
+        源码指纹未变化的插件直接由清单缓存生成 LazyPlugin，不导入任何模块；
+        只有新增或修改过的插件目录才会导入其声明的入口模块，并刷新缓存。
+        """
         self.plugins = []
         if not os.path.exists(self.plugin_dir):
             os.makedirs(self.plugin_dir)
 
-        for folder_name in os.listdir(self.plugin_dir):
-            folder_path = os.path.join(self.plugin_dir, folder_name)
-            if os.path.isdir(folder_path):
-                for file in os.listdir(folder_path):
-                    if file.endswith(".py") and file != "__init__.py":
-                        self._load_plugin_from_file(os.path.join(folder_path, file))
+        manifest = PluginManifest.load()
+        folder_names = []
 
-    def _load_plugin_from_file(self, path):
+        for folder_name in sorted(os.listdir(self.plugin_dir)):
+            folder_path = os.path.join(self.plugin_dir, folder_name)
+            if not os.path.isfile(os.path.join(folder_path, "__init__.py")):
+                continue
+            folder_names.append(folder_name)
+
+            with StartupProfiler.span(f"plugin:{folder_name}"):
+                fingerprint = PluginManifest.fingerprint(folder_path)
+                cached = manifest.get(folder_name, fingerprint)
+                if cached is not None:
+                    self.plugins.extend(LazyPlugin(self, meta) for meta in cached)
+                    continue
+
+                plugin_instance = self._load_plugin_package(folder_name)
+                # 加载失败的目录不写缓存 (可能只是缺依赖)，下次启动重新扫描
+                if plugin_instance is None:
+                    continue
+                # 关键词按文件哈希缓存，目录内只有改动过的文件会重新解析
+                plugin_instance.dynamic_tags = KeywordExtractor.extract_folder(folder_path, folder_name, manifest)
+                self.plugins.append(plugin_instance)
+                manifest.put(folder_name, fingerprint, [self._describe(folder_name, plugin_instance)])
+
+        # 缓存中保存的是各插件按出现次数排序的全部关键词，跨插件的通用词过滤每次启动重新计算
+        KeywordExtractor.select_tags(self.plugins)
+        manifest.prune(folder_names)
+        manifest.save()
+
+    def _load_plugin_package(self, folder_name):
+        """
+        导入插件包声明的入口模块，返回插件实例，失败时返回 None
+        每个插件只导入一个入口模块，只实例化一个插件类
+        """
         try:
-            spec = importlib.util.spec_from_file_location("dynamic_plugin", path)
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-
-            for name, obj in inspect.getmembers(module):
-                if inspect.isclass(obj) and issubclass(obj, PluginInterface) and obj is not PluginInterface:
-
-                    plugin_instance = obj()
-
-                    # --- 自动关键词提取 ---
-                    auto_keywords = set()
-
-                    # 1. 提取插件描述
-                    if hasattr(plugin_instance, 'description'):
-                        auto_keywords.update(plugin_instance.description.split())
-
-                    # 2. 提取相关类的名字和方法名
-                    for sub_name, sub_obj in inspect.getmembers(module):
-                        if inspect.isclass(sub_obj) and sub_obj.__module__ == module.__name__:
-                            # 拆分驼峰命名 (JsonPage -> json, page)
-                            words = re.findall(r'[A-Z]?[a-z]+|[A-Z]+(?=[A-Z]|$)', sub_name)
-                            auto_keywords.update([w.lower() for w in words])
-
-                            # 提取方法名
-                            for method_name, _ in inspect.getmembers(sub_obj, predicate=inspect.isfunction):
-                                if not method_name.startswith('_'):
-                                    auto_keywords.update(method_name.split('_'))
-
-                    # 3. 过滤并存储到 dynamic_tags 属性
-                    valid_tags = [k.lower() for k in auto_keywords if len(k) > 1]
-
-                    # 【关键】挂载到一个新属性上，不与 @property 冲突
-                    plugin_instance.dynamic_tags = list(set(valid_tags))
+            package = importlib.import_module(f"{self.package_name}.{folder_name}")
+            entry = getattr(package, "PLUGIN_ENTRY", self.DEFAULT_ENTRY)
+            module = importlib.import_module(f"{package.__name__}.{entry}")
 
-                    # print(f"插件 {plugin_instance.name} 索引: {plugin_instance.dynamic_tags}")
+            plugin_cls = self._find_plugin_class(module, getattr(package, "PLUGIN_CLASS", None))
+            if plugin_cls is None:
+                print(f"插件 {folder_name} 的入口模块 {module.__name__} 中没有插件类")
+                return None
 
-                    self.plugins.append(plugin_instance)
+            return plugin_cls()
 
         except Exception as e:
-            print(f"加载插件 {path} 失败: {e}")
+            print(f"加载插件 {folder_name} 失败: {e}")
+            return None
+
+    @staticmethod
+    def _find_plugin_class(module, class_name=None):
+        """在入口模块中查找插件类：优先使用 PLUGIN_CLASS 声明，否则取模块内定义的唯一插件类"""
+        if class_name:
+            return getattr(module, class_name, None)
+
+        candidates = [obj for _, obj in inspect.getmembers(module, inspect.isclass)
+                      if issubclass(obj, PluginInterface) and obj is not PluginInterface
+                      and obj.__module__ == module.__name__]
+        if len(candidates) > 1:
+            print(f"[Warn] {module.__name__} 定义了多个插件类，仅加载 {candidates[0].__name__}，"
+                  f"可在 __init__.py 中用 PLUGIN_CLASS 指定")
+        return candidates[0] if candidates else None
+
+    @staticmethod
+    def _describe(folder_name, plugin):
+        """生成写入清单缓存的插件元数据"""
+        plugin_cls = type(plugin)
+        return {
+            "name": plugin.name,
+            "icon": PluginManifest.encode_icon(plugin.icon, folder_name),
+            "group": plugin.group,
+            "description": plugin.description,
+            "theme_color": plugin.theme_color,
+            "keywords": list(getattr(plugin, 'keywords', []) or []),
+            "dynamic_tags": getattr(plugin, 'dynamic_tags', []),
+            "entry": plugin_cls.__module__,
+            "class_name": plugin_cls.__name__,
+        }
+
+    @staticmethod
+    def import_plugin_class(meta):
+        """只导入入口模块并返回插件类，不实例化 (可在后台线程中调用)"""
+        module = importlib.import_module(meta["entry"])
+        plugin_cls = getattr(module, meta["class_name"], None)
+        if plugin_cls is None:
+            raise ImportError(f"插件类 {meta['class_name']} 不存在于 {meta['entry']}")
+        return plugin_cls
+
+    def import_plugin(self, meta):
+        """按清单记录的入口模块和类名导入并实例化插件 (供 LazyPlugin 首次使用时在 UI 线程调用)"""
+        plugin_instance = self.import_plugin_class(meta)()
+        plugin_instance.dynamic_tags = meta.get("dynamic_tags", [])
+        return plugin_instance
 
     def get_plugins(self, include_disabled=False):
         """返回排序后的插件列表"""
@@ -89,4 +149,4 @@ class PluginManager:
         if not include_disabled:
             return [p for p in sorted_list if p.name not in disabled_list]
         else:
-            return sorted_list
\ No newline at end of file
+            return sorted_list
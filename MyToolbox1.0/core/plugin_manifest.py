@@ -0,0 +1,239 @@
+import hashlib
+import json
+import os
+import threading
+
+from .config import ConfigManager
+from .keyword_extractor import KeywordExtractor
+
+
+class PluginManifest:
+    """
+    插件清单缓存 (APP_DATA_DIR/plugin_manifest.json)
+    按插件目录记录元数据 (名称、图标、分组、描述、主题色、关键词、入口模块) 和源码指纹，
+    指纹不变时首页直接由缓存构建，完全不需要导入插件模块。
+    另按单个源文件的内容哈希缓存搜索关键词 (见 KeywordExtractor)。
+    """
+    VERSION = 5
+    MANIFEST_FILE = ConfigManager.APP_DATA_DIR / "plugin_manifest.json"
+    ICON_CACHE_DIR = ConfigManager.APP_DATA_DIR / "plugin_icons"
+    ICON_RENDER_SIZE = 96
+    # 与 ResourceManager.ICON_DIR 相同；插件返回的 QIcon 通常由这里的文件生成
+    ICON_SOURCE_DIR = ConfigManager.PROJECT_ROOT / "resources" / "icons"
+
+    def __init__(self):
+        self.entries = {}
+        self.keywords = {}  # "<插件目录>/<相对路径>" -> {"hash": 文件哈希, "tokens": {关键词: 次数}}
+        self.dirty = False
+        self._icon_signature = None
+
+    @classmethod
+    def load(cls):
+        manifest = cls()
+        try:
+            with open(cls.MANIFEST_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            # 关键词随分词方式 (是否安装 jieba) 变化，切换后整份缓存重建
+            if data.get("version") == cls.VERSION and data.get("tokenizer") == KeywordExtractor.TOKENIZER:
+                manifest.entries = data.get("plugins", {})
+                manifest.keywords = data.get("keywords", {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"[Manifest] Load Error: {e}")
+        return manifest
+
+    def save(self):
+        if not self.dirty:
+            return
+        try:
+            tmp_file = self.MANIFEST_FILE.with_suffix(".json.tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump({"version": self.VERSION, "tokenizer": KeywordExtractor.TOKENIZER,
+                           "plugins": self.entries, "keywords": self.keywords}, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_file, self.MANIFEST_FILE)
+            self.dirty = False
+        except Exception as e:
+            print(f"[Manifest] Save Error: {e}")
+
+    def get(self, folder_name, fingerprint):
+        """指纹匹配时返回缓存的插件元数据列表，否则返回 None"""
+        entry = self.entries.get(folder_name)
+        if not entry or entry.get("fingerprint") != fingerprint:
+            return None
+        plugins_meta = entry.get("plugins", [])
+        # 预渲染的 PNG 图标在图标资源变化后失效，需要重新导入插件生成
+        for meta in plugins_meta:
+            icon = meta.get("icon") or {}
+            if icon.get("type") == "file" and icon.get("source") != self.icon_signature():
+                return None
+        return plugins_meta
+
+    def icon_signature(self):
+        """图标资源目录的签名 (每次启动只计算一次)"""
+        if self._icon_signature is None:
+            self._icon_signature = self.icon_dir_signature()
+        return self._icon_signature
+
+    @classmethod
+    def icon_dir_signature(cls):
+        """只 stat 不读内容：图标目录中 (文件名, mtime, size) 的哈希"""
+        h = hashlib.sha1()
+        try:
+            with os.scandir(cls.ICON_SOURCE_DIR) as it:
+                entries = sorted((e.name, e.stat()) for e in it if e.is_file())
+        except OSError:
+            entries = []
+        for name, st in entries:
+            h.update(f"{name}|{st.st_mtime_ns}|{st.st_size};".encode("utf-8"))
+        return h.hexdigest()
+
+    def put(self, folder_name, fingerprint, plugins_meta):
+        self.entries[folder_name] = {"fingerprint": fingerprint, "plugins": plugins_meta}
+        self.dirty = True
+
+    def get_keywords(self, file_key, file_hash):
+        """文件内容未变化时返回缓存的关键词，否则返回 None"""
+        entry = self.keywords.get(file_key)
+        if entry and entry.get("hash") == file_hash:
+            return entry.get("tokens", [])
+        return None
+
+    def put_keywords(self, file_key, file_hash, tokens):
+        self.keywords[file_key] = {"hash": file_hash, "tokens": dict(tokens)}
+        self.dirty = True
+
+    def prune_keywords(self, folder_name, file_keys):
+        """移除插件目录中已删除文件的关键词缓存 (file_keys 为目录中现存文件的缓存键)"""
+        prefix = f"{folder_name}/"
+        for key in list(self.keywords):
+            if key.startswith(prefix) and key not in file_keys:
+                del self.keywords[key]
+                self.dirty = True
+
+    def prune(self, folder_names):
+        """移除已经不存在的插件目录 (及其文件关键词缓存)"""
+        for name in list(self.entries):
+            if name not in folder_names:
+                del self.entries[name]
+                self.dirty = True
+        for key in list(self.keywords):
+            if key.split("/", 1)[0] not in folder_names:
+                del self.keywords[key]
+                self.dirty = True
+
+    @staticmethod
+    def fingerprint(folder_path):
+        """
+        插件目录的源码指纹
+        只 stat 不读内容：(相对路径, mtime, size) 的哈希，任何 .py 变化都会使缓存失效
+        """
+        h = hashlib.sha1()
+        for root, dirs, files in os.walk(folder_path):
+            dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+            for file in sorted(files):
+                if not file.endswith(".py"):
+                    continue
+                path = os.path.join(root, file)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                rel = os.path.relpath(path, folder_path).replace(os.sep, "/")
+                h.update(f"{rel}|{st.st_mtime_ns}|{st.st_size};".encode("utf-8"))
+        return h.hexdigest()
+
+    # ---------------- 图标序列化 ----------------
+    @classmethod
+    def encode_icon(cls, icon, cache_key):
+        """
+        把插件图标转成可写入 JSON 的描述
+        FluentIcon -> 枚举名；字符串 -> 原样；QIcon -> 预渲染为 PNG 存入缓存目录
+        (同时记录图标目录签名，资源文件被替换后缓存失效)
+        """
+        from PySide6.QtGui import QIcon
+        from qfluentwidgets import FluentIcon
+
+        if isinstance(icon, FluentIcon):
+            return {"type": "fluent", "value": icon.name}
+        if isinstance(icon, str):
+            return {"type": "name", "value": icon}
+        if isinstance(icon, QIcon) and not icon.isNull():
+            cls.ICON_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            png_path = cls.ICON_CACHE_DIR / f"{cache_key}.png"
+            size = cls.ICON_RENDER_SIZE
+            if icon.pixmap(size, size).save(str(png_path), "PNG"):
+                return {"type": "file", "value": str(png_path), "source": cls.icon_dir_signature()}
+        return {"type": "none", "value": ""}
+
+    @staticmethod
+    def decode_icon(data):
+        from PySide6.QtGui import QIcon
+        from qfluentwidgets import FluentIcon
+        from .resource_manager import ResourceManager
+
+        icon_type = (data or {}).get("type")
+        value = (data or {}).get("value", "")
+        if icon_type == "fluent" and hasattr(FluentIcon, value):
+            return getattr(FluentIcon, value)
+        if icon_type == "name":
+            return value
+        if icon_type == "file" and os.path.exists(value):
+            return QIcon(value)
+        return ResourceManager.get_fallback_icon()
+
+
+class LazyPlugin:
+    """
+    由清单缓存构造的插件代理
+    首页卡片、搜索、排序只用到缓存的元数据；
+    第一次调用 create_widget() (或访问其它插件属性) 时才导入真正的插件模块。
+    """
+
+    def __init__(self, manager, meta):
+        self._manager = manager
+        self._meta = meta
+        self._plugin = None
+        self._icon = None
+        self._load_lock = threading.Lock()  # 预热线程与 UI 线程可能同时触发导入
+
+        self.name = meta["name"]
+        self.group = meta.get("group", "")
+        self.description = meta.get("description", "暂无描述")
+        self.theme_color = meta.get("theme_color", "#009faa")
+        self.keywords = meta.get("keywords", [])
+        self.dynamic_tags = meta.get("dynamic_tags", [])
+
+    @property
+    def icon(self):
+        if self._plugin is not None:
+            return self._plugin.icon
+        if self._icon is None:
+            self._icon = PluginManifest.decode_icon(self._meta.get("icon"))
+        return self._icon
+
+    @property
+    def is_loaded(self):
+        return self._plugin is not None
+
+    def import_module(self):
+        """只导入插件模块，不实例化 (插件类可能创建 Qt 对象，实例化必须留在 UI 线程)"""
+        with self._load_lock:
+            if self._plugin is None:
+                self._manager.import_plugin_class(self._meta)
+
+    def load(self):
+        """导入插件模块并实例化真正的插件对象"""
+        with self._load_lock:
+            if self._plugin is None:
+                self._plugin = self._manager.import_plugin(self._meta)
+        return self._plugin
+
+    def create_widget(self):
+        return self.load().create_widget()
+
+    def __getattr__(self, item):
+        # 只有缓存里没有的属性才会走到这里，此时才真正导入插件
+        if item.startswith("_"):
+            raise AttributeError(item)
+        return getattr(self.load(), item)
@@ -0,0 +1,177 @@
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    """
+    启动耗时分析器
+    通过环境变量 MYTOOLBOX_PROFILE_STARTUP=1 或命令行参数 --profile-startup[=trace.json] 开启，
+    记录各启动阶段的墙钟时间和峰值内存 (tracemalloc)，首帧绘制后输出
+    Chrome Trace JSON (可在 chrome://tracing 或 Perfetto 中打开) 并在控制台打印汇总表。
+    未开启时 span() 是空操作，不产生额外开销。
+    """
+    ENV_VAR = "MYTOOLBOX_PROFILE_STARTUP"
+    CLI_FLAG = "--profile-startup"
+    DEFAULT_OUTPUT = "startup_trace.json"
+
+    enabled = False
+    output_path = DEFAULT_OUTPUT
+
+    _origin = 0.0
+    _events = []
+    _stack = []  # 正在进行的 span: [name, start, 子 span 期间观测到的峰值]
+    _finished = False
+    _owns_tracing = False  # tracemalloc 由分析器开启且没有其他使用者时，结束后才关闭
+
+    @classmethod
+    def configure(cls, argv=None):
+        """从环境变量和命令行参数判断是否开启 (会从 argv 中移除本工具的参数)"""
+        argv = sys.argv if argv is None else argv
+        env_value = os.getenv(cls.ENV_VAR, "")
+        output = None
+
+        for arg in list(argv[1:]):
+            if arg == cls.CLI_FLAG or arg.startswith(cls.CLI_FLAG + "="):
+                argv.remove(arg)
+                output = arg.partition("=")[2] or cls.DEFAULT_OUTPUT
+
+        if output is None and env_value and env_value != "0":
+            # 环境变量既可以是开关 (1)，也可以直接给出输出路径
+            output = cls.DEFAULT_OUTPUT if env_value == "1" else env_value
+
+        if output is not None:
+            cls.enable(output)
+        return cls.enabled
+
+    @classmethod
+    def enable(cls, output_path=DEFAULT_OUTPUT):
+        cls.enabled = True
+        cls.output_path = output_path
+        cls._origin = time.perf_counter()
+        cls._events = []
+        cls._stack = []
+        cls._finished = False
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            cls._owns_tracing = True
+
+    @classmethod
+    def share_tracing(cls):
+        """其他组件 (ResourceMonitor) 也依赖 tracemalloc 时调用，分析结束后不再关闭它"""
+        cls._owns_tracing = False
+
+    @classmethod
+    @contextmanager
+    def span(cls, name, **args):
+        """记录一个阶段：with StartupProfiler.span("load_plugins"): ..."""
+        if not cls.enabled or cls._finished or threading.current_thread() is not threading.main_thread():
+            yield
+            return
+
+        # tracemalloc 的峰值是全局的：进入子阶段前先把当前峰值记到父阶段上，再重置
+        current, peak = tracemalloc.get_traced_memory()
+        if cls._stack:
+            cls._stack[-1][2] = max(cls._stack[-1][2], peak)
+        tracemalloc.reset_peak()
+
+        frame = [name, time.perf_counter(), current]
+        cls._stack.append(frame)
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            current_end, peak = tracemalloc.get_traced_memory()
+            cls._stack.pop()
+            peak = max(peak, frame[2])
+            if cls._stack:
+                cls._stack[-1][2] = max(cls._stack[-1][2], peak)
+
+            event_args = {"peak_kb": round(peak / 1024, 1),
+                          "alloc_kb": round((current_end - current) / 1024, 1)}
+            event_args.update(args)
+            cls._events.append({
+                "name": name,
+                "cat": "startup",
+                "ph": "X",
+                "ts": round((frame[1] - cls._origin) * 1e6, 1),
+                "dur": round((end - frame[1]) * 1e6, 1),
+                "pid": os.getpid(),
+                "tid": 1,
+                "args": event_args,
+                "_depth": len(cls._stack),
+            })
+
+    @classmethod
+    def mark(cls, name):
+        """记录一个瞬时事件 (例如首帧绘制)"""
+        if not cls.enabled or cls._finished:
+            return
+        cls._events.append({
+            "name": name,
+            "cat": "startup",
+            "ph": "i",
+            "s": "p",
+            "ts": round((time.perf_counter() - cls._origin) * 1e6, 1),
+            "pid": os.getpid(),
+            "tid": 1,
+            "_depth": len(cls._stack),
+        })
+
+    @classmethod
+    def watch_first_paint(cls, widget):
+        """在 widget 第一次绘制后结束记录并输出报告"""
+        if not cls.enabled:
+            return
+        from PySide6.QtCore import QObject, QEvent, QTimer
+
+        class _FirstPaintFilter(QObject):
+            def eventFilter(self, obj, event):
+                if event.type() == QEvent.Paint:
+                    obj.removeEventFilter(self)
+                    # 等这一帧的绘制真正完成后再结束
+                    QTimer.singleShot(0, lambda: (cls.mark("first_paint"), cls.finish()))
+                return False
+
+        cls._paint_filter = _FirstPaintFilter(widget)
+        widget.installEventFilter(cls._paint_filter)
+
+    @classmethod
+    def finish(cls):
+        """写出 Chrome Trace JSON 并打印汇总表"""
+        if not cls.enabled or cls._finished:
+            return
+        cls._finished = True
+
+        events = sorted(cls._events, key=lambda e: (e["ts"], -e.get("dur", 0)))
+        trace = {
+            "traceEvents": [{k: v for k, v in e.items() if not k.startswith("_")} for e in events],
+            "displayTimeUnit": "ms",
+        }
+        try:
+            with open(cls.output_path, "w", encoding="utf-8") as f:
+                json.dump(trace, f, ensure_ascii=False, indent=1)
+            print(f"[Profiler] Trace 已写入: {os.path.abspath(cls.output_path)}")
+        except Exception as e:
+            print(f"[Profiler] Trace 写入失败: {e}")
+
+        print(cls.format_summary(events))
+        if cls._owns_tracing:
+            cls._owns_tracing = False
+            tracemalloc.stop()
+
+    @staticmethod
+    def format_summary(events):
+        lines = [f"{'阶段':<48}{'开始(ms)':>10}{'耗时(ms)':>10}{'峰值(KB)':>12}", "-" * 80]
+        for e in events:
+            label = "  " * e.get("_depth", 0) + e["name"]
+            start = e["ts"] / 1000
+            if e["ph"] == "X":
+                lines.append(f"{label:<48}{start:>10.1f}{e['dur'] / 1000:>10.1f}{e['args']['peak_kb']:>12.1f}")
+            else:
+                lines.append(f"{label:<48}{start:>10.1f}{'*':>10}{'':>12}")
+        return "\n".join(lines)
@@ -1,5 +1,8 @@
 import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
+from PySide6.QtCore import QCoreApplication, QFileSystemWatcher
 from PySide6.QtGui import QIcon
 from qfluentwidgets import FluentIcon
 
@@ -9,31 +12,58 @@ class ResourceManager:
     # 假设结构是 MyToolbox/core/resource_manager.py
     ROOT_DIR = Path(__file__).resolve().parent.parent
     ICON_DIR = ROOT_DIR / "resources" / "icons"
+    ICON_EXTS = ('.svg', '.png', '.ico')  # 同名文件的优先级
+
+    CACHE_SIZE = 256  # 已解析图标的 LRU 容量
+    # SVG 首次加载时预先渲染的尺寸 (首页卡片 48、标签页 32、菜单/按钮 16)，设为空元组即关闭
+    PRERENDER_SIZES = (16, 32, 48)
+
+    _index = None  # 图标名 -> 文件路径，整个目录只扫描一次
+    _index_lower = None
+    # 图标名 -> QIcon / FluentIcon (None 表示未找到，避免重复查找和重复告警)
+    # FluentIcon 只缓存枚举，取用时再生成 QIcon，以便跟随明暗主题切换
+    _cache = OrderedDict()
+    _fallback = None
+    _watcher = None
+    _lock = threading.RLock()
 
     @classmethod
     def get_icon(cls, name: str):
         """
         全能图标获取方法
         优先级：自定义文件 > Fluent图标 > 系统保底图标
+        结果 (包括未找到) 会被缓存，同一个名字只解析一次
         """
         if not name:
             return cls.get_fallback_icon()
 
+        with cls._lock:
+            if name in cls._cache:
+                cls._cache.move_to_end(name)
+                icon = cls._cache[name]
+            else:
+                icon = cls._resolve(name)
+                cls._cache[name] = icon
+                if len(cls._cache) > cls.CACHE_SIZE:
+                    cls._cache.popitem(last=False)
+        if icon is None:
+            return cls.get_fallback_icon()
+        return icon.icon() if isinstance(icon, FluentIcon) else icon
+
+    @classmethod
+    def _resolve(cls, name):
         # 1. 查找本地资源文件 (resources/icons/name.svg/png)
         # 支持传入 "edit" 自动找 "edit.svg"
-        if not os.path.exists(cls.ICON_DIR):
-            os.makedirs(cls.ICON_DIR, exist_ok=True)
-
-        for ext in ['.svg', '.png', '.ico']:
-            icon_path = cls.ICON_DIR / f"{name}{ext}"
-            if icon_path.exists():
-                return QIcon(str(icon_path))
+        index = cls._ensure_index()
+        icon_path = index.get(name) or cls._index_lower.get(name.lower())
+        if icon_path:
+            return cls._load_file_icon(icon_path)
 
         # 2. 查找 FluentIcon 枚举 (不区分大小写)
         # 例如传入 "edit", "EDIT" 都能找到 FluentIcon.EDIT
         upper_name = name.upper()
         if hasattr(FluentIcon, upper_name):
-            return getattr(FluentIcon, upper_name).icon()
+            return getattr(FluentIcon, upper_name)
 
         # 3. 常用别名映射 (兼容旧习惯)
         aliases = {
@@ -46,25 +76,85 @@ class ResourceManager:
         if name.lower() in aliases:
             target = aliases[name.lower()]
             if hasattr(FluentIcon, target):
-                return getattr(FluentIcon, target).icon()
+                return getattr(FluentIcon, target)
 
-        # 4. 没找到，返回保底图标
+        # 4. 没找到，返回保底图标 (结果会被缓存，告警只打印一次)
         print(f"[Icon Warning] 图标 '{name}' 未找到，使用默认图标。")
-        return cls.get_fallback_icon()
+        return None
+
+    @classmethod
+    def _ensure_index(cls):
+        """扫描图标目录建立 名称 -> 路径 索引，并监听目录变化"""
+        if cls._index is not None:
+            return cls._index
+
+        os.makedirs(cls.ICON_DIR, exist_ok=True)
+        index = {}
+        rank = {ext: i for i, ext in enumerate(cls.ICON_EXTS)}
+        try:
+            entries = sorted(os.scandir(cls.ICON_DIR),
+                             key=lambda e: rank.get(os.path.splitext(e.name)[1].lower(), len(rank)))
+        except OSError as e:
+            print(f"[Icon Warning] 图标目录扫描失败: {e}")
+            entries = []
+        for entry in entries:
+            stem, ext = os.path.splitext(entry.name)
+            if ext.lower() in rank and entry.is_file():
+                index.setdefault(stem, entry.path)
+
+        cls._index = index
+        # 按不区分大小写的方式再建一份 (与 Windows 文件系统的行为一致)
+        cls._index_lower = {}
+        for stem, path in index.items():
+            cls._index_lower.setdefault(stem.lower(), path)
+        cls._watch_icon_dir()
+        return index
+
+    @classmethod
+    def _watch_icon_dir(cls):
+        # 文件监听依赖事件循环，QApplication 创建之前只建索引不监听
+        if cls._watcher is not None or QCoreApplication.instance() is None:
+            return
+        cls._watcher = QFileSystemWatcher([str(cls.ICON_DIR)])
+        cls._watcher.directoryChanged.connect(lambda _: cls.invalidate())
+
+    @classmethod
+    def invalidate(cls):
+        """图标目录发生变化 (例如在图标浏览器中导入了新图标) 时清空索引和缓存"""
+        with cls._lock:
+            cls._index = None
+            cls._index_lower = None
+            cls._cache.clear()
+
+    @classmethod
+    def _load_file_icon(cls, path):
+        icon = QIcon(path)
+        if path.lower().endswith('.svg'):
+            # 预先渲染常用尺寸，结果进入 Qt 的像素图缓存，之后绘制不再解析 SVG
+            for size in cls.PRERENDER_SIZES:
+                icon.pixmap(size, size)
+        return icon
 
     @classmethod
     def get_fallback_icon(cls):
         """
         获取绝对存在的保底图标 (问号)
         """
+        if cls._fallback is None:
+            cls._fallback = cls._find_fallback_icon()
+        fallback = cls._fallback
+        return fallback.icon() if isinstance(fallback, FluentIcon) else fallback
+
+    @classmethod
+    def _find_fallback_icon(cls):
         # QUESTION 是 FluentIcon 中非常基础的图标，通常都存在
         if hasattr(FluentIcon, 'QUESTION'):
-            return FluentIcon.QUESTION.icon()
+            return FluentIcon.QUESTION
 
         # 如果连 QUESTION 都没有 (极低概率)，尝试 HELP 或 SEARCH
         for backup in ['HELP', 'SEARCH', 'HOME']:
             if hasattr(FluentIcon, backup):
-                return getattr(FluentIcon, backup).icon()
+                return getattr(FluentIcon, backup)
 
         # 如果系统里一个图标都没有，返回空 QIcon (不会报错，只是不显示)
         return QIcon()
@@ -0,0 +1,189 @@
+import re
+from bisect import bisect_left
+from collections import defaultdict
+
+try:
+    from pypinyin import lazy_pinyin, Style
+except ImportError:
+    lazy_pinyin = None
+
+# GB2312 一级汉字按拼音排序，每个声母对应一段连续编码 (无 pypinyin 时的首字母兜底方案)
+_GB2312_INITIALS = [
+    (0xB0A1, 'a'), (0xB0C5, 'b'), (0xB2C1, 'c'), (0xB4EE, 'd'), (0xB6EA, 'e'), (0xB7A2, 'f'),
+    (0xB8C1, 'g'), (0xB9FE, 'h'), (0xBBF7, 'j'), (0xBFA6, 'k'), (0xC0AC, 'l'), (0xC2E8, 'm'),
+    (0xC4C3, 'n'), (0xC5B6, 'o'), (0xC5BE, 'p'), (0xC6DA, 'q'), (0xC8BB, 'r'), (0xC8F6, 's'),
+    (0xCBFA, 't'), (0xCDDA, 'w'), (0xCEF4, 'x'), (0xD1B9, 'y'), (0xD4D1, 'z'),
+]
+_GB2312_LEVEL1_END = 0xD7F9
+_GB2312_STARTS = [code for code, _ in _GB2312_INITIALS]
+
+_CJK_RE = re.compile(r'[一-鿿]+')
+_WORD_RE = re.compile(r'[一-鿿]+|[a-z0-9]+')
+
+
+def _char_initial(ch):
+    try:
+        raw = ch.encode('gb2312')
+    except UnicodeEncodeError:
+        return ''
+    if len(raw) != 2:
+        return ''
+    code = (raw[0] << 8) | raw[1]
+    if code < _GB2312_STARTS[0] or code > _GB2312_LEVEL1_END:
+        return ''
+    return _GB2312_INITIALS[bisect_left(_GB2312_STARTS, code + 1) - 1][1]
+
+
+def pinyin_variants(text):
+    """返回中文文本的拼音首字母 (以及安装了 pypinyin 时的全拼)，例如 颜色助手 -> ['yszs', 'yansezhushou']"""
+    chars = ''.join(_CJK_RE.findall(text))
+    if not chars:
+        return []
+    if lazy_pinyin is not None:
+        initials = ''.join(lazy_pinyin(chars, style=Style.FIRST_LETTER))
+        full = ''.join(lazy_pinyin(chars))
+        return [initials, full]
+    initials = ''.join(_char_initial(c) for c in chars)
+    return [initials] if initials else []
+
+
+def tokenize(text):
+    """
+    分词：英文/数字按单词切分；中文连续片段拆成单字 + 相邻二字组
+    (不依赖分词库，也能让 "颜色"、"助手" 这类查询命中 "颜色助手")
+    """
+    tokens = []
+    for word in _WORD_RE.findall((text or '').lower()):
+        if _CJK_RE.fullmatch(word):
+            tokens.extend(word)
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+class PluginSearchIndex:
+    """
+    首页插件搜索索引
+    倒排索引 (词 -> 文档权重) + 排序词表 (前缀匹配) + 三字组索引 (子串匹配)，
+    名称支持拼音首字母，结果按字段权重和匹配方式综合打分排序。
+    """
+    # 字段权重：名称命中比描述命中更相关
+    FIELD_WEIGHTS = {
+        "name": 10,
+        "pinyin": 8,
+        "keywords": 6,
+        "group": 4,
+        "description": 3,
+        "tags": 1,
+    }
+    # 匹配方式系数：完全匹配 > 前缀 > 子串
+    EXACT, PREFIX, SUBSTRING = 3, 2, 1
+    # 查询词通过索引一个文档都没命中时，退回原文子串匹配的分数 (与旧版子串过滤的结果保持一致)
+    RAW_SUBSTRING = 1
+
+    def __init__(self):
+        self.size = 0
+        self._postings = defaultdict(dict)  # token -> {doc_id: 最大字段权重}
+        self._sorted_tokens = []
+        self._trigrams = defaultdict(set)  # 三字组 -> 包含它的 token
+        self._short_grams = defaultdict(set)  # 单字 / 二字组 -> 包含它的 token (一两个字符的查询词)
+        self._texts = []  # 每个文档的小写原文，只在索引完全未命中时用于兜底的子串匹配
+
+    def build(self, plugins):
+        self.__init__()
+        for doc_id, plugin in enumerate(plugins):
+            fields = {
+                "name": getattr(plugin, 'name', ''),
+                "group": getattr(plugin, 'group', ''),
+                "description": getattr(plugin, 'description', ''),
+                "keywords": " ".join(getattr(plugin, 'keywords', None) or []),
+                "tags": " ".join(getattr(plugin, 'dynamic_tags', None) or []),
+            }
+            for field, text in fields.items():
+                self._add(doc_id, tokenize(text), self.FIELD_WEIGHTS[field])
+            self._add(doc_id, pinyin_variants(fields["name"]), self.FIELD_WEIGHTS["pinyin"])
+            self._texts.append(" ".join(fields.values()).lower())
+        self.size = len(plugins)
+
+        self._sorted_tokens = sorted(self._postings)
+        for token in self._sorted_tokens:
+            for n, grams in ((1, self._short_grams), (2, self._short_grams), (3, self._trigrams)):
+                for i in range(len(token) - n + 1):
+                    grams[token[i:i + n]].add(token)
+        return self
+
+    def _add(self, doc_id, tokens, weight):
+        for token in tokens:
+            postings = self._postings[token]
+            if postings.get(doc_id, 0) < weight:
+                postings[doc_id] = weight
+
+    def _candidate_tokens(self, term):
+        """返回 [(token, 匹配系数)]"""
+        matches = {}
+        # 前缀：在排序词表上二分
+        start = bisect_left(self._sorted_tokens, term)
+        for token in self._sorted_tokens[start:]:
+            if not token.startswith(term):
+                break
+            matches[token] = self.EXACT if token == term else self.PREFIX
+
+        # 子串：一两个字符的词直接查短词组索引，更长的词取三字组倒排的交集，再做一次确认
+        if len(term) < 3:
+            for token in self._short_grams.get(term, ()):
+                if token not in matches:
+                    matches[token] = self.SUBSTRING
+        else:
+            grams = [self._trigrams.get(term[i:i + 3], set()) for i in range(len(term) - 2)]
+            for token in set.intersection(*grams) if grams else ():
+                if term in token and token not in matches:
+                    matches[token] = self.SUBSTRING
+        return matches.items()
+
+    def _score_term(self, term):
+        scores = {}
+        for token, quality in self._candidate_tokens(term):
+            for doc_id, weight in self._postings[token].items():
+                score = weight * quality
+                if scores.get(doc_id, 0) < score:
+                    scores[doc_id] = score
+        return scores
+
+    def search(self, query):
+        """
+        返回匹配的文档编号 (按相关度降序，同分保持原顺序)
+        空格分隔的每个查询词都必须命中；空查询返回全部
+        查询词与文档使用同一分词器；某个查询词通过索引一个文档都没命中时，才退回到原文子串匹配
+        """
+        parts = (query or '').lower().split()
+        if not parts:
+            return list(range(self.size))
+
+        total = None
+        for part in parts:
+            # 中文查询词拆成二字组，要求全部命中；其余查询词按文档的分词规则切分 (json/csv -> json, csv)
+            if _CJK_RE.fullmatch(part) and len(part) > 1:
+                terms = [part[i:i + 2] for i in range(len(part) - 1)]
+            else:
+                terms = tokenize(part)
+            scores = None
+            for term in terms:
+                term_scores = self._score_term(term)
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {d: scores[d] + s for d, s in term_scores.items() if d in scores}
+                if not scores:
+                    break
+            if not scores:
+                scores = {doc_id: self.RAW_SUBSTRING for doc_id, text in enumerate(self._texts) if part in text}
+
+            if total is None:
+                total = scores
+            else:
+                total = {d: total[d] + s for d, s in scores.items() if d in total}
+            if not total:
+                return []
+
+        return sorted(total, key=lambda d: (-total[d], d))
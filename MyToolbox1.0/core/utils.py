@@ -12,4 +12,50 @@ def get_base_path():
         return Path(sys.executable).parent
 
     # 2. 开发环境
-    return Path(__file__).resolve().parent.parent
\ No newline at end of file
+    return Path(__file__).resolve().parent.parent
+
+def get_process_memory_mb():
+    """
+    当前进程的常驻内存 (MB)，无法获取时返回 0
+    优先使用 psutil (可选依赖)，否则按平台退回到系统接口
+    """
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1048576
+    except ImportError:
+        pass
+
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            from ctypes import wintypes
+
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                            ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                            ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+            kernel32 = ctypes.windll.kernel32
+            psapi = ctypes.windll.psapi
+            kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+            psapi.GetProcessMemoryInfo.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESS_MEMORY_COUNTERS),
+                                                   wintypes.DWORD]
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            if psapi.GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+                return counters.WorkingSetSize / 1048576
+        elif os.path.exists("/proc/self/statm"):
+            with open("/proc/self/statm") as f:
+                resident_pages = int(f.read().split()[1])
+            return resident_pages * os.sysconf("SC_PAGE_SIZE") / 1048576
+        else:
+            # macOS 等：只能拿到峰值常驻内存，作为近似值
+            import resource
+            rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return rss / (1048576 if sys.platform == "darwin" else 1024)
+    except Exception:
+        pass
+    return 0.0
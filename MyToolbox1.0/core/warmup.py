@@ -0,0 +1,207 @@
+import threading
+import time
+
+from PySide6.QtCore import QObject, QThread, QTimer, QEvent, Signal
+from PySide6.QtWidgets import QApplication
+
+from .config import ConfigManager
+from .utils import get_process_memory_mb
+
+
+class _ImportThread(QThread):
+    """后台线程：按顺序导入插件模块 (不实例化插件类)，用户操作时暂停"""
+    plugin_imported = Signal(object)
+
+    def __init__(self, plugins, resume_event):
+        super().__init__()
+        self.plugins = plugins
+        self.resume_event = resume_event
+
+    def run(self):
+        for plugin in self.plugins:
+            self.resume_event.wait()
+            if self.isInterruptionRequested():
+                return
+            try:
+                plugin.import_module()
+            except Exception as e:
+                print(f"[Warmup] 预加载 {plugin.name} 失败: {e}")
+                continue
+            self.plugin_imported.emit(plugin)
+
+
+class WarmupScheduler(QObject):
+    """
+    首帧之后的插件预热
+    1. 空闲一段时间后，在后台线程按使用次数从高到低预先导入插件模块；
+    2. 每个模块导入完成后回到 UI 线程实例化插件类 (一次一个)；
+       全部导入后每个事件循环周期只构建一个插件界面，避免长时间卡住；
+    3. 用户点击或按键时暂停，空闲后继续；进程内存超过上限时停止。
+    预构建的界面由 take_widget() 交给标签页使用，第一次打开即可直接显示。
+    """
+    IDLE_MS = 1500  # 首帧后 / 用户操作后等待多久开始 (继续) 预热
+    USER_EVENTS = (QEvent.MouseButtonPress, QEvent.KeyPress, QEvent.Wheel)
+
+    DEFAULT_SETTINGS = {
+        "enabled": True,
+        "max_plugins": 3,  # 预导入的插件数量
+        "max_widgets": 2,  # 预构建界面的插件数量
+        "memory_limit_mb": 800,
+    }
+
+    def __init__(self, plugins, parent=None):
+        super().__init__(parent)
+        settings = dict(self.DEFAULT_SETTINGS)
+        settings.update(ConfigManager.get("warmup", {}) or {})
+        self.settings = settings
+
+        self.plugins = plugins
+        self._prebuilt = {}
+        self._opened = set()  # 已经被用户打开过的插件不再预构建
+        self._build_queue = []
+        self._thread = None
+        self._cancelled = False
+        self._resume = threading.Event()
+
+        self._idle_timer = QTimer(self)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.timeout.connect(self._on_idle)
+
+        self._build_timer = QTimer(self)
+        self._build_timer.setInterval(0)
+        self._build_timer.timeout.connect(self._build_next)
+
+    # ---------------- 使用统计 ----------------
+    @staticmethod
+    def record_usage(plugin_name):
+        """打开一次插件，使用次数 +1 (用于预热排序)"""
+        usage = ConfigManager.get("plugin_usage", {}) or {}
+        usage[plugin_name] = usage.get(plugin_name, 0) + 1
+        ConfigManager.set("plugin_usage", usage)
+
+    def ranked_plugins(self):
+        usage = ConfigManager.get("plugin_usage", {}) or {}
+        used = [p for p in self.plugins if usage.get(p.name, 0) > 0]
+        return sorted(used, key=lambda p: usage[p.name], reverse=True)
+
+    # ---------------- 调度控制 ----------------
+    def start(self):
+        if not self.settings.get("enabled", True) or self._cancelled:
+            return
+        candidates = self.ranked_plugins()[:self.settings["max_plugins"]]
+        if not candidates:
+            return
+
+        self._build_queue = candidates[:self.settings["max_widgets"]]
+        # 已经导入过的插件 (例如清单缓存失效时扫描得到的实例) 不需要再进后台线程
+        to_import = [p for p in candidates if not getattr(p, "is_loaded", True)]
+
+        app = QApplication.instance()
+        if app is not None:
+            app.installEventFilter(self)
+
+        self._thread = _ImportThread(to_import, self._resume)
+        self._thread.plugin_imported.connect(self._on_plugin_imported)
+        self._thread.finished.connect(self._schedule_build)
+        self._idle_timer.start(self.IDLE_MS)
+
+    def cancel(self):
+        """彻底停止预热，已构建的界面保留"""
+        self._cancelled = True
+        self._idle_timer.stop()
+        self._build_queue = []
+        if self._thread is not None:
+            self._thread.requestInterruption()
+        self._resume.set()
+        self._finish()
+
+    def _finish(self):
+        # 预热结束后不再监听全局事件
+        self._build_timer.stop()
+        app = QApplication.instance()
+        if app is not None:
+            app.removeEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        # 用户有操作时暂停，等再次空闲后继续
+        if event.type() in self.USER_EVENTS and not self._cancelled:
+            self._resume.clear()
+            self._build_timer.stop()
+            self._idle_timer.start(self.IDLE_MS)
+        return False
+
+    def _on_idle(self):
+        if self._cancelled:
+            return
+        if self._over_memory_limit():
+            self.cancel()
+            return
+        self._resume.set()
+        if self._thread is not None and not self._thread.isRunning() and not self._thread.isFinished():
+            self._thread.start(QThread.LowestPriority)
+        elif self._thread is None or self._thread.isFinished():
+            self._schedule_build()
+
+    def _on_plugin_imported(self, plugin):
+        # 排队信号在 UI 线程中逐个处理，每次只实例化一个插件
+        if self._cancelled:
+            return
+        try:
+            plugin.load()
+        except Exception as e:
+            print(f"[Warmup] 预加载 {plugin.name} 失败: {e}")
+            return
+        print(f"[Warmup] 已预加载: {plugin.name}")
+
+    def _schedule_build(self):
+        if self._cancelled or not self._resume.is_set():
+            return
+        if self._build_queue:
+            self._build_timer.start()
+        else:
+            self._finish()
+
+    # ---------------- UI 线程分片构建 ----------------
+    def _build_next(self):
+        """每个事件循环周期只构建一个界面，把时间片让给用户输入和绘制"""
+        if self._cancelled or not self._build_queue:
+            self._finish()
+            return
+        if self._over_memory_limit():
+            self.cancel()
+            return
+
+        plugin = self._build_queue.pop(0)
+        if plugin.name in self._prebuilt or plugin.name in self._opened:
+            return
+        try:
+            start = time.perf_counter()
+            widget = plugin.create_widget()
+            widget.hide()
+            self._prebuilt[plugin.name] = widget
+            print(f"[Warmup] 已预构建: {plugin.name} ({(time.perf_counter() - start) * 1000:.0f} ms)")
+        except Exception as e:
+            print(f"[Warmup] 预构建 {plugin.name} 失败: {e}")
+
+        if not self._build_queue:
+            self._finish()
+
+    def _over_memory_limit(self):
+        limit = self.settings.get("memory_limit_mb", 0)
+        if limit and get_process_memory_mb() > limit:
+            print(f"[Warmup] 内存超过 {limit} MB，停止预热")
+            return True
+        return False
+
+    def take_widget(self, plugin):
+        """取走预构建的界面 (只能使用一次)，没有则返回 None"""
+        self._opened.add(plugin.name)
+        return self._prebuilt.pop(plugin.name, None)
+
+    def shutdown(self):
+        self.cancel()
+        if self._thread is not None and self._thread.isRunning():
+            self._thread.wait(2000)
+        for widget in self._prebuilt.values():
+            widget.deleteLater()
+        self._prebuilt.clear()
@@ -5,23 +5,39 @@ import os
 project_root = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(project_root)
 
-# 2. 导入必要的模块
-from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import Qt
+# 2. 启动分析 (可选)：--profile-startup 或 MYTOOLBOX_PROFILE_STARTUP=1
+# 必须在导入 Qt 之前开启，才能统计到各阶段的导入耗时
+from core.profiler import StartupProfiler
 
 if __name__ == "__main__":
-    # 3. 首先设置高分屏缩放策略，必须在创建 QApplication 之前调用
+    StartupProfiler.configure()
+
+# 3. 导入必要的模块
+with StartupProfiler.span("import PySide6"):
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtCore import Qt
+
+if __name__ == "__main__":
+    # 4. 首先设置高分屏缩放策略，必须在创建 QApplication 之前调用
     if hasattr(Qt, 'HighDpiScaleFactorRoundingPolicy'):
         QApplication.setHighDpiScaleFactorRoundingPolicy(
             Qt.HighDpiScaleFactorRoundingPolicy.PassThrough)
     
-    # 4. 然后创建 QApplication
-    app = QApplication(sys.argv)
+    # 5. 然后创建 QApplication
+    # 资源统计 (可选)：--instrument 或 MYTOOLBOX_INSTRUMENT=1，开启后按工具实例统计事件耗时和内存
+    from core.instrumentation import ResourceMonitor, InstrumentedApplication
+    app_cls = InstrumentedApplication if ResourceMonitor.configure() else QApplication
+    with StartupProfiler.span("QApplication"):
+        app = app_cls(sys.argv)
     
-    # 5. 导入并创建 MainWindow
-    from ui.main_window import MainWindow
-    w = MainWindow()
-    w.show()
+    # 6. 导入并创建 MainWindow
+    with StartupProfiler.span("import ui.main_window"):
+        from ui.main_window import MainWindow
+    with StartupProfiler.span("MainWindow"):
+        w = MainWindow()
+    StartupProfiler.watch_first_paint(w)
+    with StartupProfiler.span("MainWindow.show"):
+        w.show()
     
-    # 6. 运行应用
-    sys.exit(app.exec())
\ No newline at end of file
+    # 7. 运行应用
+    sys.exit(app.exec())
@@ -0,0 +1,146 @@
+"""
+批量重命名命令行入口 (不启动 Qt，可在无显示环境中运行)
+
+在 MyToolbox1.0 目录下运行：
+    python -m plugins.batch_rename --rules rules.json --dry-run DIR [DIR ...]
+    python -m plugins.batch_rename --rules rules.json --jobs 8 -r --include "*.jpg" DIR
+    python -m plugins.batch_rename --undo JOURNAL
+    python -m plugins.batch_rename --resume JOURNAL
+
+rules.json 与界面中的规则字典相同，例如 {"mode": 1, "template_str": "{exif:DateTimeOriginal}_{seq}"}。
+计划和执行结果以 JSONL 逐行输出到 stdout，汇总信息输出到 stderr。
+退出码：0 成功；1 有文件重命名失败；2 存在冲突 (未执行)；3 参数错误。
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+
+from plugins.batch_rename.conflicts import ConflictAnalyzer
+from plugins.batch_rename.engine import RenameEngine
+from plugins.batch_rename.executor import plan_renames, RenameExecutor, RenameJournal, JOURNAL_DIR
+from plugins.batch_rename.ingest import iter_files
+from plugins.batch_rename.metadata import MetadataExtractor
+
+_print_lock = threading.Lock()
+
+
+def emit(record):
+    line = json.dumps(record, ensure_ascii=False)
+    with _print_lock:
+        sys.stdout.write(line + "\n")
+
+
+def load_rules(path):
+    with open(path, "r", encoding="utf-8") as f:
+        rules = json.load(f)
+    # 界面中这两个开关由输入框是否为空决定，规则文件中可以省略
+    rules.setdefault('replace_enabled', bool(rules.get('find_text')))
+    rules.setdefault('add_text_enabled', bool(rules.get('prefix_text') or rules.get('suffix_text')))
+    return rules
+
+
+def build_plan(files, rules, jobs):
+    """返回 (源路径, 新路径, 状态) 列表，状态为 ok / unchanged / conflict"""
+    names = [os.path.basename(p) for p in files]
+
+    metadata = None
+    tokens = RenameEngine.metadata_tokens(rules)
+    if tokens:
+        values = {r[0]: r[3] for r in MetadataExtractor.extract_many(files, tokens, jobs=jobs)}
+        empty = {}
+        metadata = lambda i: values.get(files[i], empty)
+
+    new_names = list(RenameEngine.iter_names(names, rules, metadata))
+    conflicts = ConflictAnalyzer().find_conflicts(files, names, new_names)
+
+    plan = []
+    for path, name, new_name, conflict in zip(files, names, new_names, conflicts):
+        dst = path[:len(path) - len(name)] + new_name
+        status = "conflict" if conflict else ("unchanged" if new_name == name else "ok")
+        plan.append((path, dst, status))
+    return plan
+
+
+def execute(steps, journal, jobs, write_plan=True):
+    print(f"日志: {journal.path}", file=sys.stderr)
+
+    def on_result(step_id, src, dst, error):
+        record = {"op": "done" if error is None else "fail", "src": src, "dst": dst}
+        if error is not None:
+            record["error"] = error
+        emit(record)
+
+    success, failed = RenameExecutor(steps, journal, jobs, write_plan).run(on_result)
+    print(f"完成: 成功 {success} 个，失败 {failed} 个", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m plugins.batch_rename", description="批量重命名 (命令行)")
+    parser.add_argument("paths", nargs="*", help="文件或文件夹")
+    parser.add_argument("--rules", help="规则 JSON 文件")
+    parser.add_argument("--dry-run", action="store_true", help="只输出计划，不执行")
+    parser.add_argument("-r", "--recursive", action="store_true", help="包含子文件夹")
+    parser.add_argument("--include", default="", help="只包含匹配的文件名，如 \"*.jpg;*.png\"")
+    parser.add_argument("--exclude", default="", help="排除匹配的文件 / 文件夹名")
+    parser.add_argument("--jobs", type=int, default=4, help="并行线程数 (按目录并行，默认 4)")
+    parser.add_argument("--journal-dir", default=str(JOURNAL_DIR), help="日志目录")
+    parser.add_argument("--undo", metavar="JOURNAL", help="根据日志撤销一次重命名")
+    parser.add_argument("--resume", metavar="JOURNAL", help="继续执行未完成的日志")
+    args = parser.parse_args(argv)
+    jobs = max(1, args.jobs)
+
+    if args.undo or args.resume:
+        journal_path = args.undo or args.resume
+        if not os.path.isfile(journal_path):
+            print(f"日志不存在: {journal_path}", file=sys.stderr)
+            return 3
+        if args.undo:
+            steps = RenameExecutor.rollback_steps(journal_path)
+        elif args.dry_run:
+            steps = RenameExecutor.resume_steps(journal_path)
+        else:
+            # 继续执行的结果追加到原日志，之后 --undo 原日志即可撤销整批
+            journal, steps = RenameExecutor.resume_journal(journal_path)
+        for _, src, dst in steps:
+            emit({"op": "plan", "src": src, "dst": dst})
+        if args.dry_run or not steps:
+            return 0
+        if args.resume:
+            return execute(steps, journal, jobs, write_plan=False)
+        return execute(steps, RenameJournal.create("undo", args.journal_dir), jobs)
+
+    if not args.rules or not args.paths:
+        parser.print_usage(sys.stderr)
+        print("需要 --rules 和至少一个路径", file=sys.stderr)
+        return 3
+    try:
+        rules = load_rules(args.rules)
+    except (OSError, ValueError) as e:
+        print(f"无法读取规则文件: {e}", file=sys.stderr)
+        return 3
+
+    # 同一文件出现在多个参数中时只保留一次
+    files = list(dict.fromkeys(iter_files(args.paths, args.recursive, args.include, args.exclude)))
+    plan = build_plan(files, rules, jobs)
+
+    conflicts = 0
+    for src, dst, status in plan:
+        emit({"op": "plan", "src": src, "dst": dst, "status": status})
+        if status == "conflict":
+            conflicts += 1
+    changed = sum(1 for _, _, status in plan if status == "ok")
+    print(f"共 {len(plan)} 个文件，需重命名 {changed} 个，冲突 {conflicts} 个", file=sys.stderr)
+
+    if conflicts:
+        return 2
+    if args.dry_run or not changed:
+        return 0
+    steps = plan_renames([(src, dst) for src, dst, status in plan if status == "ok"])
+    return execute(steps, RenameJournal.create("rename", args.journal_dir), jobs)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+import os
+import sys
+from collections import Counter
+
+# 无法探测时的默认值：Windows / macOS 默认文件系统不区分大小写
+DEFAULT_CASE_INSENSITIVE = os.name == 'nt' or sys.platform == 'darwin'
+
+
+class ConflictAnalyzer:
+    """
+    重命名冲突检测 (不依赖 Qt，界面和命令行共用)
+    冲突包括：
+        1. 批次内多个文件得到同一个目标名 (所有重复项都标记，而不仅是第二个起)；
+        2. 目标名与目录中已存在、且不属于本批次的文件同名。
+    每个目录只 os.scandir 一次，结果按目录 mtime 缓存；不区分大小写的文件系统按 casefold 比较。
+    每次检测为线性时间，可以在每次按键时运行。
+    """
+
+    def __init__(self):
+        self._listings = {}  # 目录 -> (mtime_ns, 已存在的文件名集合 (已按大小写规则归一))
+        self._case_insensitive = {}  # 目录 -> bool
+
+    def invalidate(self, directory=None):
+        if directory is None:
+            self._listings.clear()
+        else:
+            self._listings.pop(directory, None)
+
+    def find_conflicts(self, paths, names, new_names):
+        """
+        paths / names 为源文件路径和文件名，new_names 为对应的新文件名；
+        返回等长的 bool 列表，True 表示该文件的新名称冲突
+        """
+        # 目录取路径去掉文件名后的前缀 (保留末尾分隔符)，比 os.path.dirname 快，且 目录 + 文件名 就是完整路径
+        dirs = [p[:len(p) - len(n)] for p, n in zip(paths, names)]
+        unique_dirs = set(dirs)
+
+        insensitive = {d for d in unique_dirs if self.is_case_insensitive(d)}
+        if insensitive:
+            fold = str.casefold
+            new_keys = [fold(n) if d in insensitive else n for d, n in zip(dirs, new_names)]
+            old_keys = [fold(n) if d in insensitive else n for d, n in zip(dirs, names)]
+        else:
+            new_keys, old_keys = new_names, names
+
+        targets = list(map(str.__add__, dirs, new_keys))
+        counts = Counter(targets)
+        # 本批次的源文件都会被移走或保持原名 (保持原名时会在 counts 中与其他目标比较)，
+        # 所以磁盘上的这些名字不算占用
+        sources = set(map(str.__add__, dirs, old_keys))
+        occupied = {d: self._existing_names(d) for d in unique_dirs}
+
+        return [counts[t] > 1 or (n in occupied[d] and t not in sources)
+                for t, d, n in zip(targets, dirs, new_keys)]
+
+    # ---------------- 目录缓存 ----------------
+    def _existing_names(self, directory):
+        try:
+            mtime = os.stat(directory or '.').st_mtime_ns
+        except OSError:
+            return frozenset()
+
+        cached = self._listings.get(directory)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        normalize = str.casefold if self.is_case_insensitive(directory) else None
+        try:
+            with os.scandir(directory or '.') as it:
+                names = frozenset(normalize(e.name) if normalize else e.name for e in it)
+        except OSError:
+            names = frozenset()
+        self._listings[directory] = (mtime, names)
+        return names
+
+    def is_case_insensitive(self, directory):
+        """把目录名的大小写翻转后看是否指向同一目录；目录名中没有字母时使用平台默认值"""
+        cached = self._case_insensitive.get(directory)
+        if cached is not None:
+            return cached
+
+        directory_path = directory.rstrip('/\\') or directory or '.'
+        head, tail = os.path.split(os.path.abspath(directory_path))
+        swapped = tail.swapcase()
+        if swapped == tail:
+            result = DEFAULT_CASE_INSENSITIVE
+        else:
+            try:
+                result = os.path.samefile(directory_path, os.path.join(head, swapped))
+            except OSError:
+                result = False
+        self._case_insensitive[directory] = result
+        return result
@@ -0,0 +1,164 @@
+"""
+批量重命名引擎 (不依赖 Qt，界面、命令行和脚本共用)
+
+规则字典 (与 BatchRenameWidget.get_current_rules() 一致) 先通过 RenameEngine.compile()
+编译成一个 rename(filename, index) 函数：正则只编译一次、日期只渲染一次、模板预先拆分为
+格式串，之后对每个文件只做字符串拼接。
+模板中的文件元数据变量 ({mtime} {exif:DateTimeOriginal} 等，见 metadata.py) 由调用方预先提取，
+通过 compile(rules, metadata) 的 metadata(index) 回调提供。
+"""
+import os
+import re
+from datetime import datetime
+
+from plugins.batch_rename.metadata import METADATA_TOKEN_RE, field_name
+
+# 模板中支持的变量 (其余花括号内容按原样保留)
+TEMPLATE_TOKEN_RE = re.compile(r'\{(seq|old|date|mtime|size|ext|parent|w|h|hash8|exif:[A-Za-z]+)\}')
+
+CASE_FUNCS = {1: str.lower, 2: str.upper, 3: str.title}
+EXT_FUNCS = {1: str.lower, 2: str.upper}
+
+
+class _Fields(dict):
+    """元数据尚未提取完成时，缺少的字段渲染为空字符串"""
+
+    def __missing__(self, key):
+        return ""
+
+
+class RenameEngine:
+
+    @staticmethod
+    def metadata_tokens(rules):
+        """模板中用到的元数据变量，如 {'mtime', 'exif:DateTimeOriginal'}；不需要元数据时为空集合"""
+        if rules.get('mode', 0) != 1:
+            return set()
+        return set(METADATA_TOKEN_RE.findall(rules.get('template_str', '')))
+
+    @classmethod
+    def compile(cls, rules, metadata=None):
+        """
+        编译规则，返回 rename(filename, index) -> 新文件名
+        index 是文件在批次中的位置，序号为 seq_index + index；
+        metadata(index) 返回该文件的元数据字段字典 (只有模板用到元数据变量时才会调用)
+        """
+        if rules.get('mode', 0) == 1:
+            stem_func = cls._compile_template(rules, metadata)
+        else:
+            stem_func = cls._compile_replace(rules)
+        case_func = CASE_FUNCS.get(rules.get('case_mode', 0))
+        ext_func = EXT_FUNCS.get(rules.get('ext_mode', 0))
+        splitext = os.path.splitext
+
+        def rename(filename, index=0):
+            name, ext = splitext(filename)
+            new_name = stem_func(name, index)
+            if case_func is not None:
+                new_name = case_func(new_name)
+            if ext_func is not None:
+                ext = ext_func(ext)
+            return f"{new_name}{ext}"
+
+        return rename
+
+    @classmethod
+    def iter_names(cls, filenames, rules, metadata=None):
+        """对文件名序列逐个生成新文件名 (生成器，可用于大批量的流式处理)"""
+        rename = cls.compile(rules, metadata)
+        for index, filename in enumerate(filenames):
+            yield rename(filename, index)
+
+    @classmethod
+    def process(cls, filename, rules):
+        """兼容旧接口：按 rules['seq_index'] 处理单个文件名 (批量处理请使用 compile / iter_names)"""
+        return cls.compile(rules)(filename)
+
+    # ---------------- 编译各模式 ----------------
+    @staticmethod
+    def _compile_template(rules, metadata=None):
+        """全新命名：把模板拆成 str.format 格式串，日期在编译时渲染"""
+        template = rules.get('template_str', '{old}')
+        seq_start = rules.get('seq_index', 1)
+        padding = rules.get('seq_padding', 3)
+        date_str = None
+        uses_metadata = False
+
+        pieces = []
+        pos = 0
+        for match in TEMPLATE_TOKEN_RE.finditer(template):
+            pieces.append(template[pos:match.start()].replace('{', '{{').replace('}', '}}'))
+            token = match.group(1)
+            if token == 'seq':
+                pieces.append(f"{{seq:0{padding}d}}")
+            elif token == 'old':
+                pieces.append("{old}")
+            elif token == 'date':
+                if date_str is None:
+                    date_str = datetime.now().strftime('%Y%m%d')
+                pieces.append(date_str.replace('{', '{{').replace('}', '}}'))
+            else:
+                pieces.append(f"{{{field_name(token)}}}")
+                uses_metadata = True
+            pos = match.end()
+        pieces.append(template[pos:].replace('{', '{{').replace('}', '}}'))
+        fmt = ''.join(pieces)
+
+        if uses_metadata:
+            fmt_map = fmt.format_map
+            empty = {}
+
+            def render_with_metadata(name, index):
+                fields = _Fields(metadata(index) if metadata is not None else empty)
+                fields['old'] = name
+                fields['seq'] = seq_start + index
+                return fmt_map(fields)
+
+            return render_with_metadata
+
+        fmt = fmt.format
+
+        def render(name, index):
+            return fmt(old=name, seq=seq_start + index)
+
+        return render
+
+    @staticmethod
+    def _compile_replace(rules):
+        """文本替换：查找替换 + 前后缀"""
+        stages = []
+
+        find_str = rules.get('find_text', '')
+        if rules.get('replace_enabled') and find_str:
+            rep_str = rules.get('replace_text', '')
+            if rules.get('use_regex'):
+                try:
+                    pattern = re.compile(find_str)
+                except re.error:
+                    pattern = None  # 正则尚未输入完整时不做替换
+                if pattern is not None:
+                    def regex_stage(name, _sub=pattern.sub):
+                        try:
+                            return _sub(rep_str, name)
+                        except (re.error, IndexError):
+                            return name  # 替换串引用了不存在的分组
+                    stages.append(regex_stage)
+            else:
+                stages.append(lambda name: name.replace(find_str, rep_str))
+
+        if rules.get('add_text_enabled'):
+            prefix, suffix = rules.get('prefix_text', ''), rules.get('suffix_text', '')
+            stages.append(lambda name: f"{prefix}{name}{suffix}")
+
+        if not stages:
+            return lambda name, index: name
+        if len(stages) == 1:
+            stage = stages[0]
+            return lambda name, index: stage(name)
+
+        def run(name, index):
+            for stage in stages:
+                name = stage(name)
+            return name
+
+        return run
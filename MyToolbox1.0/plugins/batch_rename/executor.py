@@ -0,0 +1,357 @@
+"""
+批量重命名执行器 (不依赖 Qt，界面和命令行共用)
+
+1. plan_renames() 把 (源路径, 目标路径) 排成可安全执行的步骤：
+   目标名被批次内另一个文件占用时，先移走占用者 (链式 a->b, b->c)；
+   形成环 (a->b, b->a) 时先把其中一个改成临时名，最后再改回目标名。
+2. RenameExecutor 按目录分组，用线程池并行执行各目录的步骤 (同一目录内保持顺序)。
+3. 每一步都写入追加式的 JSONL 日志 (RenameJournal)，
+   可以据此撤销 (rollback_steps) 或在崩溃后继续执行 (resume_journal，继续追加到原日志)。
+批量重命名不跨目录，同一条链上的文件总在同一目录，因此按目录分组不会打乱依赖顺序。
+"""
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# 与 ConfigManager.APP_DATA_DIR 相同的位置；这里不导入 core.config，保证命令行模式不依赖 Qt
+JOURNAL_DIR = Path(os.getenv('LOCALAPPDATA') or Path.home() / ".local" / "share") / "MyToolbox" / "rename_journal"
+
+TEMP_SUFFIX = ".renametmp"
+MAX_JOURNALS = 50  # 只保留最近的日志
+
+
+def plan_renames(pairs):
+    """
+    pairs: [(源路径, 目标路径), ...]，目标路径应互不相同 (由 ConflictAnalyzer 保证)
+    返回按执行顺序排列的 [(步骤号, 源路径, 目标路径), ...]
+    """
+    norm = os.path.normcase
+    ops = {}
+    for src, dst in pairs:
+        if src != dst:
+            ops[norm(src)] = (src, dst)
+
+    # blocker[k]：操作 k 的目标路径正被另一个操作的源文件占用，需等那个操作先执行
+    blocker = {}
+    for key, (src, dst) in ops.items():
+        target = norm(dst)
+        blocker[key] = target if target in ops and target != key else None
+
+    token = uuid.uuid4().hex[:8]
+    steps = []
+    state = {}  # 1: 正在展开的链, 2: 已排好
+
+    def add(src, dst):
+        steps.append((len(steps), src, dst))
+
+    for start in ops:
+        if state.get(start):
+            continue
+        chain = []
+        cur = start
+        while cur is not None and not state.get(cur):
+            state[cur] = 1
+            chain.append(cur)
+            cur = blocker[cur]
+
+        for key in chain:
+            state[key] = 2
+
+        if cur is not None and cur in chain:
+            # 环：chain[i:] 中每个操作依赖下一个，最后一个依赖 chain[i]
+            i = chain.index(cur)
+            cycle, chain = chain[i:], chain[:i]
+            first_src, first_dst = ops[cycle[0]]
+            temp = _temp_path(first_src, token)
+            add(first_src, temp)
+            for key in reversed(cycle[1:]):
+                add(*ops[key])
+            add(temp, first_dst)
+        for key in reversed(chain):
+            add(*ops[key])
+    return steps
+
+
+def _temp_path(path, token):
+    directory, name = os.path.split(path)
+    candidate = os.path.join(directory, f".{name}.{token}{TEMP_SUFFIX}")
+    n = 0
+    while os.path.lexists(candidate):
+        n += 1
+        candidate = os.path.join(directory, f".{name}.{token}-{n}{TEMP_SUFFIX}")
+    return candidate
+
+
+class RenameJournal:
+    """
+    追加式 JSONL 日志，每行一条记录：
+        {"op": "begin", "kind": "rename" | "undo"}
+        {"op": "plan", "id": 0, "src": "...", "dst": "..."}   (执行前写入全部计划并 fsync)
+        {"op": "done", "id": 0} / {"op": "fail", "id": 0, "error": "..."}
+        {"op": "cancel"} / {"op": "end"}
+        {"op": "resume"}   (崩溃或取消后继续执行，之后的记录追加在同一份日志中)
+    每条记录写入后立即 flush，进程崩溃时最多丢失正在执行的那一步。
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._file = None
+
+    @classmethod
+    def create(cls, kind="rename", directory=None):
+        directory = Path(directory or JOURNAL_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        cls.prune(directory)
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}.jsonl"
+        journal = cls(directory / name)
+        journal.write({"op": "begin", "kind": kind, "time": time.time()})
+        return journal
+
+    def write(self, record):
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._open()
+            self._file.write(line)
+            self._file.flush()
+
+    def write_plan(self, steps):
+        with self._lock:
+            self._open()
+            self._file.writelines(json.dumps({"op": "plan", "id": i, "src": s, "dst": d}, ensure_ascii=False) + "\n"
+                                  for i, s, d in steps)
+            self._file.flush()
+            # 开始改名前确保计划已落盘，崩溃后才能据此撤销或继续
+            os.fsync(self._file.fileno())
+
+    def _open(self):
+        if self._file is not None:
+            return
+        # 崩溃后继续追加时，先结束写了一半的最后一行
+        partial = False
+        if self.path.exists() and self.path.stat().st_size:
+            with open(self.path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                partial = f.read(1) != b"\n"
+        self._file = open(self.path, "a", encoding="utf-8")
+        if partial:
+            self._file.write("\n")
+
+    def close(self, record=None):
+        if record is not None:
+            self.write(record)
+        with self._lock:
+            if self._file is not None:
+                os.fsync(self._file.fileno())
+                self._file.close()
+                self._file = None
+
+    @staticmethod
+    def read(path):
+        """返回 (计划步骤列表, 已完成步骤号列表 (按完成顺序), {失败步骤号: 错误}, 是否正常结束)"""
+        steps, done, failed, ended = [], [], {}, False
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # 崩溃时写了一半的行
+                op = record.get("op")
+                if op == "plan":
+                    steps.append((record["id"], record["src"], record["dst"]))
+                elif op == "done":
+                    done.append(record["id"])
+                elif op == "fail":
+                    failed[record["id"]] = record.get("error", "")
+                elif op == "end":
+                    ended = True
+        return steps, done, failed, ended
+
+    @staticmethod
+    def list_journals(directory=None):
+        """按时间从新到旧列出日志文件"""
+        directory = Path(directory or JOURNAL_DIR)
+        if not directory.exists():
+            return []
+        return sorted(directory.glob("*.jsonl"), reverse=True)
+
+    @classmethod
+    def prune(cls, directory=None, keep=MAX_JOURNALS):
+        """
+        只清理已正常结束的旧日志 (为即将创建的新日志预留一个名额)；
+        未结束的日志是恢复/回滚的唯一依据，无论多旧都保留
+        """
+        finished = []
+        for path in cls.list_journals(directory):
+            try:
+                if cls.is_finished(path):
+                    finished.append(path)
+            except OSError:
+                continue
+        for path in finished[keep - 1:]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    @staticmethod
+    def is_finished(path):
+        """只读取文件末尾判断最后一条记录是否为 end，避免解析整份日志"""
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(f.tell() - 4096, 0))
+            lines = f.read().splitlines()
+        if not lines:
+            return False
+        try:
+            return json.loads(lines[-1]).get("op") == "end"
+        except ValueError:
+            return False
+
+    @classmethod
+    def incomplete(cls, directory=None):
+        """未正常结束 (崩溃或取消) 的日志"""
+        result = []
+        for path in cls.list_journals(directory):
+            try:
+                if not cls.is_finished(path):
+                    result.append(path)
+            except OSError:
+                continue
+        return result
+
+
+class RenameExecutor:
+    """按目录并行执行重命名步骤，并写入日志"""
+
+    def __init__(self, steps, journal=None, jobs=4, write_plan=True):
+        self.steps = steps
+        self.journal = journal
+        self.jobs = max(1, jobs)
+        self.write_plan = write_plan  # 继续执行原日志时计划已在日志中，不再重复写入
+        self.success = 0
+        self.failed = 0
+        self._count_lock = threading.Lock()
+
+    def run(self, on_result=None, is_cancelled=None):
+        """
+        执行全部步骤，返回 (成功数, 失败数)
+        on_result(步骤号, 源路径, 目标路径, 错误或 None) 在工作线程中回调；
+        is_cancelled() 返回 True 时停止尚未开始的步骤。
+        """
+        journal = self.journal
+        if journal is not None and self.write_plan:
+            journal.write_plan(self.steps)
+
+        groups = {}
+        for step in self.steps:
+            groups.setdefault(os.path.dirname(step[1]), []).append(step)
+
+        def run_group(group):
+            for step_id, src, dst in group:
+                if is_cancelled is not None and is_cancelled():
+                    return
+                error = self._rename(src, dst)
+                if journal is not None:
+                    journal.write({"op": "done", "id": step_id} if error is None
+                                  else {"op": "fail", "id": step_id, "error": error})
+                with self._count_lock:
+                    if error is None:
+                        self.success += 1
+                    else:
+                        self.failed += 1
+                if on_result is not None:
+                    on_result(step_id, src, dst, error)
+
+        if len(groups) == 1 or self.jobs == 1:
+            for group in groups.values():
+                run_group(group)
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.jobs, len(groups))) as pool:
+                # list() 让工作线程中的异常在这里抛出
+                list(pool.map(run_group, groups.values()))
+
+        if journal is not None:
+            cancelled = is_cancelled is not None and is_cancelled()
+            journal.close({"op": "cancel"} if cancelled else {"op": "end"})
+        return self.success, self.failed
+
+    @staticmethod
+    def _rename(src, dst):
+        """执行一步重命名，成功返回 None，失败返回错误信息 (目标已存在时不覆盖)"""
+        try:
+            # os.rename 在 POSIX 上会静默覆盖目标，这里先检查；
+            # 仅大小写不同的改名在不区分大小写的文件系统上目标"已存在"，但就是同一个文件
+            if os.path.lexists(dst) and not _same_file(src, dst):
+                return f"目标已存在: {os.path.basename(dst)}"
+            os.rename(src, dst)
+            return None
+        except OSError as e:
+            return str(e)
+
+    # ---------------- 撤销 / 继续 ----------------
+    @staticmethod
+    def _split_unlogged(steps, done, failed):
+        """
+        把没有结果记录的步骤分为 (已执行, 未执行)
+        源已不存在而目标已存在的步骤视为已执行 (崩溃发生在改名之后、写日志之前)
+        """
+        finished = set(done) | set(failed)
+        applied, remaining = [], []
+        for step in steps:
+            step_id, src, dst = step
+            if step_id in finished:
+                continue
+            if not os.path.lexists(src) and os.path.lexists(dst):
+                applied.append(step)
+            else:
+                remaining.append(step)
+        return applied, remaining
+
+    @classmethod
+    def rollback_steps(cls, journal_path):
+        """
+        根据日志生成撤销步骤：已完成的步骤按相反顺序反向执行
+        未正常结束的日志中，已执行但未记录的步骤发生在最后，最先撤销
+        """
+        steps, done, failed, ended = RenameJournal.read(journal_path)
+        by_id = {step_id: (src, dst) for step_id, src, dst in steps}
+        order = list(reversed(done))
+        if not ended:
+            applied, _ = cls._split_unlogged(steps, done, failed)
+            order[:0] = [step_id for step_id, _, _ in reversed(applied)]
+        return [(i, by_id[step_id][1], by_id[step_id][0]) for i, step_id in enumerate(order)]
+
+    @classmethod
+    def resume_steps(cls, journal_path):
+        """根据未结束的日志生成剩余步骤 (保留原步骤号，只读，不修改日志)"""
+        steps, done, failed, _ = RenameJournal.read(journal_path)
+        return cls._split_unlogged(steps, done, failed)[1]
+
+    @classmethod
+    def resume_journal(cls, journal_path):
+        """
+        准备继续执行未结束的日志，返回 (日志, 剩余步骤)
+        剩余步骤追加到原日志中 (执行时应使用 write_plan=False)，撤销时前后两段一起回滚；
+        已执行但未记录的步骤先补记为 done，没有剩余步骤时直接结束日志
+        """
+        steps, done, failed, _ = RenameJournal.read(journal_path)
+        applied, remaining = cls._split_unlogged(steps, done, failed)
+        journal = RenameJournal(journal_path)
+        journal.write({"op": "resume", "time": time.time()})
+        for step_id, _, _ in applied:
+            journal.write({"op": "done", "id": step_id, "inferred": True})
+        if not remaining:
+            journal.close({"op": "end"})
+        return journal, remaining
+
+
+def _same_file(a, b):
+    try:
+        return os.path.samefile(a, b)
+    except OSError:
+        return False
@@ -0,0 +1,95 @@
+"""
+批量重命名的文件收集 (不依赖 Qt，界面和命令行共用)
+用 os.scandir 遍历文件夹，直接使用 DirEntry 自带的类型信息，不再为每个条目额外 stat；
+结果按块产出，调用方可以边遍历边显示。
+"""
+import os
+import re
+import time
+from fnmatch import translate
+
+try:
+    from natsort import natsort_keygen
+    _natural_key = natsort_keygen()
+except ImportError:
+    _natural_key = None
+
+
+def compile_globs(patterns):
+    """把 "*.jpg; *.png" 形式的通配符编译成一个正则 (不区分大小写)，为空时返回 None"""
+    if isinstance(patterns, str):
+        patterns = re.split(r'[;,]', patterns)
+    patterns = [p.strip() for p in patterns if p and p.strip()]
+    if not patterns:
+        return None
+    return re.compile('|'.join(translate(p) for p in patterns), re.IGNORECASE)
+
+
+def iter_files(roots, recursive=False, include=None, exclude=None, is_cancelled=None):
+    """
+    逐个产出文件路径
+    roots 中的文件直接产出；文件夹按 include / exclude (文件名通配符) 过滤后产出其中的文件，
+    recursive 为 True 时深度优先进入子文件夹 (exclude 同样作用于子文件夹名)。
+    同一文件夹内按文件名自然排序，保证序号分配稳定。
+    """
+    include_re = compile_globs(include or ())
+    exclude_re = compile_globs(exclude or ())
+    sort_key = _natural_key or str
+
+    for root in roots:
+        if not os.path.isdir(root):
+            if os.path.exists(root):
+                yield root
+            continue
+
+        stack = [root]
+        while stack:
+            if is_cancelled is not None and is_cancelled():
+                return
+            directory = stack.pop()
+            files, dirs = [], []
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        name = entry.name
+                        if exclude_re is not None and exclude_re.match(name):
+                            continue
+                        try:
+                            if entry.is_file():
+                                if include_re is None or include_re.match(name):
+                                    files.append(name)
+                            elif recursive and entry.is_dir(follow_symlinks=False):
+                                dirs.append(name)
+                        except OSError:
+                            continue
+            except OSError as e:
+                print(f"[BatchRename] 无法读取文件夹 {directory}: {e}")
+                continue
+
+            files.sort(key=sort_key)
+            join = os.path.join
+            for name in files:
+                yield join(directory, name)
+
+            # 反向压栈，使子文件夹按名称顺序出栈
+            dirs.sort(key=sort_key, reverse=True)
+            stack.extend(join(directory, name) for name in dirs)
+
+
+def iter_chunks(paths, chunk_size=2000, interval=0.1):
+    """
+    把路径流按块产出：攒够 chunk_size 个或距上次产出超过 interval 秒
+    每个路径都检查时间，网络盘等慢速目录中零星到达的文件也能及时显示
+    """
+    chunk = []
+    monotonic = time.monotonic
+    last = monotonic()
+    for path in paths:
+        chunk.append(path)
+        now = monotonic()
+        if len(chunk) >= chunk_size or now - last >= interval:
+            yield chunk
+            chunk = []
+            last = now
+    if chunk:
+        yield chunk
@@ -0,0 +1,193 @@
+"""
+文件元数据变量 (不依赖 Qt，界面和命令行共用)
+模板中的 {mtime} {size} {ext} {parent} {w} {h} {hash8} {exif:标签名} 由这里提取。
+只提取模板中实际用到的变量，结果按 (路径, 大小, 修改时间) 缓存，修改模板不会重新读取文件。
+图片尺寸和 EXIF 需要 Pillow (可选依赖)，未安装时这些变量为空。
+"""
+import hashlib
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+try:
+    from PIL import Image, ExifTags
+except ImportError:
+    Image = None
+
+# 模板变量名 -> format 字段名 (exif:Tag -> exif_Tag)
+METADATA_TOKEN_RE = re.compile(r'\{(mtime|size|ext|parent|w|h|hash8|exif:[A-Za-z]+)\}')
+
+IMAGE_FIELDS = {"w", "h"}
+PATH_FIELDS = {"ext", "parent"}
+
+# 文件名中不允许出现的字符
+_INVALID_CHARS_RE = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+# EXIF 日期 "2024:01:02 10:11:12" -> "20240102_101112"
+_EXIF_DATETIME_RE = re.compile(r'^(\d{4}):(\d{2}):(\d{2}) (\d{2}):(\d{2}):(\d{2})$')
+
+if Image is not None:
+    _EXIF_TAG_IDS = {name: tag for tag, name in ExifTags.TAGS.items()}
+    _EXIF_IFD = 0x8769  # DateTimeOriginal 等拍摄信息位于 Exif 子目录
+
+
+def field_name(token):
+    return token.replace(':', '_')
+
+
+def sanitize(value):
+    """把元数据值转成可用于文件名的字符串"""
+    text = str(value).strip().strip('\x00')
+    match = _EXIF_DATETIME_RE.match(text)
+    if match:
+        return "{}{}{}_{}{}{}".format(*match.groups())
+    return _INVALID_CHARS_RE.sub('-', text)
+
+
+class MetadataCache:
+    """
+    一次重命名会话的元数据缓存：path -> (大小, 修改时间, {字段名: 值})
+    界面线程只读取 values；提取在工作线程中进行，结果通过 merge() 合并。
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self.values = {}  # path -> {字段名: 值}，供 RenameEngine 渲染时直接查找
+
+    def missing(self, paths, fields):
+        """返回缺少任一字段的路径 (不访问磁盘)"""
+        fields = set(fields)
+        values = self.values
+        return [p for p in paths if not fields.issubset(values.get(p, ()))]
+
+    def lookup(self, path, size, mtime):
+        """工作线程中调用：文件未变化时返回已缓存的字段，否则返回 None"""
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == size and entry[1] == mtime:
+            return entry[2]
+        return None
+
+    def merge(self, results):
+        """results: [(path, 大小, 修改时间, {字段名: 值}), ...]"""
+        for path, size, mtime, fields in results:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == size and entry[1] == mtime:
+                entry[2].update(fields)
+            else:
+                entry = (size, mtime, dict(fields))
+                self._entries[path] = entry
+            self.values[path] = entry[2]
+
+    def clear(self):
+        self._entries.clear()
+        self.values.clear()
+
+
+class MetadataExtractor:
+
+    @staticmethod
+    def fields_for(tokens):
+        return {field_name(t) for t in tokens}
+
+    @classmethod
+    def extract(cls, path, fields, cache=None):
+        """提取单个文件的字段，返回 (path, 大小, 修改时间, {字段名: 值})"""
+        try:
+            st = os.stat(path)
+            size, mtime = st.st_size, st.st_mtime_ns
+        except OSError:
+            return path, -1, -1, {f: "" for f in fields}
+
+        cached = cache.lookup(path, size, mtime) if cache is not None else None
+        wanted = [f for f in fields if cached is None or f not in cached]
+        result = {}
+
+        for f in wanted:
+            if f == "mtime":
+                result[f] = datetime.fromtimestamp(st.st_mtime).strftime('%Y%m%d_%H%M%S')
+            elif f == "size":
+                result[f] = str(size)
+            elif f == "ext":
+                result[f] = os.path.splitext(path)[1].lstrip('.')
+            elif f == "parent":
+                result[f] = os.path.basename(os.path.dirname(path))
+
+        if "hash8" in wanted:
+            result["hash8"] = cls._hash8(path)
+
+        image_fields = [f for f in wanted if f in IMAGE_FIELDS or f.startswith("exif_")]
+        if image_fields:
+            result.update(cls._image_fields(path, image_fields))
+
+        return path, size, mtime, result
+
+    @classmethod
+    def extract_many(cls, paths, tokens, cache=None, jobs=4, on_results=None, is_cancelled=None,
+                     batch_size=256):
+        """
+        用线程池提取一批文件的元数据
+        on_results(list) 在调用线程中按批回调；未提供时返回全部结果列表。
+        """
+        fields = cls.fields_for(tokens)
+        # 只依赖路径的字段不需要访问磁盘
+        if fields <= PATH_FIELDS:
+            jobs = 1
+        collected = []
+        batch = []
+
+        def flush():
+            nonlocal batch
+            if not batch:
+                return
+            if on_results is not None:
+                on_results(batch)
+            else:
+                collected.extend(batch)
+            batch = []
+
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            # 分段提交，取消后不再排队剩余文件
+            for start in range(0, len(paths), batch_size):
+                if is_cancelled is not None and is_cancelled():
+                    break
+                chunk = paths[start:start + batch_size]
+                batch.extend(pool.map(lambda p: cls.extract(p, fields, cache), chunk))
+                flush()
+        return collected
+
+    @staticmethod
+    def _hash8(path):
+        digest = hashlib.sha1()
+        try:
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(block)
+        except OSError:
+            return ""
+        return digest.hexdigest()[:8]
+
+    @staticmethod
+    def _image_fields(path, fields):
+        """图片尺寸和 EXIF (Image.open 只读取文件头，不解码像素)"""
+        result = {f: "" for f in fields}
+        if Image is None:
+            return result
+        try:
+            with Image.open(path) as img:
+                if "w" in result:
+                    result["w"] = str(img.width)
+                if "h" in result:
+                    result["h"] = str(img.height)
+                exif_fields = [f for f in fields if f.startswith("exif_")]
+                if exif_fields:
+                    exif = img.getexif()
+                    sub_ifd = exif.get_ifd(_EXIF_IFD)
+                    for f in exif_fields:
+                        tag = _EXIF_TAG_IDS.get(f[len("exif_"):])
+                        value = sub_ifd.get(tag, exif.get(tag)) if tag is not None else None
+                        if value is not None:
+                            result[f] = sanitize(value)
+        except Exception:
+            pass  # 非图片或文件损坏
+        return result
+
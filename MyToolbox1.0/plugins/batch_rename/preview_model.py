@@ -0,0 +1,124 @@
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PySide6.QtGui import QColor
+
+from plugins.batch_rename.session import RenameSession
+
+STATUS_PENDING = '待处理'
+STATUS_OK = 'OK'
+STATUS_CONFLICT = '冲突'
+STATUS_DONE = '完成'
+STATUS_UNDONE = '已撤销'
+
+COLOR_CHANGED = QColor("#009688")
+COLOR_CONFLICT = QColor("#F44336")
+
+
+class RenamePreviewModel(QAbstractTableModel):
+    """
+    重命名预览表格模型：数据保存在 RenameSession 的平行列表中，颜色和文字在 data() 中按需计算，
+    视图只绘制可见行；规则变化时只对新文件名有变化的行发出 dataChanged。
+    """
+    HEADERS = ["原文件名", "新文件名", "状态"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.session = RenameSession()
+
+    # ---------------- 数据修改 ----------------
+    def append_files(self, paths):
+        """追加文件 (自动跳过已存在的路径)，返回实际添加的数量"""
+        session = self.session
+        paths = session.filter_new(paths)
+        if not paths:
+            return 0
+        start = len(session)
+        self.beginInsertRows(QModelIndex(), start, start + len(paths) - 1)
+        session.extend(paths, STATUS_PENDING)
+        self.endInsertRows()
+        return len(paths)
+
+    def remove_rows(self, rows):
+        if not rows:
+            return
+        self.beginResetModel()
+        self.session.remove_rows(rows)
+        self.endResetModel()
+
+    def clear(self):
+        self.beginResetModel()
+        self.session.clear()
+        self.endResetModel()
+
+    def set_preview(self, new_names, statuses):
+        """替换整列预览结果，只通知有变化的连续行段"""
+        session = self.session
+        old_names, old_statuses = session.new_names, session.statuses
+        session.new_names, session.statuses = new_names, statuses
+
+        changed = [i for i, (a, b, c, d) in enumerate(zip(old_names, new_names, old_statuses, statuses))
+                   if a != b or c != d]
+        self._emit_rows_changed(changed, 1, 2)
+
+    def set_row(self, row, path, status):
+        """单行更新 (重命名执行后回写结果)"""
+        self.session.set_path(row, path)
+        self.session.statuses[row] = status
+        self.dataChanged.emit(self.index(row, 0), self.index(row, 2))
+
+    def set_status(self, row, status):
+        self.session.statuses[row] = status
+        self.dataChanged.emit(self.index(row, 2), self.index(row, 2))
+
+    def _emit_rows_changed(self, rows, first_col, last_col):
+        """把有序的行号合并成连续区间后发出 dataChanged，避免逐行发信号"""
+        if not rows:
+            return
+        start = prev = rows[0]
+        for row in rows[1:]:
+            if row != prev + 1:
+                self.dataChanged.emit(self.index(start, first_col), self.index(prev, last_col))
+                start = row
+            prev = row
+        self.dataChanged.emit(self.index(start, first_col), self.index(prev, last_col))
+
+    # ---------------- Qt 模型接口 ----------------
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.session)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        session = self.session
+        row, col = index.row(), index.column()
+        if role == Qt.DisplayRole:
+            if col == 0:
+                return session.names[row]
+            if col == 1:
+                if session.statuses[row] == STATUS_CONFLICT:
+                    return f"{session.new_names[row]} (冲突)"
+                return session.new_names[row]
+            return session.statuses[row]
+        if role == Qt.ForegroundRole and col == 1:
+            if session.statuses[row] == STATUS_CONFLICT:
+                return COLOR_CONFLICT
+            if session.new_names[row] != session.names[row]:
+                return COLOR_CHANGED
+        if role == Qt.ToolTipRole and col == 0:
+            return session.paths[row]
+        return None
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        # 序号按行顺序分配，所以只支持按原文件名排序；排序后由界面重新计算预览
+        if column != 0 or not len(self.session):
+            return
+        self.beginResetModel()
+        self.session.sort_by_name(reverse=(order == Qt.DescendingOrder))
+        self.endResetModel()
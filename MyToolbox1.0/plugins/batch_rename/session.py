@@ -0,0 +1,90 @@
+import os
+
+try:
+    from natsort import natsort_keygen
+    _natural_key = natsort_keygen()
+except ImportError:
+    _natural_key = None
+
+
+class RenameSession:
+    """
+    一次批量重命名的文件列表 (不依赖 Qt)
+    每个字段一列平行列表 (路径、原名、新名、状态)，不再为每个文件保存一个字典；
+    另有 path -> 行号 索引，查重为 O(1)，批量添加、移除、排序都是线性或 n·log n。
+    """
+    __slots__ = ("paths", "names", "new_names", "statuses", "_index")
+
+    def __init__(self):
+        self.paths = []
+        self.names = []
+        self.new_names = []
+        self.statuses = []
+        self._index = {}  # path -> 行号
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __contains__(self, path):
+        return path in self._index
+
+    def row_of(self, path):
+        return self._index.get(path, -1)
+
+    # ---------------- 添加 ----------------
+    def filter_new(self, paths):
+        """去掉已在列表中 (以及本批次内重复) 的路径，保持原顺序"""
+        index = self._index
+        seen = set()
+        result = []
+        for path in paths:
+            if path in index or path in seen:
+                continue
+            seen.add(path)
+            result.append(path)
+        return result
+
+    def extend(self, paths, status):
+        """追加一批 (已去重的) 路径，新文件名初始与原名相同"""
+        start = len(self.paths)
+        names = [os.path.basename(p) for p in paths]
+        self.paths.extend(paths)
+        self.names.extend(names)
+        self.new_names.extend(names)
+        self.statuses.extend([status] * len(paths))
+        self._index.update(zip(paths, range(start, start + len(paths))))
+
+    # ---------------- 修改 ----------------
+    def set_path(self, row, path):
+        """文件被重命名后更新路径和原名"""
+        del self._index[self.paths[row]]
+        self.paths[row] = path
+        self.names[row] = os.path.basename(path)
+        self._index[path] = row
+
+    def remove_rows(self, rows):
+        """一次移除多行 (线性重建，不逐行 del)"""
+        rows = set(rows)
+        if not rows:
+            return
+        keep = [i for i in range(len(self.paths)) if i not in rows]
+        self._take(keep)
+
+    def sort_by_name(self, reverse=False):
+        """按原文件名自然排序 (安装了 natsort 时 "2" 排在 "10" 前面)"""
+        key = _natural_key or str
+        names = self.names
+        order = sorted(range(len(names)), key=lambda i: key(names[i]), reverse=reverse)
+        self._take(order)
+
+    def clear(self):
+        self.paths, self.names, self.new_names, self.statuses = [], [], [], []
+        self._index = {}
+
+    def _take(self, order):
+        """按行号序列重排 / 筛选各列，并重建索引"""
+        self.paths = [self.paths[i] for i in order]
+        self.names = [self.names[i] for i in order]
+        self.new_names = [self.new_names[i] for i in order]
+        self.statuses = [self.statuses[i] for i in order]
+        self._index = {path: row for row, path in enumerate(self.paths)}
@@ -1,25 +1,32 @@
-import os
-import re
-from datetime import datetime
 
 try:
     from natsort import natsorted
 except ImportError:
     natsorted = sorted
 
-from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget,
-                               QTableWidgetItem, QHeaderView, QFileDialog, QFrame,
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableView,
+                               QHeaderView, QFileDialog, QFrame,
                                QComboBox, QSpinBox, QCheckBox, QSplitter, QStackedWidget)
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QColor, QBrush
 
 from qfluentwidgets import (PrimaryPushButton, PushButton, LineEdit,
                             StrongBodyLabel, SubtitleLabel, CardWidget,
                             InfoBar, SegmentedWidget, ComboBox, ToolButton,
-                            FluentIcon, TransparentToolButton, BodyLabel)
+                            FluentIcon, TransparentToolButton, BodyLabel, ProgressBar,
+                            InfoBarPosition)
 
 from core.plugin_interface import PluginInterface
 from core.resource_manager import qicon
+from plugins.batch_rename.conflicts import ConflictAnalyzer
+from plugins.batch_rename.engine import RenameEngine
+from plugins.batch_rename.executor import plan_renames, RenameExecutor, RenameJournal
+from plugins.batch_rename.metadata import MetadataCache, MetadataExtractor
+from plugins.batch_rename.preview_model import (RenamePreviewModel, STATUS_OK, STATUS_CONFLICT,
+                                                STATUS_DONE, STATUS_UNDONE)
+from plugins.batch_rename.workers import RenameThread, IngestThread, MetadataThread
+
+# 正在运行的重命名线程 (界面关闭后线程仍需跑完，这里保持引用，避免 QThread 运行中被回收)
+_running_threads = set()
 
 
 # ==========================================
@@ -46,65 +53,20 @@ class BatchRenamePlugin(PluginInterface):
 
 
 # ==========================================
-# 2. 核心逻辑：重命名引擎
-# ==========================================
-class RenameEngine:
-    @staticmethod
-    def process(filename, rules):
-        name, ext = os.path.splitext(filename)
-        mode = rules.get('mode', 0)  # 0: Replace, 1: Rewrite
-
-        if mode == 1:
-            template = rules.get('template_str', '{old}')
-            if '{seq}' in template:
-                idx = rules['seq_index']
-                padding = rules['seq_padding']
-                seq_str = f"{idx:0{padding}d}"
-                template = template.replace('{seq}', seq_str)
-            template = template.replace('{old}', name)
-            if '{date}' in template:
-                now_str = datetime.now().strftime('%Y%m%d')
-                template = template.replace('{date}', now_str)
-            new_name = template
-        else:
-            new_name = name
-            if rules['replace_enabled']:
-                find_str = rules['find_text']
-                rep_str = rules['replace_text']
-                if find_str:
-                    if rules['use_regex']:
-                        try:
-                            new_name = re.sub(find_str, rep_str, new_name)
-                        except:
-                            pass
-                    else:
-                        new_name = new_name.replace(find_str, rep_str)
-            if rules['add_text_enabled']:
-                new_name = f"{rules['prefix_text']}{new_name}{rules['suffix_text']}"
-
-        case_mode = rules['case_mode']
-        if case_mode == 1:
-            new_name = new_name.lower()
-        elif case_mode == 2:
-            new_name = new_name.upper()
-        elif case_mode == 3:
-            new_name = new_name.title()
-
-        if rules['ext_mode'] == 1:
-            ext = ext.lower()
-        elif rules['ext_mode'] == 2:
-            ext = ext.upper()
-
-        return f"{new_name}{ext}"
-
-
-# ==========================================
-# 3. 主界面 Widget
+# 2. 主界面 Widget
 # ==========================================
 class BatchRenameWidget(QWidget):
     def __init__(self):
         super().__init__()
-        self.files = []
+        self.model = RenamePreviewModel(self)
+        self.conflicts = ConflictAnalyzer()
+        self.rename_thread = None
+        self.ingest_thread = None
+        # 模板元数据变量的缓存 (按路径、大小、修改时间)，只在本次会话内有效
+        self.metadata = MetadataCache()
+        self.metadata_thread = None
+        self.last_journal = None  # 最近一次重命名的日志，用于撤销
+        self._journal_checked = False
         self.init_ui()
         self.setAcceptDrops(True)
 
@@ -167,15 +129,26 @@ class BatchRenameWidget(QWidget):
         self.template_edit.setText("{old}_{seq}")
         pw_layout.addWidget(self.template_edit)
 
-        btn_vars_layout = QHBoxLayout()
-        for tag in ['{seq}', '{date}', '{old}']:
-            btn = PushButton(tag, self)
-            btn.clicked.connect(lambda ch=False, t=tag: self.template_edit.insert(t))
-            btn.setFixedHeight(28)
-            btn_vars_layout.addWidget(btn)
-        pw_layout.addLayout(btn_vars_layout)
-
-        pw_layout.addWidget(BodyLabel("变量说明:\n{seq}=序号, {date}=日期, {old}=原名", self))
+        # 每行一组变量按钮：(按钮文字, 插入的变量)
+        var_rows = [
+            [('{seq}', '{seq}'), ('{date}', '{date}'), ('{old}', '{old}')],
+            [('{mtime}', '{mtime}'), ('{size}', '{size}'), ('{ext}', '{ext}'), ('{parent}', '{parent}')],
+            [('{w}x{h}', '{w}x{h}'), ('{hash8}', '{hash8}'), ('拍摄时间', '{exif:DateTimeOriginal}')],
+        ]
+        for row in var_rows:
+            btn_vars_layout = QHBoxLayout()
+            for text, tag in row:
+                btn = PushButton(text, self)
+                btn.clicked.connect(lambda ch=False, t=tag: self.template_edit.insert(t))
+                btn.setFixedHeight(28)
+                btn_vars_layout.addWidget(btn)
+            pw_layout.addLayout(btn_vars_layout)
+
+        lbl_vars = BodyLabel("变量说明:\n{seq}=序号, {date}=日期, {old}=原名\n"
+                             "{mtime}=修改时间, {size}=字节数, {ext}=扩展名, {parent}=所在文件夹\n"
+                             "{w}/{h}=图片宽高, {hash8}=内容哈希, {exif:标签}=照片 EXIF", self)
+        lbl_vars.setWordWrap(True)
+        pw_layout.addWidget(lbl_vars)
         pw_layout.addStretch(1)
 
         self.stack.addWidget(self.page_replace)
@@ -211,10 +184,19 @@ class BatchRenameWidget(QWidget):
 
         self.config_layout.addStretch(1)
 
+        self.progress_bar = ProgressBar(self)
+        self.progress_bar.hide()
+        self.config_layout.addWidget(self.progress_bar)
+
         self.btn_apply = PrimaryPushButton("执行重命名", self)
         self.btn_apply.clicked.connect(self.apply_rename)
         self.config_layout.addWidget(self.btn_apply)
 
+        self.btn_undo = PushButton(qicon("return"), "撤销上次重命名", self)
+        self.btn_undo.setEnabled(False)
+        self.btn_undo.clicked.connect(self.undo_last_rename)
+        self.config_layout.addWidget(self.btn_undo)
+
         # --- 右侧：文件列表 ---
         list_container = QWidget()
         list_layout = QVBoxLayout(list_container)
@@ -223,22 +205,47 @@ class BatchRenameWidget(QWidget):
         tool_bar = QHBoxLayout()
 
         self.btn_add_files = PushButton(qicon("add"), "添加文件", self)
+        self.btn_add_folder = PushButton(qicon("folder"), "添加文件夹", self)
+        self.btn_cancel_ingest = PushButton(qicon("stop"), "停止添加", self)
+        self.btn_cancel_ingest.hide()
+        self.btn_remove = PushButton(qicon("remove"), "移除选中", self)
         self.btn_clear = PushButton(qicon("delete"), "清空", self)
         self.lbl_count = SubtitleLabel("0 个文件", self)
 
         tool_bar.addWidget(self.lbl_count)
         tool_bar.addStretch(1)
+        tool_bar.addWidget(self.btn_cancel_ingest)
         tool_bar.addWidget(self.btn_add_files)
+        tool_bar.addWidget(self.btn_add_folder)
+        tool_bar.addWidget(self.btn_remove)
         tool_bar.addWidget(self.btn_clear)
 
         list_layout.addLayout(tool_bar)
 
-        self.table = QTableWidget()
-        self.table.setColumnCount(3)
-        self.table.setHorizontalHeaderLabels(["原文件名", "新文件名", "状态"])
+        # 添加文件夹时的过滤选项
+        filter_bar = QHBoxLayout()
+        self.chk_recursive = QCheckBox("包含子文件夹", self)
+        self.include_edit = LineEdit(self)
+        self.include_edit.setPlaceholderText("包含, 例如: *.jpg; *.png")
+        self.exclude_edit = LineEdit(self)
+        self.exclude_edit.setPlaceholderText("排除, 例如: .*; Thumbs.db")
+        filter_bar.addWidget(self.chk_recursive)
+        filter_bar.addWidget(self.include_edit)
+        filter_bar.addWidget(self.exclude_edit)
+        list_layout.addLayout(filter_bar)
+
+        self.table = QTableView()
+        self.table.setModel(self.model)
         self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
         self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
         self.table.verticalHeader().setVisible(False)
+        # 固定行高，避免大量文件时逐行计算尺寸
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.setWordWrap(False)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        # 点击"原文件名"表头按名称排序，排序后序号随之重新分配
+        self.table.setSortingEnabled(True)
+        self.table.horizontalHeader().sortIndicatorChanged.connect(lambda *_: self.update_preview())
         self.table.setAlternatingRowColors(True)
         list_layout.addWidget(self.table)
 
@@ -269,6 +276,9 @@ class BatchRenameWidget(QWidget):
                 w.stateChanged.connect(self.update_preview)
 
         self.btn_add_files.clicked.connect(self.add_files_dialog)
+        self.btn_add_folder.clicked.connect(self.add_folder_dialog)
+        self.btn_cancel_ingest.clicked.connect(self.cancel_ingest)
+        self.btn_remove.clicked.connect(self.remove_selected)
         self.btn_clear.clicked.connect(self.clear_files)
 
     def create_separator(self):
@@ -308,25 +318,31 @@ class BatchRenameWidget(QWidget):
         files, _ = QFileDialog.getOpenFileNames(self, "选择文件", "", "All Files (*)")
         if files: self.add_files(files)
 
+    def add_folder_dialog(self):
+        folder = QFileDialog.getExistingDirectory(self, "选择文件夹")
+        if folder: self.ingest_paths([folder])
+
     def add_files(self, file_paths):
         try:
             file_paths = natsorted(file_paths)
         except:
             file_paths.sort()
 
-        for path in file_paths:
-            if any(f['path'] == path for f in self.files): continue
-            self.files.append({
-                'path': path,
-                'name': os.path.basename(path),
-                'new_name': os.path.basename(path),
-                'status': '待处理'
-            })
+        self.model.append_files(file_paths)
+        self.update_preview()
+
+    def remove_selected(self):
+        rows = {index.row() for index in self.table.selectionModel().selectedRows()}
+        if not rows: return
+        self.model.remove_rows(rows)
+        self.lbl_count.setText(f"{len(self.model.session)} 个文件")
         self.update_preview()
 
     def clear_files(self):
-        self.files = []
-        self.update_table_view()
+        self.detach_ingest()
+        self.detach_metadata()
+        self.metadata.clear()
+        self.model.clear()
         self.lbl_count.setText("0 个文件")
 
     def dragEnterEvent(self, event):
@@ -336,73 +352,214 @@ class BatchRenameWidget(QWidget):
             event.ignore()
 
     def dropEvent(self, event):
-        paths = []
-        for url in event.mimeData().urls():
-            path = url.toLocalFile()
-            if os.path.isdir(path):
-                for f in os.listdir(path):
-                    full = os.path.join(path, f)
-                    if os.path.isfile(full): paths.append(full)
-            else:
-                paths.append(path)
-        if paths: self.add_files(paths)
+        paths = [url.toLocalFile() for url in event.mimeData().urls()]
+        paths = [p for p in paths if p]
+        if paths: self.ingest_paths(paths)
+
+    def ingest_paths(self, paths):
+        """在后台线程中遍历文件和文件夹，分块加入列表 (可随时停止)"""
+        self.detach_ingest()
+        thread = IngestThread(paths, self.chk_recursive.isChecked(),
+                              self.include_edit.text(), self.exclude_edit.text())
+        thread.chunk_signal.connect(lambda chunk, t=thread: self.on_ingest_chunk(t, chunk))
+        thread.count_signal.connect(lambda n: self.lbl_count.setText(f"正在添加... 已找到 {n} 个文件"))
+        thread.finished_signal.connect(lambda n, cancelled, t=thread: self.on_ingest_finished(t, n, cancelled))
+        thread.finished.connect(lambda t=thread: _running_threads.discard(t))
+        _running_threads.add(thread)
+        self.ingest_thread = thread
+        self.btn_cancel_ingest.show()
+        thread.start()
+
+    def cancel_ingest(self):
+        # 停止遍历，已找到的文件保留，结束后照常刷新预览
+        if self.ingest_thread is not None: self.ingest_thread.stop()
+
+    def detach_ingest(self):
+        """停止并丢弃当前的添加任务 (之后到达的分块会被忽略)"""
+        self.cancel_ingest()
+        self.ingest_thread = None
+        self.btn_cancel_ingest.hide()
+
+    def on_ingest_chunk(self, thread, chunk):
+        if thread is not self.ingest_thread: return
+        # 添加过程中只追加行，预览在全部添加完成后统一计算一次
+        self.model.append_files(chunk)
+
+    def on_ingest_finished(self, thread, count, cancelled):
+        if thread is not self.ingest_thread: return  # 已被新的添加任务取代
+        self.ingest_thread = None
+        self.btn_cancel_ingest.hide()
+        self.update_preview()
+        self.lbl_count.setText(f"{len(self.model.session)} 个文件")
+        if cancelled: InfoBar.info("提示", f"已停止添加，共添加 {count} 个文件", parent=self)
 
     def update_preview(self):
-        if not self.files: return
+        session = self.model.session
+        if not len(session): return
         rules = self.get_current_rules()
-        start_idx = rules['seq_index']
-        conflict_map = {}
-
-        for i, file in enumerate(self.files):
-            current_rules = rules.copy()
-            current_rules['seq_index'] = start_idx + i
-            new_name = RenameEngine.process(file['name'], current_rules)
-            file['new_name'] = new_name
-
-            if new_name in conflict_map:
-                file['status'] = '冲突'
-                conflict_map[new_name] = True
-            else:
-                file['status'] = 'OK'
-                conflict_map[new_name] = False
-
-        self.update_table_view()
-        self.lbl_count.setText(f"{len(self.files)} 个文件")
-
-    def update_table_view(self):
-        self.table.setRowCount(len(self.files))
-        for i, file in enumerate(self.files):
-            item_old = QTableWidgetItem(file['name'])
-            self.table.setItem(i, 0, item_old)
-
-            item_new = QTableWidgetItem(file['new_name'])
-            if file['new_name'] != file['name']:
-                item_new.setForeground(QBrush(QColor("#009688")))
-            if file['status'] == '冲突':
-                item_new.setForeground(QBrush(QColor("#F44336")))
-                item_new.setText(f"{file['new_name']} (冲突)")
-            self.table.setItem(i, 1, item_new)
-            self.table.setItem(i, 2, QTableWidgetItem(file['status']))
+
+        # 模板用到元数据变量时，缓存中还没有的文件交给后台提取，提取完成后再刷新一次
+        metadata = None
+        tokens = RenameEngine.metadata_tokens(rules)
+        if tokens:
+            self.request_metadata(session.paths, tokens)
+            values, paths, empty = self.metadata.values, session.paths, {}
+            metadata = lambda i: values.get(paths[i], empty)
+
+        new_names = list(RenameEngine.iter_names(session.names, rules, metadata))
+        # 同时检查批次内重名和目标目录中已存在的文件
+        conflicts = self.conflicts.find_conflicts(session.paths, session.names, new_names)
+        statuses = [STATUS_CONFLICT if c else STATUS_OK for c in conflicts]
+
+        self.model.set_preview(new_names, statuses)
+        self.lbl_count.setText(f"{len(new_names)} 个文件")
+
+    def request_metadata(self, paths, tokens):
+        if self.metadata_thread is not None: return  # 完成后 update_preview 会再检查一次
+        missing = self.metadata.missing(paths, MetadataExtractor.fields_for(tokens))
+        if not missing: return
+
+        thread = MetadataThread(missing, tokens, self.metadata)
+        thread.results_signal.connect(lambda batch, t=thread: self.on_metadata_results(t, batch))
+        thread.finished_signal.connect(lambda t=thread: self.on_metadata_finished(t))
+        thread.finished.connect(lambda t=thread: _running_threads.discard(t))
+        _running_threads.add(thread)
+        self.metadata_thread = thread
+        self._metadata_done = 0
+        self._metadata_total = len(missing)
+        thread.start()
+
+    def detach_metadata(self):
+        if self.metadata_thread is not None:
+            self.metadata_thread.stop()
+            self.metadata_thread = None
+
+    def on_metadata_results(self, thread, batch):
+        if thread is not self.metadata_thread: return
+        self.metadata.merge(batch)
+        self._metadata_done += len(batch)
+        self.lbl_count.setText(f"正在读取文件信息 {self._metadata_done}/{self._metadata_total}")
+
+    def on_metadata_finished(self, thread):
+        if thread is not self.metadata_thread: return
+        self.metadata_thread = None
+        self.update_preview()
 
     def apply_rename(self):
-        if not self.files: return
-        if any(f['status'] == '冲突' for f in self.files):
+        session = self.model.session
+        if not len(session) or self.rename_thread is not None: return
+        if self.metadata_thread is not None:
+            InfoBar.warning("请稍候", "正在读取文件信息，完成后再执行重命名", parent=self)
+            return
+        if STATUS_CONFLICT in session.statuses:
             InfoBar.error("错误", "存在命名冲突", parent=self)
             return
 
-        success = 0
-        for file in self.files:
-            if file['new_name'] == file['name']: continue
-            old_path = file['path']
-            new_path = os.path.join(os.path.dirname(old_path), file['new_name'])
+        pairs = [(path, path[:len(path) - len(name)] + new_name)
+                 for path, name, new_name in zip(session.paths, session.names, session.new_names)
+                 if new_name != name]
+        if not pairs: return
+        # 按依赖排序 (链式、互换的文件名)，在后台线程中执行并写入日志
+        self.start_rename(plan_renames(pairs), "rename")
+
+    def undo_last_rename(self):
+        if not self.last_journal or self.rename_thread is not None: return
+        steps = RenameExecutor.rollback_steps(self.last_journal)
+        self.last_journal = None
+        self.btn_undo.setEnabled(False)
+        if steps: self.start_rename(steps, "undo")
+
+    def resume_rename(self, journal_path):
+        """继续执行上次未完成 (崩溃或取消) 的重命名，结果追加到原日志，撤销时整批回滚"""
+        if self.rename_thread is not None: return
+        try:
+            journal, steps = RenameExecutor.resume_journal(journal_path)
+        except OSError as e:
+            InfoBar.error("错误", f"无法读取重命名日志: {e}", parent=self)
+            return
+        if steps:
+            self.start_rename(steps, "resume", journal)
+        else:
+            self.last_journal = str(journal_path)
+            self.btn_undo.setEnabled(True)
+
+    def start_rename(self, steps, kind, journal=None):
+        # 继续执行时沿用原日志，计划已在其中
+        write_plan = journal is None
+        if journal is None:
             try:
-                os.rename(old_path, new_path)
-                file['name'] = file['new_name']
-                file['path'] = new_path
-                file['status'] = '完成'
-                success += 1
-            except Exception as e:
-                file['status'] = f'失败: {e}'
-
-        self.update_table_view()
-        InfoBar.success("完成", f"成功重命名 {success} 个文件", parent=self)
\ No newline at end of file
+                journal = RenameJournal.create(kind)
+            except OSError as e:
+                InfoBar.error("错误", f"无法创建重命名日志: {e}", parent=self)
+                return
+
+        thread = RenameThread(steps, journal, kind=kind, write_plan=write_plan)
+        thread.results_signal.connect(self.on_rename_results)
+        thread.progress_signal.connect(self.on_rename_progress)
+        thread.finished_signal.connect(self.on_rename_finished)
+        thread.finished.connect(lambda t=thread: _running_threads.discard(t))
+        _running_threads.add(thread)
+        self.rename_thread = thread
+
+        self.btn_apply.setEnabled(False)
+        self.btn_undo.setEnabled(False)
+        self.progress_bar.setRange(0, len(steps))
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+        thread.start()
+
+    def on_rename_results(self, batch):
+        model = self.model
+        session = model.session
+        undoing = self.rename_thread is not None and self.rename_thread.journal_kind == "undo"
+        done_status = STATUS_UNDONE if undoing else STATUS_DONE
+        for src, dst, error in batch:
+            row = session.row_of(src)
+            if row < 0: continue
+            if error is None:
+                model.set_row(row, dst, done_status)
+            else:
+                model.set_status(row, f'失败: {error}')
+
+    def on_rename_progress(self, processed, total):
+        self.progress_bar.setValue(processed)
+
+    def on_rename_finished(self, success, failed, journal_path):
+        kind = self.rename_thread.journal_kind if self.rename_thread else "rename"
+        self.rename_thread = None
+        self.progress_bar.hide()
+        self.btn_apply.setEnabled(True)
+        # 撤销操作本身不再提供撤销
+        self.last_journal = journal_path if kind != "undo" and success else None
+        self.btn_undo.setEnabled(bool(self.last_journal))
+
+        action = "撤销" if kind == "undo" else "重命名"
+        if failed:
+            InfoBar.warning("完成", f"成功{action} {success} 个文件，失败 {failed} 个", parent=self)
+        else:
+            InfoBar.success("完成", f"成功{action} {success} 个文件", parent=self)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self._journal_checked:
+            self._journal_checked = True
+            self.check_interrupted_rename()
+
+    def check_interrupted_rename(self):
+        """上次重命名中途崩溃或被取消时，提示继续执行"""
+        try:
+            pending = RenameJournal.incomplete()
+        except OSError:
+            return
+        if not pending: return
+        journal_path = pending[0]
+        bar = InfoBar.warning(
+            title="有未完成的重命名",
+            content=f"日志: {journal_path.name}",
+            duration=-1,
+            position=InfoBarPosition.TOP,
+            parent=self
+        )
+        btn = PushButton("继续执行", bar)
+        btn.clicked.connect(lambda: (bar.close(), self.resume_rename(journal_path)))
+        bar.addWidget(btn)
@@ -0,0 +1,124 @@
+import threading
+import time
+
+from PySide6.QtCore import QThread, Signal
+
+from plugins.batch_rename.executor import RenameExecutor
+from plugins.batch_rename.ingest import iter_files, iter_chunks
+from plugins.batch_rename.metadata import MetadataExtractor
+
+
+class RenameThread(QThread):
+    """
+    在后台线程中运行 RenameExecutor
+    各目录的工作线程逐步回调结果，这里攒成一批再通过信号发给界面，避免十万级文件时信号风暴
+    """
+    results_signal = Signal(list)  # [(源路径, 目标路径, 错误或 None), ...]
+    progress_signal = Signal(int, int)  # (已处理, 总数)
+    finished_signal = Signal(int, int, str)  # (成功数, 失败数, 日志路径)
+
+    BATCH_INTERVAL = 0.05  # 秒
+
+    def __init__(self, steps, journal, jobs=4, kind="rename", write_plan=True):
+        super().__init__()
+        self.executor = RenameExecutor(steps, journal, jobs, write_plan)
+        self.journal = journal
+        self.journal_kind = kind
+        self.total = len(steps)
+        self.is_running = True
+        self._pending = []
+        self._processed = 0
+        self._last_emit = 0.0
+        self._lock = threading.Lock()
+
+    def stop(self):
+        self.is_running = False
+
+    def run(self):
+        try:
+            success, failed = self.executor.run(self._on_result, lambda: not self.is_running)
+        except Exception as e:
+            print(f"[BatchRename] 重命名执行失败: {e}")
+            success, failed = self.executor.success, self.executor.failed
+        self._flush()
+        self.finished_signal.emit(success, failed, str(self.journal.path) if self.journal else "")
+
+    def _on_result(self, step_id, src, dst, error):
+        # 在执行器的工作线程中调用；在锁内发信号，保证各批次按完成顺序到达界面
+        with self._lock:
+            self._pending.append((src, dst, error))
+            self._processed += 1
+            now = time.monotonic()
+            if now - self._last_emit < self.BATCH_INTERVAL:
+                return
+            self._last_emit = now
+            batch, self._pending = self._pending, []
+            self.results_signal.emit(batch)
+            self.progress_signal.emit(self._processed, self.total)
+
+    def _flush(self):
+        with self._lock:
+            batch, self._pending = self._pending, []
+            processed = self._processed
+        if batch:
+            self.results_signal.emit(batch)
+        self.progress_signal.emit(processed, self.total)
+
+
+class IngestThread(QThread):
+    """后台遍历拖入的文件夹，按块发出文件路径"""
+    chunk_signal = Signal(list)
+    count_signal = Signal(int)  # 已找到的文件数
+    finished_signal = Signal(int, bool)  # (文件数, 是否被取消)
+
+    def __init__(self, roots, recursive=False, include=None, exclude=None):
+        super().__init__()
+        self.roots = roots
+        self.recursive = recursive
+        self.include = include
+        self.exclude = exclude
+        self.is_running = True
+
+    def stop(self):
+        self.is_running = False
+
+    def run(self):
+        count = 0
+        files = iter_files(self.roots, self.recursive, self.include, self.exclude,
+                           is_cancelled=lambda: not self.is_running)
+        try:
+            for chunk in iter_chunks(files):
+                if not self.is_running:
+                    break
+                count += len(chunk)
+                self.chunk_signal.emit(chunk)
+                self.count_signal.emit(count)
+        except Exception as e:
+            print(f"[BatchRename] 遍历文件夹失败: {e}")
+        self.finished_signal.emit(count, not self.is_running)
+
+
+class MetadataThread(QThread):
+    """在后台线程池中提取模板用到的文件元数据，按批发回界面线程合并到缓存"""
+    results_signal = Signal(list)  # [(path, 大小, 修改时间, {字段名: 值}), ...]
+    finished_signal = Signal()
+
+    def __init__(self, paths, tokens, cache, jobs=4):
+        super().__init__()
+        self.paths = paths
+        self.tokens = tokens
+        self.cache = cache  # 只在工作线程中读取，合并在界面线程进行
+        self.jobs = jobs
+        self.is_running = True
+
+    def stop(self):
+        self.is_running = False
+
+    def run(self):
+        try:
+            MetadataExtractor.extract_many(self.paths, self.tokens, self.cache, self.jobs,
+                                           on_results=self.results_signal.emit,
+                                           is_cancelled=lambda: not self.is_running)
+        except Exception as e:
+            print(f"[BatchRename] 读取文件信息失败: {e}")
+        self.finished_signal.emit()
@@ -1 +1,2 @@
-# TODO
+# 插件入口模块 (相对于本包)，PluginManager 只导入这一个模块
+PLUGIN_ENTRY = "tool"
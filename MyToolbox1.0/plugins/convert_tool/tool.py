@@ -37,6 +37,34 @@ class TextProcessorPlugin(PluginInterface):
 
     def create_widget(self) -> QWidget: return DataConverterWidget()
 
+    def save_state(self, widget):
+        return {
+            "page": ["json", "excel", "sql"][widget.stacked_widget.currentIndex()],
+            "json_input": widget.page_json.input_edit.toPlainText(),
+            "json_output": widget.page_json.output_edit.toPlainText(),
+            "excel_path": widget.page_excel.path_edit.text(),
+            "excel_result": widget.page_excel.result_view.toPlainText(),
+            "sql_excel_path": widget.page_sql.excel_path.text(),
+            "sql_table": widget.page_sql.table_name.text(),
+            "sql_target_db": widget.page_sql.db_path_1.text(),
+            "sql_source_db": widget.page_sql.db_path_2.text(),
+            "sql_query": widget.page_sql.sql_edit.toPlainText(),
+        }
+
+    def restore_state(self, widget, state):
+        widget.page_json.input_edit.setPlainText(state.get("json_input", ""))
+        widget.page_json.output_edit.setPlainText(state.get("json_output", ""))
+        widget.page_excel.path_edit.setText(state.get("excel_path", ""))
+        widget.page_excel.result_view.setPlainText(state.get("excel_result", ""))
+        widget.page_sql.excel_path.setText(state.get("sql_excel_path", ""))
+        widget.page_sql.table_name.setText(state.get("sql_table", ""))
+        widget.page_sql.db_path_1.setText(state.get("sql_target_db", ""))
+        widget.page_sql.db_path_2.setText(state.get("sql_source_db", ""))
+        widget.page_sql.sql_edit.setPlainText(state.get("sql_query", ""))
+        page = state.get("page", "json")
+        widget.pivot.setCurrentItem(page)
+        widget.stacked_widget.setCurrentIndex(["json", "excel", "sql"].index(page))
+
 
 # ==========================================
 # 2. 主界面 Widget
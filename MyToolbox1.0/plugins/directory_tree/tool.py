@@ -1,6 +1,5 @@
 import re
 import json
-import fnmatch
 from pathlib import Path
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout,
                                QFileDialog, QApplication, QStackedWidget,
@@ -17,6 +16,10 @@ from qfluentwidgets import (PrimaryPushButton, PushButton, CheckBox,
 
 from core.plugin_interface import PluginInterface
 from core.resource_manager import qicon
+from plugins.directory_tree.workers import TreeThread
+
+# 正在运行的遍历线程 (界面关闭后线程仍需退出，这里保持引用，避免 QThread 运行中被回收)
+_running_threads = set()
 
 
 # ==========================================
@@ -74,6 +77,9 @@ class DirectoryTreeWidget(QWidget):
                                ".vscode", "dist", "node_modules"]
         self.ignore_patterns = self.default_ignore.copy()
         self.emoji_blacklist = ['📁', '📄', '📝', '⚙️', '📦', '🔧', '⚡', '📚', '🔍', '📌', '✅', '📂', '🗂️']
+        self.tree_thread = None
+        self.tree_tip = None
+        self.tree_lines = []  # JSON 格式需要完整的行列表，生成结束后统一输出
         self.init_ui()
 
     def init_ui(self):
@@ -166,11 +172,15 @@ class DirectoryTreeWidget(QWidget):
         l3.addWidget(StrongBodyLabel("📋 输出结果", p))
         self.output_text = PlainTextEdit(p);
         self.output_text.setReadOnly(True)
+        self.output_text.setUndoRedoEnabled(False)  # 大目录逐块追加时不保留撤销记录
         l3.addWidget(self.output_text)
         h3 = QHBoxLayout()
         self.btn_gen = PrimaryPushButton(qicon("sync"), "生成目录树", p);
         self.btn_gen.clicked.connect(self.generate_directory_tree);
         self.btn_gen.setEnabled(False)
+        self.btn_stop = PushButton(qicon("stop"), "停止", p);
+        self.btn_stop.clicked.connect(self.cancel_tree);
+        self.btn_stop.hide()
         btn_cp = PushButton(qicon("copy"), "复制", p);
         btn_cp.clicked.connect(self.copy_output)
         btn_sv = PushButton(qicon("save"), "保存", p);
@@ -178,6 +188,7 @@ class DirectoryTreeWidget(QWidget):
         btn_cl2 = PushButton(qicon("delete"), "清空", p);
         btn_cl2.clicked.connect(lambda: self.output_text.clear())
         h3.addWidget(self.btn_gen);
+        h3.addWidget(self.btn_stop);
         h3.addWidget(btn_cp);
         h3.addWidget(btn_sv);
         h3.addWidget(btn_cl2);
@@ -267,6 +278,7 @@ class DirectoryTreeWidget(QWidget):
                                                                           parent=self)
 
     def clear_all(self):
+        self.detach_tree()
         self.folder_path_edit.clear();
         self.output_text.clear();
         self.input_tree.clear();
@@ -284,63 +296,73 @@ class DirectoryTreeWidget(QWidget):
 
     def generate_directory_tree(self):
         path = self.folder_path_edit.text().strip()
-        if not path or not Path(path).exists(): return InfoBar.error("错误", "路径无效", parent=self)
-
-        tip = StateToolTip("正在生成", "扫描中...", self);
-        tip.move(tip.getSuitablePos());
-        tip.show()
-        try:
-            lines = self._gen_tree(Path(path))
-            fmt = self.format_combo.currentText()
-            out = self._to_md(lines) if fmt == "Markdown格式" else (
-                self._to_json(Path(path), lines) if fmt == "JSON格式" else "\n".join(lines))
-            self.output_text.setPlainText(out)
-            tip.setTitle("完成");
-            tip.setContent("生成成功");
-            tip.setState(True)
-            InfoBar.success("成功", f"生成 {len(lines)} 行", parent=self)
-        except Exception as e:
-            tip.setTitle("失败");
-            tip.setContent(str(e));
-            tip.setState(True)
-            InfoBar.error("错误", str(e), parent=self)
-
-    def _gen_tree(self, root, prefix="", is_last=True):
-        lines = []
-        if not prefix:
-            lines.append(f"{root.name}/"); prefix = ""
+        if not path or not Path(path).is_dir(): return InfoBar.error("错误", "路径无效", parent=self)
+
+        self.detach_tree()
+        self.output_text.clear()
+        self.tree_lines = []
+        self.tree_tip = StateToolTip("正在生成", "扫描中...", self);
+        self.tree_tip.move(self.tree_tip.getSuitablePos());
+        self.tree_tip.show()
+
+        thread = TreeThread(path, self.ignore_patterns, self.chk_hidden.isChecked(), self.chk_empty.isChecked())
+        fmt = self.format_combo.currentText()
+        thread.lines_signal.connect(lambda lines, t=thread: self.on_tree_lines(t, lines, fmt))
+        thread.progress_signal.connect(lambda d, n, t=thread: self.on_tree_progress(t, d, n))
+        thread.finished_signal.connect(
+            lambda count, cancelled, error, t=thread: self.on_tree_finished(t, path, fmt, count, cancelled, error))
+        thread.finished.connect(lambda t=thread: _running_threads.discard(t))
+        _running_threads.add(thread)
+        self.tree_thread = thread
+        self.btn_gen.setEnabled(False)
+        self.btn_stop.show()
+        thread.start()
+
+    def cancel_tree(self):
+        # 停止遍历，已生成的行保留
+        if self.tree_thread is not None: self.tree_thread.stop()
+
+    def detach_tree(self):
+        """停止并丢弃当前的生成任务 (之后到达的行会被忽略)"""
+        self.cancel_tree()
+        self.tree_thread = None
+        self.btn_stop.hide()
+        self.btn_gen.setEnabled(bool(self.folder_path_edit.text().strip()))
+        if self.tree_tip is not None:
+            self.tree_tip.setContent("已取消");
+            self.tree_tip.setState(True)
+            self.tree_tip = None
+
+    def on_tree_lines(self, thread, lines, fmt):
+        if thread is not self.tree_thread: return
+        if fmt == "JSON格式":
+            self.tree_lines.extend(lines)
         else:
-            con = "└── " if is_last else "├── "
-            lines.append(f"{prefix}{con}{root.name}/")
-            prefix += "    " if is_last else "│   "
-
-        try:
-            items = sorted(root.iterdir(), key=lambda x: (not x.is_dir(), x.name.lower()))
-            valid = []
-            for i in items:
-                if self.should_ignore(i): continue
-                if self.chk_empty.isChecked() and i.is_dir():
-                    try:
-                        if not any(not self.should_ignore(c) for c in i.iterdir()): continue
-                    except:
-                        pass
-                valid.append(i)
-
-            for i, child in enumerate(valid):
-                is_end = (i == len(valid) - 1)
-                if child.is_dir():
-                    lines.extend(self._gen_tree(child, prefix, is_end))
-                else:
-                    lines.append(f"{prefix}{'└── ' if is_end else '├── '}{child.name}")
-        except:
-            lines.append(f"{prefix}└── [Access Denied]")
-        return lines
-
-    def should_ignore(self, path):
-        if self.chk_hidden.isChecked() and path.name.startswith('.'): return True
-        for p in self.ignore_patterns:
-            if fnmatch.fnmatch(path.name, p): return True
-        return False
+            self.output_text.appendPlainText(self._to_md(lines) if fmt == "Markdown格式" else "\n".join(lines))
+
+    def on_tree_progress(self, thread, dirs, entries):
+        if thread is not self.tree_thread or self.tree_tip is None: return
+        self.tree_tip.setContent(f"已扫描 {dirs} 个文件夹，{entries} 个条目")
+
+    def on_tree_finished(self, thread, path, fmt, count, cancelled, error):
+        if thread is not self.tree_thread: return  # 已被新的生成任务取代
+        self.tree_thread = None
+        self.btn_stop.hide()
+        self.btn_gen.setEnabled(bool(self.folder_path_edit.text().strip()))
+        if fmt == "JSON格式":
+            self.output_text.setPlainText(self._to_json(Path(path), self.tree_lines))
+        self.tree_lines = []
+
+        tip, self.tree_tip = self.tree_tip, None
+        if error:
+            if tip is not None: tip.setTitle("失败"); tip.setContent(error); tip.setState(True)
+            InfoBar.error("错误", error, parent=self)
+        elif cancelled:
+            if tip is not None: tip.setTitle("已停止"); tip.setContent(f"已生成 {count} 行"); tip.setState(True)
+            InfoBar.info("提示", f"已停止生成，共 {count} 行", parent=self)
+        else:
+            if tip is not None: tip.setTitle("完成"); tip.setContent("生成成功"); tip.setState(True)
+            InfoBar.success("成功", f"生成 {count} 行", parent=self)
 
     def _to_md(self, lines):
         return "\n".join(
@@ -0,0 +1,137 @@
+"""
+文件夹 -> Tree 文本的遍历器 (不依赖 Qt，可在工作线程中运行)
+用 os.scandir 迭代遍历，每个文件夹只读取一次，直接使用 DirEntry 自带的类型信息；
+行按显示顺序逐行产出，调用方可以边遍历边显示，也可以随时停止。
+"""
+import os
+import re
+from fnmatch import translate
+
+ACCESS_DENIED = "[Access Denied]"
+
+# 子节点标记：None 为文件；_PENDING 为尚未读取的文件夹；_DENIED 为无法读取的文件夹；
+# 已读取的文件夹为子节点列表 [(名称, 子节点), ...]，按显示顺序倒序存放，便于 pop()
+_PENDING = object()
+_DENIED = object()
+
+
+class TreeWalker:
+    """
+    按 "文件夹在前、名称不区分大小写" 的顺序生成 Tree 文本
+    hide_empty 为 True 时先完整遍历一次，在后序阶段判断空目录 (只含被忽略项或空子目录的文件夹)，
+    再从内存中产出行；否则边读取边产出。
+    """
+
+    def __init__(self, ignore_patterns=(), ignore_hidden=True, hide_empty=True):
+        patterns = [p for p in ignore_patterns if p]
+        # 与 fnmatch.fnmatch 一致：Windows 下不区分大小写
+        flags = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+        self._ignore_re = re.compile('|'.join(translate(p) for p in patterns), flags) if patterns else None
+        self.ignore_hidden = ignore_hidden
+        self.hide_empty = hide_empty
+        self.dir_count = 0  # 已读取的文件夹数
+        self.entry_count = 0  # 已读取的条目数
+
+    def should_ignore(self, name):
+        if self.ignore_hidden and name.startswith('.'): return True
+        return self._ignore_re is not None and self._ignore_re.match(name) is not None
+
+    def iter_lines(self, root, is_cancelled=None, on_progress=None):
+        """
+        逐行产出 Tree 文本，第一行为 "根目录名/"
+        is_cancelled() 返回 True 时尽快停止；on_progress(文件夹数, 条目数) 在每读取一个文件夹后调用
+        """
+        root = os.path.normpath(os.fspath(root))
+        yield f"{os.path.basename(root) or root}/"
+
+        if self.hide_empty:
+            children = self._build(root, is_cancelled, on_progress)
+        else:
+            children = self._scan(root, on_progress)
+        if children is None:
+            return  # 构建阶段被取消
+        if children is _DENIED:
+            yield f"└── {ACCESS_DENIED}"
+            return
+
+        stack = [(root, "", children)]
+        while stack:
+            if is_cancelled is not None and is_cancelled():
+                return
+            path, prefix, items = stack[-1]
+            if not items:
+                stack.pop()
+                continue
+            name, node = items.pop()
+            is_last = not items
+            if node is None:
+                yield f"{prefix}{'└── ' if is_last else '├── '}{name}"
+                continue
+
+            yield f"{prefix}{'└── ' if is_last else '├── '}{name}/"
+            child_path = os.path.join(path, name)
+            child_prefix = prefix + ("    " if is_last else "│   ")
+            if node is _PENDING:
+                node = self._scan(child_path, on_progress)
+            if node is _DENIED:
+                yield f"{child_prefix}└── {ACCESS_DENIED}"
+            elif node:
+                stack.append((child_path, child_prefix, node))
+
+    def _scan(self, path, on_progress=None):
+        """读取一个文件夹，返回倒序的子节点列表；无法读取时返回 _DENIED"""
+        dirs, files = [], []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    self.entry_count += 1
+                    name = entry.name
+                    if self.should_ignore(name): continue
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        is_dir = False
+                    (dirs if is_dir else files).append(name)
+        except OSError:
+            return _DENIED
+        finally:
+            self.dir_count += 1
+            if on_progress is not None: on_progress(self.dir_count, self.entry_count)
+
+        key = str.lower
+        dirs.sort(key=key, reverse=True)
+        files.sort(key=key, reverse=True)
+        return [(name, None) for name in files] + [(name, _PENDING) for name in dirs]
+
+    def _build(self, root, is_cancelled=None, on_progress=None):
+        """
+        完整读取整棵树并在后序阶段去掉空目录，返回根的子节点列表 (被取消时返回 None)
+        无法读取的文件夹保留显示为 [Access Denied]
+        """
+        top = self._scan(root, on_progress)
+        if top is _DENIED:
+            return top
+
+        join = os.path.join
+        stack = [[root, top, 0]]
+        while stack:
+            if is_cancelled is not None and is_cancelled():
+                return None
+            frame = stack[-1]
+            path, items, i = frame
+            while i < len(items) and items[i][1] is not _PENDING:
+                i += 1
+            if i < len(items):
+                frame[2] = i + 1
+                name = items[i][0]
+                child_path = join(path, name)
+                children = self._scan(child_path, on_progress)
+                items[i] = (name, children)
+                if children is not _DENIED:
+                    stack.append([child_path, children, 0])
+                continue
+
+            # 后序：所有子文件夹都已处理完，去掉其中的空目录
+            stack.pop()
+            items[:] = [item for item in items if not (type(item[1]) is list and not item[1])]
+        return top
@@ -0,0 +1,55 @@
+import time
+
+from PySide6.QtCore import QThread, Signal
+
+from plugins.directory_tree.walker import TreeWalker
+
+
+class TreeThread(QThread):
+    """在后台线程中遍历文件夹，按块发出 Tree 文本行，避免大目录冻结界面"""
+    lines_signal = Signal(list)
+    progress_signal = Signal(int, int)  # (已读取文件夹数, 已读取条目数)
+    finished_signal = Signal(int, bool, str)  # (行数, 是否被取消, 错误信息)
+
+    CHUNK_SIZE = 2000
+    INTERVAL = 0.1  # 秒
+
+    def __init__(self, root, ignore_patterns, ignore_hidden=True, hide_empty=True):
+        super().__init__()
+        self.root = root
+        self.walker = TreeWalker(ignore_patterns, ignore_hidden, hide_empty)
+        self.is_running = True
+        self._last_progress = 0.0
+
+    def stop(self):
+        self.is_running = False
+
+    def run(self):
+        count, error = 0, ""
+        chunk = []
+        monotonic = time.monotonic
+        last = monotonic()
+        try:
+            for line in self.walker.iter_lines(self.root, lambda: not self.is_running, self._on_progress):
+                chunk.append(line)
+                # 每行都检查时间，慢速目录中零星产出的行也能及时显示
+                now = monotonic()
+                if len(chunk) >= self.CHUNK_SIZE or now - last >= self.INTERVAL:
+                    count += len(chunk)
+                    self.lines_signal.emit(chunk)
+                    chunk = []
+                    last = now
+        except Exception as e:
+            print(f"[DirectoryTree] 生成目录树失败: {e}")
+            error = str(e)
+        if chunk:
+            count += len(chunk)
+            self.lines_signal.emit(chunk)
+        self.progress_signal.emit(self.walker.dir_count, self.walker.entry_count)
+        self.finished_signal.emit(count, not self.is_running, error)
+
+    def _on_progress(self, dirs, entries):
+        now = time.monotonic()
+        if now - self._last_progress >= self.INTERVAL:
+            self._last_progress = now
+            self.progress_signal.emit(dirs, entries)
@@ -111,6 +111,30 @@ class MarkdownPlugin(PluginInterface):
 
     def create_widget(self) -> QWidget: return MarkdownWidget()
 
+    def save_state(self, widget):
+        # 撤销历史不保存，唤醒后从当前文本重新开始
+        return {
+            "text": widget.editor.toPlainText(),
+            "current_file": widget.current_file,
+            "cursor": widget.editor.textCursor().position(),
+            "scroll": widget.editor.verticalScrollBar().value(),
+            "splitter": widget.splitter.sizes(),
+        }
+
+    def restore_state(self, widget, state):
+        widget.editor.setPlainText(state.get("text", ""))
+        if state.get("current_file"):
+            widget.current_file = state["current_file"]
+            widget.editor.set_base_path(widget.current_file)
+        cursor = widget.editor.textCursor()
+        cursor.setPosition(min(state.get("cursor", 0), len(widget.editor.toPlainText())))
+        widget.editor.setTextCursor(cursor)
+        if state.get("splitter"): widget.splitter.setSizes(state["splitter"])
+        widget.render_markdown()
+        widget.parse_outline()
+        # 滚动条范围要等布局完成后才正确
+        QTimer.singleShot(0, lambda: widget.editor.verticalScrollBar().setValue(state.get("scroll", 0)))
+
 
 class MarkdownWidget(QWidget):
     def __init__(self):
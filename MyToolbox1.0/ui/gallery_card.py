@@ -1,122 +1,221 @@
-from PySide6.QtCore import Qt, Signal, QPoint
-from PySide6.QtWidgets import QVBoxLayout, QHBoxLayout, QFrame
-from qfluentwidgets import (CardWidget, IconWidget, BodyLabel, CaptionLabel,
-                            RoundMenu, Action, FluentIcon)
-from core.config import ConfigManager
+from PySide6.QtCore import Qt, Signal, QPoint, QSize, QRect, QRectF, QAbstractListModel, QModelIndex
+from PySide6.QtGui import QColor, QPainter, QPen, QFont, QIcon
+from PySide6.QtWidgets import QFrame, QListView, QStyledItemDelegate, QStyle, QAbstractItemView
+from qfluentwidgets import RoundMenu, Action, FluentIcon, isDarkTheme, qconfig
 from core.resource_manager import qicon
 
 
-class ToolCard(CardWidget):
-    """首页展示的工具卡片"""
+def build_tool_menu(parent, plugin, open_new_tab, open_new_window):
+    """工具卡片的右键菜单"""
+    menu = RoundMenu(parent=parent)
+
+    # 安全获取图标
+    icon_add = getattr(FluentIcon, 'ADD', FluentIcon.EDIT)
+    action_tab = Action(icon_add, "在新标签页打开", parent=parent)
+    action_tab.triggered.connect(lambda: open_new_tab.emit(plugin))
+    menu.addAction(action_tab)
+
+    icon_win = getattr(FluentIcon, 'SHARE', getattr(FluentIcon, 'SEND', FluentIcon.FOLDER))
+    action_win = Action(icon_win, "在新窗口打开", parent=parent)
+    action_win.triggered.connect(lambda: open_new_window.emit(plugin))
+    menu.addAction(action_win)
+    return menu
+
+
+# ==========================================
+# 虚拟化的工具画廊：只为可见区域内的卡片绘制，插件数量再多也不会创建大量控件
+# ==========================================
+class ToolGalleryModel(QAbstractListModel):
+    """插件列表模型；搜索时只改变显示顺序 (visible_order)，不重建数据"""
+    PluginRole = Qt.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.plugins = []
+        self.visible_order = []  # 当前显示的插件在 plugins 中的下标
+
+    def set_plugins(self, plugins):
+        self.beginResetModel()
+        self.plugins = list(plugins)
+        self.visible_order = list(range(len(self.plugins)))
+        self.endResetModel()
+
+    def set_visible_order(self, order):
+        if order == self.visible_order:
+            return
+        self.beginResetModel()
+        self.visible_order = list(order)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.visible_order)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        plugin = self.plugins[self.visible_order[index.row()]]
+        if role == self.PluginRole:
+            return plugin
+        if role == Qt.DisplayRole:
+            return getattr(plugin, 'name', '未知工具')
+        if role == Qt.ToolTipRole:
+            return getattr(plugin, 'description', '')
+        return None
+
+
+class ToolCardDelegate(QStyledItemDelegate):
+    """直接绘制工具卡片 (300x120，图标 48，边距 16)，颜色跟随明暗主题"""
+    CARD_SIZE = QSize(300, 120)
+    MARGIN = 16
+    ICON_SIZE = 48
+    SPACING = 12
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._icons = {}  # (插件名, 是否深色主题) -> QIcon，避免每次绘制都重新解析图标
+        self._title_font = QFont()
+        self._title_font.setBold(True)
+        self._title_font.setPixelSize(16)
+        self._caption_font = QFont()
+        self._caption_font.setPixelSize(12)
+
+    def sizeHint(self, option, index):
+        return self.CARD_SIZE
+
+    def clear_icon_cache(self):
+        self._icons.clear()
+
+    def _icon(self, plugin):
+        key = (plugin.name, isDarkTheme())
+        icon = self._icons.get(key)
+        if icon is None:
+            icon_obj = plugin.icon
+            if isinstance(icon_obj, str):
+                icon = qicon(icon_obj)
+            elif isinstance(icon_obj, QIcon):
+                icon = icon_obj
+            else:
+                icon = icon_obj.icon()
+            self._icons[key] = icon
+        return icon
+
+    @staticmethod
+    def _colors(hovered):
+        """(背景, 边框, 标题, 说明文字)"""
+        if isDarkTheme():
+            return (QColor(43, 43, 43, 245 if hovered else 230), QColor(255, 255, 255, 40 if hovered else 20),
+                    QColor(255, 255, 255), QColor(160, 160, 160))
+        return (QColor(255, 255, 255, 245 if hovered else 230), QColor(0, 0, 0, 40 if hovered else 26),
+                QColor(0, 0, 0), QColor(Qt.gray))
+
+    def paint(self, painter, option, index):
+        plugin = index.data(ToolGalleryModel.PluginRole)
+        if plugin is None:
+            return
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.TextAntialiasing)
+
+        rect = QRect(option.rect.topLeft(), self.CARD_SIZE)
+        hovered = bool(option.state & QStyle.State_MouseOver)
+
+        # 卡片背景，悬停时略微加深边框
+        background, border, title_color, caption_color = self._colors(hovered)
+        painter.setPen(QPen(border, 1))
+        painter.setBrush(background)
+        painter.drawRoundedRect(QRectF(rect).adjusted(0.5, 0.5, -0.5, -0.5), 8, 8)
+
+        m, s = self.MARGIN, self.SPACING
+        icon_rect = QRect(rect.left() + m, rect.top() + m, self.ICON_SIZE, self.ICON_SIZE)
+        self._icon(plugin).paint(painter, icon_rect)
+
+        text_left = icon_rect.right() + 1 + s
+        text_width = rect.right() - m - text_left
+
+        painter.setFont(self._title_font)
+        painter.setPen(title_color)
+        title_height = painter.fontMetrics().height()
+        title = painter.fontMetrics().elidedText(getattr(plugin, 'name', '未知工具'), Qt.ElideRight, text_width)
+        painter.drawText(QRect(text_left, icon_rect.top(), text_width, title_height),
+                         Qt.AlignLeft | Qt.AlignVCenter, title)
+
+        painter.setFont(self._caption_font)
+        painter.setPen(caption_color)
+        group_top = icon_rect.top() + title_height + 4
+        painter.drawText(QRect(text_left, group_top, text_width, icon_rect.bottom() - group_top),
+                         Qt.AlignLeft | Qt.AlignTop | Qt.TextWordWrap, getattr(plugin, 'group', '') or "")
+
+        desc_top = icon_rect.bottom() + 1 + s
+        desc_rect = QRect(rect.left() + m, desc_top, rect.width() - 2 * m, rect.bottom() - m - desc_top + 1)
+        painter.setClipRect(desc_rect)
+        painter.drawText(desc_rect, Qt.AlignLeft | Qt.AlignTop | Qt.TextWordWrap,
+                         getattr(plugin, 'description', '暂无描述') or "暂无描述")
+        painter.restore()
+
+
+class ToolGalleryView(QListView):
+    """首页工具画廊：单击打开工具，右键菜单可在新标签页 / 新窗口打开"""
     tool_clicked = Signal(object)
     open_new_tab = Signal(object)
     open_new_window = Signal(object)
 
-    def __init__(self, plugin, parent=None):
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self.plugin = plugin
-        self.setCursor(Qt.PointingHandCursor)
-        self.setFixedSize(300, 120)  # 调整卡片大小，更适合新布局
+        self.gallery_model = ToolGalleryModel(self)
+        self.card_delegate = ToolCardDelegate(self)
+        self.setModel(self.gallery_model)
+        self.setItemDelegate(self.card_delegate)
+
+        self.setViewMode(QListView.IconMode)
+        self.setFlow(QListView.LeftToRight)
+        self.setWrapping(True)
+        self.setResizeMode(QListView.Adjust)
+        self.setMovement(QListView.Static)
+        self.setUniformItemSizes(True)  # 所有卡片同尺寸，布局无需逐项测量
+        self.setLayoutMode(QListView.Batched)
+        self.setBatchSize(200)
+        self.setSpacing(10)  # 相邻卡片间距 20，与原来的 FlowLayout 一致
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.verticalScrollBar().setSingleStep(20)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setFrameShape(QFrame.NoFrame)
+        self.setMouseTracking(True)
+        self.viewport().setAttribute(Qt.WA_Hover)
+        self.viewport().setCursor(Qt.PointingHandCursor)
+
+        self.setStyleSheet("QListView { background: transparent; border: none; }")
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.viewport().setAttribute(Qt.WA_TranslucentBackground)
+        self.viewport().setAutoFillBackground(False)
+
         self.setContextMenuPolicy(Qt.CustomContextMenu)
         self.customContextMenuRequested.connect(self.on_context_menu)
+        # 卡片由委托自行绘制，切换明暗主题后需要重绘
+        qconfig.themeChanged.connect(self._on_theme_changed)
+
+    def _on_theme_changed(self):
+        self.viewport().update()
+
+    def set_plugins(self, plugins):
+        self.card_delegate.clear_icon_cache()
+        self.gallery_model.set_plugins(plugins)
 
-        # 统一卡片样式，简约大气
-        self.setStyleSheet("""
-            CardWidget {
-                background: rgba(255, 255, 255, 0.9);
-                border-radius: 8px;
-                border: 1px solid rgba(0, 0, 0, 0.1);
-            }
-        """)
-
-        # 主布局 - 垂直布局
-        self.main_layout = QVBoxLayout(self)
-        self.main_layout.setContentsMargins(16, 16, 16, 16)
-        self.main_layout.setSpacing(12)
-
-        # 第一行：图标 + 标题区域
-        self.top_layout = QHBoxLayout()
-        self.top_layout.setSpacing(12)
-
-        # 1. 图标 (支持 FluentIcon 或 QIcon)
-        icon_obj = plugin.icon
-        # 如果 icon 是字符串，尝试转换
-        if isinstance(icon_obj, str):
-            icon_obj = qicon(icon_obj)
-
-        self.icon_widget = IconWidget(icon_obj, self)
-        self.icon_widget.setFixedSize(48, 48)
-        self.top_layout.addWidget(self.icon_widget)
-
-        # 标题区域：垂直布局，包含标题和子标题
-        self.title_area = QVBoxLayout()
-        self.title_area.setSpacing(4)
-        self.title_area.setAlignment(Qt.AlignTop)
-
-        # 2. 标题
-        name_text = getattr(plugin, 'name', '未知工具')
-        self.title_label = BodyLabel(name_text, self)
-        font = self.title_label.font()
-        font.setBold(True)
-        font.setPixelSize(16)
-        self.title_label.setFont(font)
-        self.title_area.addWidget(self.title_label)
-
-        # 3. 子标题（使用分组信息）
-        group_text = ""
-        try:
-            if hasattr(plugin, 'group'):
-                group_text = plugin.group
-        except Exception as e:
-            print(f"[Warn] 获取分组失败: {e}")
-            group_text = ""
-        
-        self.subtitle_label = CaptionLabel(group_text, self)
-        self.subtitle_label.setTextColor(Qt.gray, Qt.gray)
-        self.subtitle_label.setWordWrap(True)
-        self.title_area.addWidget(self.subtitle_label)
-
-        # 填充空白，将标题区域推到顶部
-        self.title_area.addStretch(1)
-        self.top_layout.addLayout(self.title_area)
-        self.top_layout.addStretch(1)
-
-        # 4. 描述（放在整个下面区域）
-        desc_text = "暂无描述"
-        try:
-            # 优先尝试直接获取 description
-            if hasattr(plugin, 'description'):
-                desc_text = plugin.description
-        except Exception as e:
-            print(f"[Warn] 获取描述失败: {e}")
-            desc_text = "加载失败"
-
-        self.desc_label = CaptionLabel(desc_text, self)
-        self.desc_label.setTextColor(Qt.gray, Qt.gray)
-        self.desc_label.setWordWrap(True)
-
-        # 添加到主布局
-        self.main_layout.addLayout(self.top_layout)
-        self.main_layout.addWidget(self.desc_label)
-        self.main_layout.addStretch(1)
+    def set_visible_order(self, order):
+        self.gallery_model.set_visible_order(order)
 
     def mouseReleaseEvent(self, e):
         super().mouseReleaseEvent(e)
         if e.button() == Qt.LeftButton:
-            self.tool_clicked.emit(self.plugin)
+            index = self.indexAt(e.position().toPoint())
+            if index.isValid():
+                self.tool_clicked.emit(index.data(ToolGalleryModel.PluginRole))
 
     def on_context_menu(self, pos: QPoint):
-        menu = RoundMenu(parent=self)
-
-        # 安全获取图标
-        icon_add = getattr(FluentIcon, 'ADD', FluentIcon.EDIT)
-        action_tab = Action(icon_add, "在新标签页打开", parent=self)
-        action_tab.triggered.connect(lambda: self.open_new_tab.emit(self.plugin))
-        menu.addAction(action_tab)
-
-        icon_win = getattr(FluentIcon, 'SHARE', getattr(FluentIcon, 'SEND', FluentIcon.FOLDER))
-        action_win = Action(icon_win, "在新窗口打开", parent=self)
-        action_win.triggered.connect(lambda: self.open_new_window.emit(self.plugin))
-        menu.addAction(action_win)
-
-        menu.exec(self.mapToGlobal(pos))
\ No newline at end of file
+        index = self.indexAt(pos)
+        if not index.isValid():
+            return
+        plugin = index.data(ToolGalleryModel.PluginRole)
+        menu = build_tool_menu(self, plugin, self.open_new_tab, self.open_new_window)
+        menu.exec(self.viewport().mapToGlobal(pos))
\ No newline at end of file
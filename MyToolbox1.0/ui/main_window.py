@@ -5,6 +5,8 @@ from qfluentwidgets import FluentWindow, NavigationItemPosition, FluentIcon
 from core.plugin_manager import PluginManager
 from core.config import ConfigManager
 from core.resource_manager import qicon
+from core.profiler import StartupProfiler
+from core.warmup import WarmupScheduler
 from ui.views import CentralTabWidget
 from ui.tool_window import ToolWindow
 from ui.settings_interface import SettingsInterface
@@ -17,8 +19,10 @@ class MainWindow(FluentWindow):
         self.independent_windows = []
 
         # 1. 加载配置
-        self.config_data = ConfigManager.load()
-        ConfigManager.apply_theme(self.config_data["theme"])
+        with StartupProfiler.span("ConfigManager.load"):
+            self.config_data = ConfigManager.load()
+        with StartupProfiler.span("apply_theme"):
+            ConfigManager.apply_theme(self.config_data["theme"])
 
         self.setWindowTitle("Python Fluent Toolbox")
 
@@ -36,16 +40,25 @@ class MainWindow(FluentWindow):
         self.setStyleSheet("MainWindow { background: transparent; }")
 
         self.plugin_manager = PluginManager()
-        self.plugin_manager.load_plugins()
+        with StartupProfiler.span("PluginManager.load_plugins"):
+            self.plugin_manager.load_plugins()
 
-        self.init_ui()
+        with StartupProfiler.span("MainWindow.init_ui"):
+            self.init_ui()
+
+        # 首帧之后在空闲时预热常用插件 (showEvent 中启动)
+        self.warmup = WarmupScheduler(self.plugin_manager.get_plugins(include_disabled=False), self)
+        self.central_interface.warmup = self.warmup
+        self._warmup_started = False
 
     def init_ui(self):
         plugins = self.plugin_manager.get_plugins(include_disabled=False)
 
-        self.central_interface = CentralTabWidget(plugins, self)
+        with StartupProfiler.span("CentralTabWidget"):
+            self.central_interface = CentralTabWidget(plugins, self)
         self.central_interface.setObjectName("central_interface")
         self.central_interface.tool_new_window.connect(self.open_tool_independent)
+        self.central_interface.tool_detached.connect(self.detach_tool)
 
         icon_home = getattr(FluentIcon, 'HOME', None)
         if not icon_home: icon_home = getattr(FluentIcon, 'TILES', FluentIcon.EDIT)
@@ -59,7 +72,8 @@ class MainWindow(FluentWindow):
 
         self.navigationInterface.addSeparator()
 
-        self.settings_interface = SettingsInterface(self)
+        with StartupProfiler.span("SettingsInterface"):
+            self.settings_interface = SettingsInterface(self)
 
         icon_setting = getattr(FluentIcon, 'SETTING', getattr(FluentIcon, 'SETTINGS', FluentIcon.EDIT))
 
@@ -73,11 +87,42 @@ class MainWindow(FluentWindow):
         # 连接导航栏显示模式变化信号，用于同步调整中央界面
         self.navigationInterface.displayModeChanged.connect(self.update_central_layout)
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self._warmup_started:
+            self._warmup_started = True
+            self.warmup.start()
+
     def open_tool_independent(self, plugin):
-        new_window = ToolWindow(plugin)
-        self.independent_windows.append(new_window)
-        new_window.destroyed.connect(lambda: self.cleanup_window(new_window))
-        new_window.show()
+        WarmupScheduler.record_usage(plugin.name)
+        # 已经在标签页中打开的工具直接分离过去，不再重建一份界面
+        if self.central_interface.detach_singleton(plugin):
+            return
+        window = ToolWindow.acquire()
+        window.open_plugin(plugin)
+        self.show_tool_window(window)
+
+    def detach_tool(self, plugin, widget):
+        window = ToolWindow.acquire()
+        window.host_widget(plugin, widget)
+        self.show_tool_window(window)
+
+    def dock_tool(self, plugin, widget):
+        self.central_interface.attach_widget(plugin, widget)
+        self.switchTo(self.central_interface)
+        self.activateWindow()
+
+    def show_tool_window(self, window):
+        # 池中复用的窗口只连接一次信号
+        if not getattr(window, '_main_window_connected', False):
+            window._main_window_connected = True
+            window.dock_requested.connect(self.dock_tool)
+            window.released.connect(lambda: self.cleanup_window(window))
+            window.destroyed.connect(lambda: self.cleanup_window(window))
+        if window not in self.independent_windows:
+            self.independent_windows.append(window)
+        window.show()
+        window.activateWindow()
 
     def cleanup_window(self, window):
         if window in self.independent_windows:
@@ -99,10 +144,14 @@ class MainWindow(FluentWindow):
             current_config = ConfigManager.load()
             current_config["window_size"] = [self.width(), self.height()]
             ConfigManager.save(current_config)
+            # 退出前把尚未落盘的配置立即写入
+            ConfigManager.flush()
         except Exception as e:
             print(f"关闭保存失败: {e}")
 
-        for w in self.independent_windows:
+        self.warmup.shutdown()
+
+        for w in list(self.independent_windows):
             w.close()
 
         event.accept()
\ No newline at end of file
@@ -4,7 +4,7 @@ from pathlib import Path
 
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QListWidget, QListWidgetItem,
                                QAbstractItemView, QHBoxLayout, QFrame, QLabel,
-                               QFileDialog, QScrollArea)
+                               QFileDialog, QScrollArea, QTableWidget, QTableWidgetItem, QHeaderView)
 from PySide6.QtCore import Qt, Signal, QSize
 from PySide6.QtGui import QPixmap, QIcon
 from qfluentwidgets import (StrongBodyLabel, SubtitleLabel, CaptionLabel,
@@ -13,6 +13,7 @@ from qfluentwidgets import (StrongBodyLabel, SubtitleLabel, CaptionLabel,
 
 from core.plugin_manager import PluginManager
 from core.config import ConfigManager
+from core.instrumentation import ResourceMonitor
 from core.resource_manager import qicon
 
 
@@ -271,7 +272,76 @@ class PluginManageCard(CardWidget):
 
 
 # ==========================================
-# 3. 设置页面主容器
+# 3. 资源占用卡片
+# ==========================================
+class _NumberItem(QTableWidgetItem):
+    """按数值排序的单元格 (未开启统计时显示 -)"""
+
+    def __init__(self, value, fmt="{:.0f}"):
+        super().__init__("-" if value is None else fmt.format(value))
+        self.value = -1 if value is None else value
+        self.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+
+    def __lt__(self, other):
+        return self.value < getattr(other, 'value', -1)
+
+
+class ResourceMonitorCard(CardWidget):
+    """列出每个打开的标签页 / 独立窗口的资源占用，用于定位长时间运行后变卡的工具"""
+    HEADERS = ["插件", "类型", "QObject 数量", "Python 堆 (KB)", "事件耗时 (ms)", "事件数", "已打开 (分钟)"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.layout = QVBoxLayout(self)
+        self.layout.setContentsMargins(20, 20, 20, 20)
+
+        header = QHBoxLayout()
+        header.addWidget(SubtitleLabel("资源占用", self))
+        header.addStretch(1)
+        self.btn_refresh = PushButton(getattr(FluentIcon, 'SYNC', FluentIcon.EDIT), "刷新", self)
+        self.btn_refresh.clicked.connect(self.refresh)
+        header.addWidget(self.btn_refresh)
+        self.layout.addLayout(header)
+
+        if ResourceMonitor.enabled:
+            hint = "事件耗时为该工具的事件处理、槽函数和绘制占用 UI 线程的时间；Python 堆为创建及运行期间的内存净增量。"
+        else:
+            hint = "使用 --instrument 参数或设置环境变量 MYTOOLBOX_INSTRUMENT=1 启动后，可统计事件耗时和 Python 堆。"
+        self.layout.addWidget(CaptionLabel(hint, self))
+
+        self.table = QTableWidget(0, len(self.HEADERS), self)
+        self.table.setHorizontalHeaderLabels(self.HEADERS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.setSortingEnabled(True)
+        self.table.setStyleSheet(
+            "QTableWidget { border: 1px solid #e0e0e0; border-radius: 6px; background: transparent; }")
+        self.table.setFixedHeight(220)
+        self.layout.addWidget(self.table)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+
+    def refresh(self):
+        rows = ResourceMonitor.snapshot()
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            self.table.setItem(r, 0, QTableWidgetItem(row["name"]))
+            self.table.setItem(r, 1, QTableWidgetItem(row["kind"]))
+            self.table.setItem(r, 2, _NumberItem(row["children"]))
+            self.table.setItem(r, 3, _NumberItem(row["heap_kb"]))
+            self.table.setItem(r, 4, _NumberItem(row["busy_ms"], "{:.1f}"))
+            self.table.setItem(r, 5, _NumberItem(row["events"]))
+            self.table.setItem(r, 6, _NumberItem(row["age_min"]))
+        self.table.setSortingEnabled(True)
+
+
+# ==========================================
+# 4. 设置页面主容器
 # ==========================================
 class SettingsInterface(QScrollArea):  # 使用 QScrollArea 而不是 ScrollArea
     """设置页面"""
@@ -299,4 +369,8 @@ class SettingsInterface(QScrollArea):  # 使用 QScrollArea 而不是 ScrollArea
         self.plugin_card = PluginManageCard(self)
         self.v_layout.addWidget(self.plugin_card)
 
+        # 3. 资源占用卡片
+        self.resource_card = ResourceMonitorCard(self)
+        self.v_layout.addWidget(self.resource_card)
+
         self.v_layout.addStretch(1)
\ No newline at end of file
@@ -0,0 +1,183 @@
+import time
+
+from PySide6.QtCore import QObject, QTimer, Qt
+from PySide6.QtWidgets import QWidget, QVBoxLayout
+from qfluentwidgets import BodyLabel
+
+from core.config import ConfigManager
+from core.instrumentation import ResourceMonitor
+from core.utils import get_process_memory_mb
+
+
+class HibernatedTab(QWidget):
+    """休眠标签页的占位界面：只保留插件引用和 save_state() 序列化出的状态"""
+
+    def __init__(self, plugin, state, is_singleton, parent=None):
+        super().__init__(parent)
+        self.plugin_instance = plugin
+        self.state = state
+        self.setProperty("plugin_name", plugin.name)
+        self.setProperty("is_singleton", is_singleton)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+
+        layout = QVBoxLayout(self)
+        label = BodyLabel("该标签页已休眠以节省内存，正在恢复...", self)
+        label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(label)
+
+
+class TabHibernator(QObject):
+    """
+    标签页休眠 (可选功能，配置项 hibernation)
+    1. 超过 idle_minutes 未切换到的标签页，通过插件的 save_state() 保存状态后销毁界面，换成占位页；
+    2. 设置了 memory_budget_mb 时，进程内存超出预算就按最久未使用的顺序逐个休眠；
+    3. 切换到占位页时重新 create_widget() 并 restore_state() 恢复。
+    save_state() 返回 None 的插件 (默认实现) 不会被休眠。
+    """
+    CHECK_INTERVAL_MS = 30 * 1000
+    BUDGET_RECHECK_MS = 2000  # 超预算时休眠一个后，等界面真正释放再复查
+
+    DEFAULT_SETTINGS = {
+        "enabled": False,
+        "idle_minutes": 10,  # 0 表示不按空闲时间休眠
+        "memory_budget_mb": 0,  # 0 表示不限制
+    }
+
+    def __init__(self, tabs):
+        super().__init__(tabs)
+        self.tabs = tabs  # CentralTabWidget
+        self.settings = dict(self.DEFAULT_SETTINGS)
+        self._current = tabs.tab_widget.currentWidget()
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.CHECK_INTERVAL_MS)
+        self._timer.timeout.connect(self.check)
+
+        tabs.tab_widget.currentChanged.connect(self._on_current_changed)
+        ConfigManager.add_listener(self._on_config_changed)
+        self.destroyed.connect(lambda: ConfigManager.remove_listener(self._on_config_changed))
+        self.apply_settings()
+
+    def apply_settings(self):
+        settings = dict(self.DEFAULT_SETTINGS)
+        settings.update(ConfigManager.get("hibernation", {}) or {})
+        self.settings = settings
+        if settings.get("enabled"):
+            self._timer.start()
+        else:
+            self._timer.stop()
+
+    def _on_config_changed(self, changed_keys):
+        if "hibernation" in changed_keys:
+            self.apply_settings()
+
+    def _on_current_changed(self, index):
+        # 记录离开时间：标签页"空闲多久"从用户切走的那一刻算起
+        if self._current is not None:
+            self._current._last_active = time.monotonic()
+        widget = self.tabs.tab_widget.widget(index)
+        self._current = widget
+        if isinstance(widget, HibernatedTab):
+            # 不在 currentChanged 中直接替换标签，等 QTabWidget 完成切换
+            QTimer.singleShot(0, lambda: self.wake(widget))
+
+    # ---------------- 休眠 ----------------
+    def check(self):
+        if not self.settings.get("enabled"):
+            return
+        tab_widget = self.tabs.tab_widget
+        now = time.monotonic()
+        current = tab_widget.currentWidget()
+
+        candidates = []
+        for i in range(1, tab_widget.count()):
+            widget = tab_widget.widget(i)
+            if widget is current or isinstance(widget, HibernatedTab):
+                continue
+            if getattr(widget, '_hibernate_unsupported', False):
+                continue
+            if not hasattr(widget, '_last_active'):
+                widget._last_active = now
+            candidates.append(widget)
+        candidates.sort(key=lambda w: w._last_active)
+
+        idle_seconds = self.settings.get("idle_minutes", 0) * 60
+        if idle_seconds:
+            for widget in list(candidates):
+                if now - widget._last_active >= idle_seconds and self.hibernate(widget):
+                    candidates.remove(widget)
+
+        budget = self.settings.get("memory_budget_mb", 0)
+        if budget and candidates and get_process_memory_mb() > budget:
+            for widget in candidates:
+                if self.hibernate(widget):
+                    QTimer.singleShot(self.BUDGET_RECHECK_MS, self.check)
+                    break
+
+    def hibernate(self, widget):
+        """保存状态并销毁界面，成功返回 True"""
+        tab_widget = self.tabs.tab_widget
+        index = tab_widget.indexOf(widget)
+        plugin = getattr(widget, 'plugin_instance', None)
+        if index <= 0 or plugin is None:
+            return False
+
+        try:
+            state = plugin.save_state(widget)
+        except Exception as e:
+            print(f"[Hibernate] 保存 {plugin.name} 状态失败: {e}")
+            state = None
+        if state is None:
+            widget._hibernate_unsupported = True
+            return False
+
+        placeholder = HibernatedTab(plugin, state, bool(widget.property("is_singleton")))
+        placeholder._last_active = getattr(widget, '_last_active', time.monotonic())
+        self._swap(index, widget, placeholder)
+        widget.deleteLater()
+        print(f"[Hibernate] 已休眠: {plugin.name}")
+        return True
+
+    # ---------------- 唤醒 ----------------
+    def wake(self, placeholder):
+        tab_widget = self.tabs.tab_widget
+        index = tab_widget.indexOf(placeholder)
+        if index < 0:
+            return  # 已被关闭
+        plugin = placeholder.plugin_instance
+        mark = ResourceMonitor.allocation_mark()
+        try:
+            widget = plugin.create_widget()
+        except Exception as e:
+            print(f"[Hibernate] 恢复 {plugin.name} 失败: {e}")
+            return
+        self.tabs.prepare_tool_widget(widget, plugin, bool(placeholder.property("is_singleton")))
+        ResourceMonitor.register(widget, plugin.name, "标签页", mark)
+        try:
+            plugin.restore_state(widget, placeholder.state)
+        except Exception as e:
+            print(f"[Hibernate] 恢复 {plugin.name} 状态失败: {e}")
+
+        self._swap(index, placeholder, widget)
+        if self._current is placeholder:
+            self._current = widget
+        placeholder.deleteLater()
+
+    def _swap(self, index, old, new):
+        """原位替换标签页内容，保留图标、标题和当前选中的标签"""
+        tab_widget = self.tabs.tab_widget
+        icon, text, tip = tab_widget.tabIcon(index), tab_widget.tabText(index), tab_widget.tabToolTip(index)
+        current = tab_widget.currentWidget()
+
+        tab_widget.blockSignals(True)
+        try:
+            tab_widget.removeTab(index)
+            tab_widget.insertTab(index, new, icon, text)
+            tab_widget.setTabToolTip(index, tip)
+            tab_widget.setCurrentWidget(new if current is old else current)
+        finally:
+            tab_widget.blockSignals(False)
+
+        name = new.property("plugin_name")
+        if new.property("is_singleton") and self.tabs.singleton_tabs.get(name) is old:
+            self.tabs.singleton_tabs[name] = new
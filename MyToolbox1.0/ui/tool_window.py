@@ -1,31 +1,128 @@
-from qfluentwidgets import FluentWindow
+from PySide6.QtCore import Signal
 from PySide6.QtGui import QIcon
+from PySide6.QtWidgets import QWidget, QVBoxLayout
+from qfluentwidgets import FluentWindow, FluentIcon, TransparentToolButton
+from core.resource_manager import qicon
+from core.instrumentation import ResourceMonitor
 
 
 class ToolWindow(FluentWindow):
-    """用于独立显示工具的窗口"""
+    """
+    用于独立显示工具的窗口 (可复用的外壳)
+    插件界面放在固定的承载页 host 中，窗口本身不持有插件状态：
+        - 标签页分离 / 停靠时只移动已有的界面实例，不重新 create_widget()；
+        - 关闭后窗口隐藏并回到池中，下次打开直接复用，省去 FluentWindow 的构建开销。
+    """
+    dock_requested = Signal(object, object)  # (插件, 界面)：请求停靠回主窗口标签页
+    released = Signal()  # 界面已移出，窗口回到池中
 
-    def __init__(self, plugin):
+    POOL_SIZE = 2
+    _pool = []
+
+    def __init__(self, plugin=None):
         super().__init__()
+        self.plugin = None
+        self.widget = None
+        self.resize(800, 600)
+
+        # 固定的承载页：addSubInterface 只调用一次，之后只替换其中的插件界面
+        self.host = QWidget()
+        self.host.setObjectName("tool_host")
+        self.host_layout = QVBoxLayout(self.host)
+        self.host_layout.setContentsMargins(0, 0, 0, 0)
+        self.addSubInterface(self.host, FluentIcon.APPLICATION, "工具")
+
+        # 隐藏左侧导航栏，只留内容区
+        self.navigationInterface.hide()
+        self._init_dock_button()
+
+        if plugin is not None:
+            self.open_plugin(plugin)
+
+    def _init_dock_button(self):
+        """在标题栏最小化按钮左侧加入"停靠到标签页"按钮"""
+        title_layout = getattr(self.titleBar, 'hBoxLayout', None)
+        if title_layout is None:
+            return
+        icon = getattr(FluentIcon, 'DOCK_LEFT', FluentIcon.RETURN)
+        self.dock_btn = TransparentToolButton(icon, self.titleBar)
+        self.dock_btn.setToolTip("停靠到主窗口标签页")
+        self.dock_btn.clicked.connect(self.dock)
+        index = title_layout.indexOf(self.titleBar.minBtn)
+        title_layout.insertWidget(index if index >= 0 else title_layout.count(), self.dock_btn)
+
+    # ---------------- 窗口池 ----------------
+    @classmethod
+    def acquire(cls):
+        """取一个空闲的窗口外壳，池为空时新建"""
+        while cls._pool:
+            window = cls._pool.pop()
+            try:
+                window.isVisible()
+            except RuntimeError:
+                continue  # 已被 Qt 销毁
+            return window
+        return cls()
+
+    def _release(self):
+        self.hide()
+        if self.widget is None and self not in self._pool and len(self._pool) < self.POOL_SIZE:
+            self._pool.append(self)
+        else:
+            self.deleteLater()
+        self.released.emit()
+
+    # ---------------- 承载界面 ----------------
+    def open_plugin(self, plugin):
+        """新建插件界面并显示在本窗口中"""
+        mark = ResourceMonitor.allocation_mark()
+        widget = plugin.create_widget()
+        widget.plugin_instance = plugin
+        ResourceMonitor.register(widget, plugin.name, "独立窗口", mark)
+        self.host_widget(plugin, widget)
+
+    def host_widget(self, plugin, widget):
+        """放入一个已有的插件界面 (从标签页分离时调用，界面实例和状态原样保留)"""
+        old = self.take_widget()
+        if old is not None:
+            old.deleteLater()
         self.plugin = plugin
+        self.widget = widget
 
-        # 1. 设置基础属性
         self.setWindowTitle(f"{plugin.name} - 独立窗口")
-        self.resize(800, 600)
-
-        # 2. 设置图标
         if isinstance(plugin.icon, str):
-            self.setWindowIcon(QIcon(plugin.icon))
-        # 如果是 FluentIcon 枚举，FluentWindow 会自动处理，这里暂略
+            self.setWindowIcon(qicon(plugin.icon))
+        elif isinstance(plugin.icon, FluentIcon):
+            self.setWindowIcon(plugin.icon.icon())
+        elif isinstance(plugin.icon, QIcon):
+            self.setWindowIcon(plugin.icon)
 
-        # 3. 加载插件内容
-        # 注意：这里我们只用addSubInterface把插件加进去，并隐藏导航栏
-        self.widget = plugin.create_widget()
-        self.widget.setObjectName(f"tool_{plugin.name}")
+        self.host_layout.addWidget(widget)  # addWidget 会把界面重新挂到 host 下
+        widget.show()
+        ResourceMonitor.relabel(widget, "独立窗口")
 
-        # 将插件设为中心部件（或者作为一个全屏的子界面）
-        # 这里为了保持 Fluent 风格，我们还是通过 addSubInterface 添加，但隐藏左侧栏
-        self.addSubInterface(self.widget, plugin.icon, plugin.name)
+    def take_widget(self):
+        """移出当前的插件界面 (不销毁)，没有时返回 None"""
+        widget = self.widget
+        if widget is None:
+            return None
+        self.host_layout.removeWidget(widget)
+        widget.setParent(None)
+        self.widget = None
+        self.plugin = None
+        return widget
 
-        # 隐藏左侧导航栏，只留内容区
-        self.navigationInterface.hide()
\ No newline at end of file
+    def dock(self):
+        plugin = self.plugin
+        widget = self.take_widget()
+        if widget is not None:
+            self.dock_requested.emit(plugin, widget)
+        self._release()
+
+    def closeEvent(self, event):
+        # 关闭即销毁插件界面，窗口外壳隐藏后留待复用
+        widget = self.take_widget()
+        if widget is not None:
+            widget.deleteLater()
+        event.ignore()
+        self._release()
@@ -1,12 +1,38 @@
 import os
+from collections import OrderedDict
 from pathlib import Path
-from PySide6.QtWidgets import (QWidget, QVBoxLayout, QScrollArea,
+from PySide6.QtWidgets import (QWidget, QVBoxLayout,
                                QTabWidget, QLabel, QTabBar, QToolButton, QHBoxLayout)
-from PySide6.QtCore import Qt, Signal, QEvent
-from PySide6.QtGui import QIcon, QPainter, QColor, QPixmap
-from qfluentwidgets import FlowLayout, TitleLabel, FluentIcon, InfoBar, InfoBarPosition, SearchLineEdit
+from PySide6.QtCore import Qt, Signal, QEvent, QTimer, QObject, QRunnable, QThreadPool, QSize
+from PySide6.QtGui import QIcon, QPainter, QColor, QPixmap, QGuiApplication
+from qfluentwidgets import TitleLabel, FluentIcon, InfoBar, InfoBarPosition, SearchLineEdit, RoundMenu, Action
 from core.config import ConfigManager
-from .gallery_card import ToolCard
+from core.image_loader import ImageLoader
+from core.instrumentation import ResourceMonitor
+from core.profiler import StartupProfiler
+from core.search_index import PluginSearchIndex
+from core.warmup import WarmupScheduler
+from .gallery_card import ToolGalleryView
+from .tab_hibernation import TabHibernator, HibernatedTab
+
+
+class _BackgroundSignals(QObject):
+    scaled = Signal(int, object)  # (代次, QImage)
+
+
+class _BackgroundScaleTask(QRunnable):
+    """在线程池中把背景图缩放到目标物理尺寸 (QImage 可以在非 UI 线程使用，QPixmap 不行)"""
+
+    def __init__(self, image, size, generation, signals):
+        super().__init__()
+        self.image = image
+        self.size = size
+        self.generation = generation
+        self.signals = signals
+
+    def run(self):
+        scaled = self.image.scaled(self.size, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+        self.signals.scaled.emit(self.generation, scaled)
 
 
 class HomeView(QWidget):
@@ -14,126 +40,184 @@ class HomeView(QWidget):
     tool_new_tab = Signal(object)
     tool_new_window = Signal(object)
 
+    SEARCH_DEBOUNCE_MS = 150  # 停止输入多久后才执行搜索
+    BG_RESCALE_DELAY_MS = 120  # 停止调整窗口大小多久后重新生成背景
+
     def __init__(self, plugins, parent=None):
         super().__init__(parent)
         self.current_plugins = plugins
+        # 背景：bg_image 是加载时已降采样的原图，bg_pixmap 是按当前尺寸缩放好的成品，
+        # paintEvent 只做一次贴图，缩放在后台线程完成
+        self.bg_image = None
         self.bg_pixmap = None
+        self._bg_pixmap_key = None  # bg_pixmap 对应的 (宽, 高, 缩放比)
+        self._bg_pending_key = None
+        self._bg_generation = 0
+        self._bg_signals = _BackgroundSignals(self)
+        self._bg_signals.scaled.connect(self._on_background_scaled)
+        self._bg_timer = QTimer(self)
+        self._bg_timer.setSingleShot(True)
+        self._bg_timer.setInterval(self.BG_RESCALE_DELAY_MS)
+        self._bg_timer.timeout.connect(self._rescale_background)
+        # 背景图在后台线程解码，_bg_request 用于丢弃被新请求取代的结果
+        self._bg_loader = ImageLoader(self)
+        self._bg_loader.loaded.connect(self._on_background_loaded)
+        self._bg_request = 0
+        self.search_index = PluginSearchIndex()
 
         self.main_layout = QVBoxLayout(self)
-        self.main_layout.setContentsMargins(0, 0, 0, 0)
-
-        # 【核心修复1】ScrollArea 全透明
-        self.scroll = QScrollArea(self)
-        self.scroll.setWidgetResizable(True)
-        # 移除边框，背景透明
-        self.scroll.setStyleSheet("QScrollArea { border: none; background: transparent; }")
-        self.scroll.viewport().setStyleSheet("background: transparent;")
-        # 强制属性透明
-        self.scroll.setAttribute(Qt.WA_TranslucentBackground)
-        self.scroll.viewport().setAttribute(Qt.WA_TranslucentBackground)
-
-        self.main_layout.addWidget(self.scroll)
-
-        self.scroll_content = QWidget()
-        self.scroll_content.setAttribute(Qt.WA_TranslucentBackground)
-        self.scroll_content.setStyleSheet("background: transparent;")
-        self.scroll.setWidget(self.scroll_content)
-
-        self.scroll_layout = QVBoxLayout(self.scroll_content)
-        self.scroll_layout.setContentsMargins(30, 30, 30, 30)
-        self.scroll_layout.setSpacing(20)
+        # 视图中每张卡片四周各有 10px spacing，左右边距相应减少 10px
+        self.main_layout.setContentsMargins(20, 30, 20, 0)
+        self.main_layout.setSpacing(20)
 
         header_layout = QHBoxLayout()
+        header_layout.setContentsMargins(10, 0, 10, 0)
         header_layout.addWidget(TitleLabel("工具导航", self))
         header_layout.addStretch(1)
 
         self.search_edit = SearchLineEdit(self)
         self.search_edit.setPlaceholderText("搜索工具...")
         self.search_edit.setFixedWidth(260)
-        self.search_edit.textChanged.connect(self.filter_cards)
+        self.search_edit.textChanged.connect(self._on_search_text_changed)
         header_layout.addWidget(self.search_edit)
 
-        self.scroll_layout.addLayout(header_layout)
-
-        self.flow_widget = QWidget()
-        self.flow_widget.setAttribute(Qt.WA_TranslucentBackground)
-        self.flow_widget.setStyleSheet("background: transparent;")
+        self.main_layout.addLayout(header_layout)
 
-        self.flow_layout = FlowLayout(self.flow_widget, needAni=True)
-        self.flow_layout.setContentsMargins(0, 10, 0, 0)
-        self.flow_layout.setVerticalSpacing(20)
-        self.flow_layout.setHorizontalSpacing(20)
+        # 输入防抖：连续输入只在停顿后搜索一次
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(lambda: self.filter_cards(self.search_edit.text()))
 
-        self.scroll_layout.addWidget(self.flow_widget)
-        self.scroll_layout.addStretch(1)
+        # 卡片由列表视图按需绘制 (只绘制可见区域)，视图自带滚动，不再需要外层 ScrollArea
+        self.gallery = ToolGalleryView(self)
+        self.gallery.tool_clicked.connect(self.tool_selected)
+        self.gallery.open_new_tab.connect(self.tool_new_tab)
+        self.gallery.open_new_window.connect(self.tool_new_window)
+        self.main_layout.addWidget(self.gallery, 1)
 
         self.render_cards(plugins)
         self.load_background()
 
     def load_background(self):
+        """异步加载背景图，完成前保持当前背景"""
         config = ConfigManager.load()
         rel_path = config.get("background_image", "")
-        if not rel_path:
-            self.bg_pixmap = None;
-            self.update();
+        path = None
+        if rel_path:
+            if os.path.exists(rel_path):
+                path = rel_path
+            else:
+                project_root = Path(__file__).resolve().parent.parent
+                abs_path = project_root / rel_path
+                if abs_path.exists():
+                    path = str(abs_path)
+
+        if path is None:
+            self._bg_request = 0
+            self._set_background_image(None)
             return
+        # 直接解码到屏幕分辨率，之后每次缩放的开销与屏幕大小有关而不是原图大小
+        self._bg_request = self._bg_loader.request(path, self._screen_limit())
 
-        if os.path.exists(rel_path):
-            self.bg_pixmap = QPixmap(rel_path)
-        else:
-            project_root = Path(__file__).resolve().parent.parent
-            abs_path = project_root / rel_path
-            if abs_path.exists():
-                self.bg_pixmap = QPixmap(str(abs_path))
-            else:
-                self.bg_pixmap = None
+    def _on_background_loaded(self, request_id, path, image):
+        if request_id != self._bg_request:
+            return
+        self._set_background_image(image)
+
+    def _set_background_image(self, image):
+        self.bg_image = image if image is not None and not image.isNull() else None
+        self.bg_pixmap = None
+        self._bg_pixmap_key = None
+        self._bg_pending_key = None
+        # 作废仍在运行的缩放任务 (图片被清除或控件尚无尺寸时 _rescale_background 不会递增)
+        self._bg_generation += 1
+        self._rescale_background()
+        self.update()
+
+    @staticmethod
+    def _screen_limit():
+        """所有屏幕中最大的物理分辨率"""
+        limit = QSize()
+        for screen in QGuiApplication.screens():
+            ratio = screen.devicePixelRatio()
+            size = screen.geometry().size()
+            limit = limit.expandedTo(QSize(round(size.width() * ratio), round(size.height() * ratio)))
+        return limit
+
+    def _background_key(self):
+        return self.width(), self.height(), self.devicePixelRatioF()
+
+    def _rescale_background(self):
+        key = self._background_key()
+        if self.bg_image is None or key in (self._bg_pixmap_key, self._bg_pending_key):
+            return
+        width, height, ratio = key
+        if width <= 0 or height <= 0:
+            return
+        self._bg_generation += 1
+        self._bg_pending_key = key
+        size = QSize(round(width * ratio), round(height * ratio))
+        QThreadPool.globalInstance().start(
+            _BackgroundScaleTask(self.bg_image, size, self._bg_generation, self._bg_signals))
+
+    def _on_background_scaled(self, generation, image):
+        # 期间又发生了尺寸变化或更换了图片，丢弃过期结果
+        if generation != self._bg_generation or self._bg_pending_key is None:
+            return
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(self._bg_pending_key[2])
+        self.bg_pixmap = pixmap
+        self._bg_pixmap_key = self._bg_pending_key
+        self._bg_pending_key = None
         self.update()
 
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.bg_image is not None:
+            self._bg_timer.start()
+
     def paintEvent(self, event):
         super().paintEvent(event)
-        if self.bg_pixmap and not self.bg_pixmap.isNull():
-            painter = QPainter(self)
-            painter.setRenderHint(QPainter.Antialiasing)
-            painter.setRenderHint(QPainter.SmoothPixmapTransform)
-            scaled = self.bg_pixmap.scaled(self.size(), Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
-            painter.drawPixmap(0, 0, scaled)
+        if self.bg_pixmap is None:
+            return
+        painter = QPainter(self)
+        if self._bg_pixmap_key == self._background_key():
+            painter.drawPixmap(0, 0, self.bg_pixmap)
+        else:
+            # 调整大小期间先拉伸上一张成品 (快速变换)，停止调整后再由后台生成清晰版本；
+            # 缩放比变化 (拖到另一块屏幕) 不会触发 resizeEvent，在这里补一次调度
+            painter.drawPixmap(self.rect(), self.bg_pixmap)
+            if not self._bg_timer.isActive() and self._bg_pending_key != self._background_key():
+                self._bg_timer.start()
 
     def render_cards(self, plugins):
-        self.flow_layout.removeAllWidgets()
-        for child in self.flow_widget.children():
-            if isinstance(child, ToolCard): child.deleteLater()
-
-        for plugin in plugins:
-            card = ToolCard(plugin, self.flow_widget)
-            card.tool_clicked.connect(self.tool_selected)
-            card.open_new_tab.connect(self.tool_new_tab)
-            card.open_new_window.connect(self.tool_new_window)
-
-            search_pool = [plugin.name.lower()]
-            if hasattr(plugin, 'description'): search_pool.append(plugin.description.lower())
-            if hasattr(plugin, 'group'): search_pool.append(plugin.group.lower())
-            if hasattr(plugin, 'keywords'): search_pool.extend([k.lower() for k in plugin.keywords])
-            if hasattr(plugin, 'dynamic_tags'): search_pool.extend(plugin.dynamic_tags)
-            card.search_index = " ".join(search_pool)
-            self.flow_layout.addWidget(card)
+        with StartupProfiler.span("ToolGallery.set_plugins"):
+            self.gallery.set_plugins(plugins)
+        # 模型中的插件顺序与索引中的文档编号一一对应
+        with StartupProfiler.span("PluginSearchIndex.build"):
+            self.search_index.build(plugins)
+        self.filter_cards(self.search_edit.text())
+
+    def _on_search_text_changed(self, text):
+        if not text.strip():
+            # 清空搜索立即恢复，不必等待防抖
+            self.search_timer.stop()
+            self.filter_cards(text)
+        else:
+            self.search_timer.start()
 
     def filter_cards(self, text):
-        query = text.lower().strip();
-        query_parts = query.split()
-        for i in range(self.flow_layout.count()):
-            item = self.flow_layout.itemAt(i);
-            widget = item.widget()
-            if isinstance(widget, ToolCard):
-                index_text = getattr(widget, 'search_index', '')
-                is_match = all(part in index_text for part in query_parts)
-                if is_match:
-                    widget.show()
-                else:
-                    widget.hide()
+        """按相关度排序显示匹配的卡片"""
+        self.gallery.set_visible_order(self.search_index.search(text.strip()))
 
 
 class CentralTabWidget(QWidget):
     tool_new_window = Signal(object)
+    tool_detached = Signal(object, object)  # (插件, 界面)：标签页分离为独立窗口
+
+    TAB_ICON_SIZE = 32
+    TINT_CACHE_SIZE = 64
 
     def __init__(self, plugins, parent=None):
         super().__init__(parent)
@@ -202,11 +286,23 @@ class CentralTabWidget(QWidget):
         """)
         self.add_btn.clicked.connect(self.duplicate_current_tab)
         self.tab_bar.installEventFilter(self)
+        self.tab_bar.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.tab_bar.customContextMenuRequested.connect(self.on_tab_context_menu)
 
         self.layout.addWidget(self.tab_widget)
         self.singleton_tabs = {}
+        self.warmup = None  # WarmupScheduler，由主窗口注入
+
+        # 着色后的标签页图标缓存 (LRU): (插件名, 颜色, 尺寸, 屏幕缩放比) -> QIcon
+        self._tinted_icons = OrderedDict()
+        ConfigManager.add_listener(self._on_config_changed)
+        self.destroyed.connect(lambda: ConfigManager.remove_listener(self._on_config_changed))
 
-        self.home_view = HomeView(plugins, self)
+        # 长时间未使用的标签页休眠 (默认关闭，见配置项 hibernation)
+        self.hibernator = TabHibernator(self)
+
+        with StartupProfiler.span("HomeView"):
+            self.home_view = HomeView(plugins, self)
         self.home_view.tool_selected.connect(lambda p: self.add_tool_tab(p, force_new=False))
         self.home_view.tool_new_tab.connect(lambda p: self.add_tool_tab(p, force_new=True))
         self.home_view.tool_new_window.connect(self.tool_new_window)
@@ -221,25 +317,70 @@ class CentralTabWidget(QWidget):
         self.tab_widget.tabBar().setTabButton(0, QTabBar.ButtonPosition.RightSide, None)
         self.tab_widget.tabCloseRequested.connect(self.close_tab)
 
-    def colorize_icon(self, icon_source, color_str):
-        pixmap = QPixmap(32, 32);
-        pixmap.fill(Qt.transparent)
+    @staticmethod
+    def _screen_ratios():
+        """当前所有屏幕的缩放比，图标为每个缩放比各准备一张像素图"""
+        ratios = {screen.devicePixelRatio() for screen in QGuiApplication.screens()}
+        return tuple(sorted(ratios)) or (1.0,)
+
+    def colorize_icon(self, plugin, color_str):
+        """
+        按插件名缓存着色图标 (plugin.icon 每次可能返回新的 QIcon，不能作为缓存键)，
+        只在未命中时读取 plugin.icon
+        """
+        size = self.TAB_ICON_SIZE
+        ratios = self._screen_ratios()
+        key = (plugin.name, QColor(color_str).name(QColor.HexArgb), size, ratios)
+        icon = self._tinted_icons.get(key)
+        if icon is not None:
+            self._tinted_icons.move_to_end(key)
+            return icon
+        icon = QIcon()
+        source = self._resolve_icon(plugin.icon)
+        for ratio in ratios:
+            icon.addPixmap(self._tint_pixmap(source, color_str, size, ratio))
+        self._tinted_icons[key] = icon
+        if len(self._tinted_icons) > self.TINT_CACHE_SIZE:
+            self._tinted_icons.popitem(last=False)
+        return icon
+
+    @staticmethod
+    def _resolve_icon(icon_source):
         if isinstance(icon_source, FluentIcon):
-            icon = icon_source.icon()
-        elif isinstance(icon_source, str):
-            from core.resource_manager import qicon; icon = qicon(icon_source)
-        else:
-            icon = icon_source
-        painter = QPainter(pixmap);
-        painter.setRenderHint(QPainter.Antialiasing);
+            return icon_source.icon()
+        if isinstance(icon_source, str):
+            from core.resource_manager import qicon
+            return qicon(icon_source)
+        return icon_source
+
+    @staticmethod
+    def _tint_pixmap(icon, color_str, size, ratio):
+        """按物理像素绘制，高分屏下不会模糊"""
+        physical = round(size * ratio)
+        pixmap = QPixmap(physical, physical)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
         painter.setRenderHint(QPainter.SmoothPixmapTransform)
-        icon.paint(painter, 0, 0, 32, 32)
+        icon.paint(painter, 0, 0, physical, physical)
         painter.setCompositionMode(QPainter.CompositionMode_SourceIn)
-        painter.setBrush(QColor(color_str));
-        painter.setPen(Qt.NoPen);
-        painter.drawRect(pixmap.rect());
+        painter.setBrush(QColor(color_str))
+        painter.setPen(Qt.NoPen)
+        painter.drawRect(pixmap.rect())
         painter.end()
-        return QIcon(pixmap)
+        pixmap.setDevicePixelRatio(ratio)
+        return pixmap
+
+    def _on_config_changed(self, changed_keys):
+        """用户在设置中修改插件颜色后，清空缓存并重新着色已打开的标签页"""
+        if "custom_colors" not in changed_keys:
+            return
+        self._tinted_icons.clear()
+        for index in range(1, self.tab_widget.count()):
+            widget = self.tab_widget.widget(index)
+            plugin = getattr(widget, 'plugin_instance', None)
+            if plugin is not None:
+                self.tab_widget.setTabIcon(index, self.colorize_icon(plugin, ConfigManager.get_color(plugin)))
 
     def eventFilter(self, obj, event):
         if obj == self.tab_bar:
@@ -270,19 +411,78 @@ class CentralTabWidget(QWidget):
                 target_widget = self.singleton_tabs[plugin.name]
                 self.tab_widget.setCurrentWidget(target_widget);
                 return
-        widget = plugin.create_widget()
-        # 【核心修复4】确保插件 Widget 背景也透明 (如果它自己没设)
-        widget.setAttribute(Qt.WA_TranslucentBackground)
-        widget.setProperty("plugin_name", plugin.name)
-        widget.setProperty("is_singleton", not force_new)
-        widget.plugin_instance = plugin
+        WarmupScheduler.record_usage(plugin.name)
+        # 优先使用启动后预热好的界面
+        widget = self.warmup.take_widget(plugin) if self.warmup else None
+        mark = None
+        if widget is None:
+            mark = ResourceMonitor.allocation_mark()
+            widget = plugin.create_widget()
+        ResourceMonitor.register(widget, plugin.name, "标签页", mark)
+        self._add_widget_tab(widget, plugin, not force_new)
+
+    def attach_widget(self, plugin, widget):
+        """把独立窗口中的界面实例停靠回标签页 (不重新创建)"""
+        # 已有同名单例标签页时作为多开标签页加入
+        is_singleton = plugin.name not in self.singleton_tabs
+        ResourceMonitor.relabel(widget, "标签页")
+        self._add_widget_tab(widget, plugin, is_singleton)
+
+    def _add_widget_tab(self, widget, plugin, is_singleton):
+        self.prepare_tool_widget(widget, plugin, is_singleton)
         theme_color = ConfigManager.get_color(plugin)
-        colored_icon = self.colorize_icon(plugin.icon, theme_color)
+        colored_icon = self.colorize_icon(plugin, theme_color)
         index = self.tab_widget.addTab(widget, colored_icon, plugin.name)
         self.tab_widget.setCurrentIndex(index)
-        if not force_new: self.singleton_tabs[plugin.name] = widget
+        if is_singleton: self.singleton_tabs[plugin.name] = widget
         self.move_add_button()
 
+    def detach_tab(self, index):
+        """把标签页中的界面实例移出 (不销毁)，由主窗口放入独立窗口"""
+        if index <= 0: return
+        widget = self.tab_widget.widget(index)
+        if isinstance(widget, HibernatedTab):
+            # 休眠中的标签页先恢复，再分离真正的界面
+            self.hibernator.wake(widget)
+            widget = self.tab_widget.widget(index)
+        plugin = getattr(widget, 'plugin_instance', None)
+        if plugin is None: return
+        if self.singleton_tabs.get(plugin.name) is widget: del self.singleton_tabs[plugin.name]
+        self.tab_widget.removeTab(index)
+        self.move_add_button()
+        self.tool_detached.emit(plugin, widget)
+
+    def detach_singleton(self, plugin):
+        """插件已有单例标签页时将其分离，返回是否成功"""
+        widget = self.singleton_tabs.get(plugin.name)
+        index = self.tab_widget.indexOf(widget) if widget is not None else -1
+        if index <= 0: return False
+        self.detach_tab(index)
+        return True
+
+    def on_tab_context_menu(self, pos):
+        index = self.tab_bar.tabAt(pos)
+        if index <= 0: return
+        menu = RoundMenu(parent=self)
+
+        icon_win = getattr(FluentIcon, 'SHARE', getattr(FluentIcon, 'SEND', FluentIcon.FOLDER))
+        action_detach = Action(icon_win, "分离为独立窗口", parent=self)
+        action_detach.triggered.connect(lambda: self.detach_tab(index))
+        menu.addAction(action_detach)
+
+        action_close = Action(FluentIcon.CLOSE, "关闭标签页", parent=self)
+        action_close.triggered.connect(lambda: self.close_tab(index))
+        menu.addAction(action_close)
+        menu.exec(self.tab_bar.mapToGlobal(pos))
+
+    @staticmethod
+    def prepare_tool_widget(widget, plugin, is_singleton):
+        # 【核心修复4】确保插件 Widget 背景也透明 (如果它自己没设)
+        widget.setAttribute(Qt.WA_TranslucentBackground)
+        widget.setProperty("plugin_name", plugin.name)
+        widget.setProperty("is_singleton", is_singleton)
+        widget.plugin_instance = plugin
+
     def close_tab(self, index):
         if index == 0: return
         widget = self.tab_widget.widget(index)